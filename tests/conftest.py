@@ -70,15 +70,13 @@ ALLOWED_LATERAL_PAIRS = [
 
 
 # ============================================================
-# File Helpers
+# Document Store
 # ============================================================
+# Static suites query the same handful of markdown files hundreds of
+# times. Each file is read and parsed once per session into a heading
+# tree; the helpers below are thin queries over it.
 
-def read_file(rel_path: str) -> Optional[str]:
-    """Read a file relative to project root. Returns None if missing."""
-    p = BASE_DIR / rel_path
-    if not p.exists():
-        return None
-    return p.read_text(encoding="utf-8")
+_HEADING = re.compile(r"^(#{1,4})[ \t]+(.*)$", re.MULTILINE)
 
 
 def parse_frontmatter(content: str) -> Optional[Dict]:
@@ -95,6 +93,114 @@ def parse_frontmatter(content: str) -> Optional[Dict]:
         return None
 
 
+def _parse_table_rows(text: str) -> List[List[str]]:
+    rows = []
+    for line in text.split("\n"):
+        line = line.strip()
+        if line.startswith("|") and not re.match(r"\|[\s\-:]+\|", line):
+            cells = [c.strip() for c in line.split("|")[1:-1]]
+            if cells:
+                rows.append(cells)
+    return rows
+
+
+class Section:
+    """A heading plus the text up to the next heading of equal or higher level."""
+
+    def __init__(self, level: int, title: str):
+        self.level = level
+        self.title = title
+        self.body = ""
+        self.children: List["Section"] = []
+        self._tables: Optional[List[List[str]]] = None
+
+    @property
+    def tables(self) -> List[List[str]]:
+        """Table rows in this section (children included), parsed once."""
+        if self._tables is None:
+            self._tables = _parse_table_rows(self.body)
+        return self._tables
+
+
+class Document:
+    """A markdown file parsed once: frontmatter, body and heading tree."""
+
+    def __init__(self, text: str):
+        self.text = text
+        self.frontmatter = parse_frontmatter(text)
+        self.body = text
+        if text.startswith("---"):
+            end = text.find("---", 3)
+            if end != -1:
+                self.body = text[end + 3:]
+
+        self.sections: List[Section] = []  # document order
+        self.roots: List[Section] = []
+        open_: List[tuple] = []  # (section, body start)
+        for m in _HEADING.finditer(text):
+            level = len(m.group(1))
+            while open_ and open_[-1][0].level >= level:
+                sec, start = open_.pop()
+                sec.body = text[start:m.start()]
+            sec = Section(level, m.group(2))
+            (open_[-1][0].children if open_ else self.roots).append(sec)
+            self.sections.append(sec)
+            open_.append((sec, m.end()))
+        for sec, start in open_:
+            sec.body = text[start:]
+
+    def find(self, heading_text: str) -> Optional[Section]:
+        """First heading (levels 1-4) containing heading_text, case-insensitive."""
+        needle = heading_text.lower()
+        for sec in self.sections:
+            if needle in sec.title.lower():
+                return sec
+        return None
+
+
+class DocumentStore:
+    """Session-wide cache of file contents and parsed documents."""
+
+    def __init__(self):
+        self._texts: Dict[str, Optional[str]] = {}
+        self._docs: Dict[str, Document] = {}
+        self._sections: Dict[str, Section] = {}
+
+    def read(self, rel_path: str) -> Optional[str]:
+        if rel_path not in self._texts:
+            p = BASE_DIR / rel_path
+            self._texts[rel_path] = p.read_text(encoding="utf-8") if p.exists() else None
+        return self._texts[rel_path]
+
+    def load(self, rel_path: str) -> Optional[Document]:
+        text = self.read(rel_path)
+        return None if text is None else self.parse(text)
+
+    def parse(self, text: str) -> Document:
+        doc = self._docs.get(text)
+        if doc is None:
+            doc = self._docs[text] = Document(text)
+            for sec in doc.sections:
+                self._sections.setdefault(sec.body, sec)
+        return doc
+
+    def section(self, body: str) -> Optional[Section]:
+        """The parsed section whose body is exactly this text, if any."""
+        return self._sections.get(body)
+
+
+DOCS = DocumentStore()
+
+
+# ============================================================
+# File Helpers
+# ============================================================
+
+def read_file(rel_path: str) -> Optional[str]:
+    """Read a file relative to project root. Returns None if missing."""
+    return DOCS.read(rel_path)
+
+
 def extract_section(content: str, heading_text: str) -> Optional[str]:
     """Extract a markdown section by heading text (fuzzy match).
 
@@ -103,53 +209,33 @@ def extract_section(content: str, heading_text: str) -> Optional[str]:
     """
     if not content:
         return None
-    pattern = r"^(#{1,4})\s+.*" + re.escape(heading_text) + r".*$"
-    match = re.search(pattern, content, re.MULTILINE | re.IGNORECASE)
-    if not match:
-        return None
-    level = len(match.group(1))
-    start = match.end()
-    # Find next heading of same or higher level
-    next_heading = re.search(
-        rf"^#{{{1},{level}}}\s+", content[start:], re.MULTILINE
-    )
-    if next_heading:
-        return content[start:start + next_heading.start()]
-    return content[start:]
+    sec = DOCS.parse(content).find(heading_text)
+    return sec.body if sec else None
 
 
 def extract_table_rows(section: str) -> List[List[str]]:
     """Extract markdown table rows as lists of cell values."""
     if not section:
         return []
-    rows = []
-    for line in section.split("\n"):
-        line = line.strip()
-        if line.startswith("|") and not re.match(r"\|[\s\-:]+\|", line):
-            cells = [c.strip() for c in line.split("|")[1:-1]]
-            if cells:
-                rows.append(cells)
-    return rows
+    sec = DOCS.section(section)
+    rows = sec.tables if sec else _parse_table_rows(section)
+    return [list(r) for r in rows]
 
 
 def get_agent_config(agent_name: str) -> Optional[Dict]:
     """Get parsed YAML frontmatter for an agent."""
-    content = read_file(f".claude/agents/{agent_name}.md")
-    if not content:
+    doc = DOCS.load(f".claude/agents/{agent_name}.md")
+    if not doc or not doc.text:
         return None
-    return parse_frontmatter(content)
+    return doc.frontmatter
 
 
 def get_agent_body(agent_name: str) -> Optional[str]:
     """Get the markdown body (after frontmatter) of an agent file."""
-    content = read_file(f".claude/agents/{agent_name}.md")
-    if not content:
+    doc = DOCS.load(f".claude/agents/{agent_name}.md")
+    if not doc or not doc.text:
         return None
-    if content.startswith("---"):
-        end = content.find("---", 3)
-        if end != -1:
-            return content[end + 3:]
-    return content
+    return doc.body
 
 
 def get_agent_memory(agent_name: str) -> Optional[str]:
@@ -207,6 +293,12 @@ def pytest_addoption(parser):
 # Session-scoped Fixtures
 # ============================================================
 
+@pytest.fixture(scope="session")
+def documents():
+    """The parsed document store (heading trees, tables, frontmatter)."""
+    return DOCS
+
+
 @pytest.fixture(scope="session")
 def claude_md():
     content = read_file("CLAUDE.md")
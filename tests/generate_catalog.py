@@ -8,16 +8,22 @@ live tests, and generates a comprehensive HTML catalog.
 
 Usage:
     python3 tests/generate_catalog.py
+    python3 tests/generate_catalog.py --force   # Rebuild even if no test file changed
 """
 
-import ast
 import re
+import sys
 import textwrap
 from pathlib import Path
 from datetime import date
 from dataclasses import dataclass, field
 from typing import Optional
 
+from inventory import load_inventory
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from tools.core.render import ReportJob, build, last_output
+
 # ============================================================
 # Configuration
 # ============================================================
@@ -80,7 +86,7 @@ class TestInfo:
 
 
 # ============================================================
-# AST-based Test Extraction
+# Test Extraction (via inventory.py)
 # ============================================================
 
 def determine_priority(class_name: str, method_name: str, docstring: str) -> str:
@@ -93,76 +99,6 @@ def determine_priority(class_name: str, method_name: str, docstring: str) -> str
     return "medium"
 
 
-def is_live_test(node: ast.FunctionDef, class_node: ast.ClassDef = None) -> bool:
-    """Check if a test is a live test by examining decorators and body."""
-    # Check method-level decorators
-    for decorator in node.decorator_list:
-        if isinstance(decorator, ast.Attribute) and decorator.attr == "live":
-            return True
-        if isinstance(decorator, ast.Call):
-            if isinstance(decorator.func, ast.Attribute) and decorator.func.attr == "live":
-                return True
-
-    # Check class-level decorators
-    if class_node:
-        for decorator in class_node.decorator_list:
-            if isinstance(decorator, ast.Attribute) and decorator.attr == "live":
-                return True
-            if isinstance(decorator, ast.Call):
-                if isinstance(decorator.func, ast.Attribute) and decorator.func.attr == "live":
-                    return True
-
-    # Check for pytest.skip("Live test") in body
-    for stmt in ast.walk(node):
-        if isinstance(stmt, ast.Call):
-            if isinstance(stmt.func, ast.Attribute) and stmt.func.attr == "skip":
-                for arg in stmt.args:
-                    if isinstance(arg, ast.Constant) and isinstance(arg.value, str):
-                        if "live" in arg.value.lower():
-                            return True
-    return False
-
-
-def check_parametrize(node: ast.FunctionDef) -> tuple:
-    """Check if a test method is parametrized, return (is_param, param_name, values)."""
-    for decorator in node.decorator_list:
-        if isinstance(decorator, ast.Call):
-            func = decorator.func
-            if isinstance(func, ast.Attribute) and func.attr == "parametrize":
-                if len(decorator.args) >= 2:
-                    param_name = ""
-                    values = []
-                    if isinstance(decorator.args[0], ast.Constant):
-                        param_name = decorator.args[0].value
-                    # Try to extract values
-                    val_node = decorator.args[1]
-                    if isinstance(val_node, ast.Name):
-                        # Reference to a class variable - we'll try to resolve later
-                        return True, param_name, [f"<{val_node.id}>"]
-                    elif isinstance(val_node, ast.List):
-                        for elt in val_node.elts:
-                            if isinstance(elt, ast.Constant):
-                                values.append(str(elt.value))
-                    return True, param_name, values
-    return False, "", []
-
-
-def resolve_class_variables(class_node: ast.ClassDef) -> dict:
-    """Extract class-level variable assignments (for parametrize references)."""
-    variables = {}
-    for stmt in class_node.body:
-        if isinstance(stmt, ast.Assign):
-            for target in stmt.targets:
-                if isinstance(target, ast.Name):
-                    if isinstance(stmt.value, ast.List):
-                        vals = []
-                        for elt in stmt.value.elts:
-                            if isinstance(elt, ast.Constant):
-                                vals.append(str(elt.value))
-                        variables[target.id] = vals
-    return variables
-
-
 def parse_live_docstring(docstring: str) -> tuple:
     """Parse scenario/expected/forbidden from live test docstrings."""
     scenario = ""
@@ -211,61 +147,43 @@ def parse_live_docstring(docstring: str) -> tuple:
     return scenario.strip(), expected.strip(), forbidden.strip()
 
 
-def extract_tests_from_file(filepath: Path) -> list:
-    """Parse a test file and extract all test information."""
+def extract_tests_from_file(filepath: Path, inventory: dict = None) -> list:
+    """Build TestInfo records for a test file from the shared inventory index.
+
+    Pass the result of one load_inventory() call when extracting many files.
+    """
     stem = filepath.stem
     if stem not in CATEGORY_MAP:
         return []
 
     cat_id, cat_name, cat_color = CATEGORY_MAP[stem]
 
-    source = filepath.read_text(encoding="utf-8")
-    try:
-        tree = ast.parse(source)
-    except SyntaxError:
-        return []
-
     tests = []
 
-    for node in ast.iter_child_nodes(tree):
-        if isinstance(node, ast.ClassDef) and node.name.startswith("Test"):
-            class_docstring = ast.get_docstring(node) or ""
-            class_vars = resolve_class_variables(node)
-
-            for item in node.body:
-                if isinstance(item, ast.FunctionDef) and item.name.startswith("test_"):
-                    docstring = ast.get_docstring(item) or ""
-                    live = is_live_test(item, node)
-                    is_param, param_name, param_vals = check_parametrize(item)
-
-                    # Resolve class variable references in parametrize
-                    if is_param and param_vals and param_vals[0].startswith("<"):
-                        var_name = param_vals[0][1:-1]
-                        if var_name in class_vars:
-                            param_vals = class_vars[var_name]
-
-                    scenario, expected, forbidden = "", "", ""
-                    if live:
-                        scenario, expected, forbidden = parse_live_docstring(docstring)
-
-                    priority = determine_priority(node.name, item.name, docstring)
-
-                    info = TestInfo(
-                        class_name=node.name,
-                        method_name=item.name,
-                        docstring=docstring,
-                        is_live=live,
-                        category_id=cat_id,
-                        category_name=cat_name,
-                        category_color=cat_color,
-                        priority=priority,
-                        scenario=scenario,
-                        expected=expected,
-                        forbidden=forbidden,
-                        is_parametrized=is_param,
-                        param_values=param_vals,
-                    )
-                    tests.append(info)
+    if inventory is None:
+        inventory = load_inventory([filepath])
+    for cls in inventory[filepath.name]["classes"]:
+        for m in cls["methods"]:
+            scenario, expected, forbidden = "", "", ""
+            if m["is_live"]:
+                scenario, expected, forbidden = parse_live_docstring(m["doc"])
+
+            info = TestInfo(
+                class_name=cls["name"],
+                method_name=m["name"],
+                docstring=m["doc"],
+                is_live=m["is_live"],
+                category_id=cat_id,
+                category_name=cat_name,
+                category_color=cat_color,
+                priority=determine_priority(cls["name"], m["name"], m["doc"]),
+                scenario=scenario,
+                expected=expected,
+                forbidden=forbidden,
+                is_parametrized=m["is_parametrized"],
+                param_values=m["param_values"],
+            )
+            tests.append(info)
 
     return tests
 
@@ -898,6 +816,34 @@ def generate_html(all_tests: list) -> str:
 # Main
 # ============================================================
 
+def collect_tests(test_files: list, verbose: bool = False) -> list:
+    """TestInfo records for every categorized test in test_files."""
+    all_tests = []
+    inventory = load_inventory(test_files)
+    for filepath in test_files:
+        tests = extract_tests_from_file(filepath, inventory)
+        all_tests.extend(tests)
+        if verbose:
+            print(f"  {filepath.name}: {len(tests)} tests extracted")
+    return all_tests
+
+
+def report_job(verbose: bool = False) -> ReportJob:
+    """The catalog is a function of the test files (and this generator)."""
+    test_files = sorted(TESTS_DIR.glob("test_*.py"))
+    return ReportJob(
+        key="test-catalog",
+        output=OUTPUT_FILE,
+        inputs=test_files,
+        render=lambda: generate_html(collect_tests(test_files, verbose)),
+        sources=[Path(__file__), TESTS_DIR / "inventory.py"],
+    )
+
+
+def report_jobs() -> list:
+    return [report_job()]
+
+
 def main():
     """Main entry point."""
     # Collect all test files
@@ -906,25 +852,15 @@ def main():
     for f in test_files:
         print(f"  - {f.name}")
 
-    # Extract tests
-    all_tests = []
-    for filepath in test_files:
-        tests = extract_tests_from_file(filepath)
-        all_tests.extend(tests)
-        print(f"  {filepath.name}: {len(tests)} tests extracted")
-
+    all_tests = collect_tests(test_files)
     print(f"\nTotal tests: {len(all_tests)}")
     print(f"  Static: {sum(1 for t in all_tests if not t.is_live)}")
     print(f"  Live:   {sum(1 for t in all_tests if t.is_live)}")
 
-    # Generate HTML
-    html = generate_html(all_tests)
-
-    # Ensure output directory exists
-    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+    if not build(report_job(verbose=True), force="--force" in sys.argv):
+        print(f"\nCatalog up to date (no test changes): {last_output('test-catalog')}")
+        return
 
-    # Write output
-    OUTPUT_FILE.write_text(html, encoding="utf-8")
     print(f"\nCatalog written to: {OUTPUT_FILE}")
     print(f"File size: {OUTPUT_FILE.stat().st_size:,} bytes")
 
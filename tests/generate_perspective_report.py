@@ -7,9 +7,9 @@
 
 Usage:
     python3 tests/generate_perspective_report.py
+    python3 tests/generate_perspective_report.py --force   # 入力が同じでも再生成
 """
 
-import ast
 import re
 import sys
 from pathlib import Path
@@ -21,6 +21,10 @@ OUTPUT_DIR = BASE_DIR / "reports"
 TODAY = date.today().isoformat()
 
 sys.path.insert(0, str(TESTS_DIR))
+sys.path.insert(0, str(BASE_DIR))
+
+from inventory import load_inventory
+from tools.core.render import ReportJob, build, last_output
 
 # ============================================================
 # Category Definitions (in Japanese)
@@ -258,43 +262,34 @@ SCENARIO_CATEGORIES = {
 }
 
 
-def count_tests_in_file(filepath: Path) -> dict:
-    """Count static and live tests in a file using AST."""
-    source = filepath.read_text(encoding="utf-8")
-    tree = ast.parse(source)
+def count_tests_in_file(filepath: Path, inventory: dict = None) -> dict:
+    """Count static and live tests in a file from the shared inventory index.
+
+    Pass the result of one load_inventory() call when counting many files.
+    """
     static = 0
     live = 0
     classes = []
 
-    for node in ast.iter_child_nodes(tree):
-        if isinstance(node, ast.ClassDef) and node.name.startswith("Test"):
-            class_doc = ast.get_docstring(node) or ""
-            class_is_live = any(
-                isinstance(d, ast.Attribute) and d.attr == "live"
-                for d in node.decorator_list
-            )
-            methods = []
-            for item in node.body:
-                if isinstance(item, ast.FunctionDef) and item.name.startswith("test_"):
-                    method_is_live = class_is_live or any(
-                        "skip" in ast.dump(stmt) and "Live" in ast.dump(stmt)
-                        for stmt in ast.walk(item)
-                    )
-                    if method_is_live:
-                        live += 1
-                    else:
-                        static += 1
-                    doc = ast.get_docstring(item) or ""
-                    methods.append({
-                        "name": item.name,
-                        "doc": doc.split("\n")[0].strip() if doc else "",
-                        "is_live": method_is_live,
-                    })
-            classes.append({
-                "name": node.name,
-                "doc": class_doc.split("\n")[0].strip() if class_doc else "",
-                "methods": methods,
+    if inventory is None:
+        inventory = load_inventory([filepath])
+    for cls in inventory[filepath.name]["classes"]:
+        methods = []
+        for m in cls["methods"]:
+            if m["is_live"]:
+                live += 1
+            else:
+                static += 1
+            methods.append({
+                "name": m["name"],
+                "doc": m["doc"].split("\n")[0].strip() if m["doc"] else "",
+                "is_live": m["is_live"],
             })
+        classes.append({
+            "name": cls["name"],
+            "doc": cls["doc"].split("\n")[0].strip() if cls["doc"] else "",
+            "methods": methods,
+        })
 
     return {"static": static, "live": live, "classes": classes}
 
@@ -322,13 +317,16 @@ def generate_html():
     total_static = 0
     total_live = 0
     cat_data = []
+    inventory = load_inventory(
+        [TESTS_DIR / cat["file"] for cat in CATEGORIES if (TESTS_DIR / cat["file"]).exists()]
+    )
 
     for cat in CATEGORIES:
         filepath = TESTS_DIR / cat["file"]
         if not filepath.exists():
             cat_data.append({**cat, "counts": {"static": 0, "live": 0, "classes": []}})
             continue
-        counts = count_tests_in_file(filepath)
+        counts = count_tests_in_file(filepath, inventory)
         total_static += counts["static"]
         total_live += counts["live"]
         cat_data.append({**cat, "counts": counts})
@@ -842,13 +840,31 @@ python3 tests/run_scenarios.py --dry-run            # 何が走るか確認</pre
     return "".join(parts)
 
 
+def report_job() -> ReportJob:
+    """入力: カテゴリ対象のテストファイル、シナリオ定義、エージェント定義。"""
+    inputs = [TESTS_DIR / cat["file"] for cat in CATEGORIES]
+    inputs.append(TESTS_DIR / "scenarios.py")
+    inputs.extend(sorted((BASE_DIR / ".claude" / "agents").glob("*.md")))
+    return ReportJob(
+        key="test-perspectives",
+        output=OUTPUT_DIR / f"test-perspectives-{TODAY}.html",
+        inputs=inputs,
+        render=generate_html,
+        sources=[Path(__file__), TESTS_DIR / "inventory.py"],
+    )
+
+
+def report_jobs():
+    return [report_job()]
+
+
 def main():
-    html = generate_html()
-    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
-    out_path = OUTPUT_DIR / f"test-perspectives-{TODAY}.html"
-    out_path.write_text(html, encoding="utf-8")
-    print(f"Report generated: {out_path}")
-    print(f"File size: {out_path.stat().st_size:,} bytes")
+    job = report_job()
+    if not build(job, force="--force" in sys.argv):
+        print(f"Up to date (inputs unchanged): {last_output(job.key)}")
+        return
+    print(f"Report generated: {job.output}")
+    print(f"File size: {job.output.stat().st_size:,} bytes")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,190 @@
+"""
+Test Inventory Index
+====================
+One AST pass over each tests/test_*.py file, shared by generate_catalog.py
+and generate_perspective_report.py.
+
+Each file's entry (classes, methods, docstrings, markers, parametrization
+and live status) is cached in .pytest_cache/. A file whose mtime and size
+match its entry is not read at all; otherwise it is hashed and re-parsed
+only if its content actually changed.
+
+A test is "live" when it or its class carries @pytest.mark.live, or its
+body calls pytest.skip() with a reason containing the word "live".
+"""
+
+import ast
+import hashlib
+import json
+import re
+from pathlib import Path
+
+TESTS_DIR = Path(__file__).resolve().parent
+BASE_DIR = TESTS_DIR.parent
+INDEX_PATH = BASE_DIR / ".pytest_cache" / "test-inventory.json"
+
+# Bump when the entry format or extraction rules change
+INDEX_VERSION = 3
+
+LIVE_WORD = re.compile(r"\blive\b", re.I)
+
+
+# ============================================================
+# AST Extraction
+# ============================================================
+
+def _decorator_name(node: ast.expr) -> str:
+    """'live' for @pytest.mark.live, 'parametrize' for @pytest.mark.parametrize(...)."""
+    if isinstance(node, ast.Call):
+        node = node.func
+    if isinstance(node, ast.Attribute):
+        return node.attr
+    if isinstance(node, ast.Name):
+        return node.id
+    return ""
+
+
+def _constant_list(node: ast.expr) -> list:
+    """String forms of the constant elements of a list/tuple literal."""
+    if not isinstance(node, (ast.List, ast.Tuple)):
+        return []
+    return [str(elt.value) for elt in node.elts if isinstance(elt, ast.Constant)]
+
+
+class LiveSkipFinder(ast.NodeVisitor):
+    """Detects a pytest.skip("... live ...") call anywhere in a test body."""
+
+    def __init__(self):
+        self.found = False
+
+    def visit_Call(self, node: ast.Call):
+        if _decorator_name(node.func) == "skip":
+            reasons = [*node.args, *(kw.value for kw in node.keywords)]
+            if any(isinstance(a, ast.Constant) and isinstance(a.value, str)
+                   and LIVE_WORD.search(a.value) for a in reasons):
+                self.found = True
+                return
+        self.generic_visit(node)
+
+    def generic_visit(self, node: ast.AST):
+        if not self.found:
+            super().generic_visit(node)
+
+
+def _has_live_skip(func: ast.FunctionDef) -> bool:
+    finder = LiveSkipFinder()
+    for stmt in func.body:
+        finder.visit(stmt)
+        if finder.found:
+            return True
+    return False
+
+
+def _parametrize(func: ast.FunctionDef, class_vars: dict) -> tuple:
+    """(param_name, values) of the first @pytest.mark.parametrize, or None."""
+    for dec in func.decorator_list:
+        if isinstance(dec, ast.Call) and _decorator_name(dec) == "parametrize" and len(dec.args) >= 2:
+            name_node, values_node = dec.args[0], dec.args[1]
+            name = name_node.value if isinstance(name_node, ast.Constant) else ""
+            if isinstance(values_node, ast.Name):
+                values = class_vars.get(values_node.id, [f"<{values_node.id}>"])
+            else:
+                values = _constant_list(values_node)
+            return name, values
+    return None
+
+
+def _class_variables(cls: ast.ClassDef) -> dict:
+    """Class-level list assignments (targets of parametrize references)."""
+    variables = {}
+    for stmt in cls.body:
+        if isinstance(stmt, ast.Assign) and isinstance(stmt.value, ast.List):
+            for target in stmt.targets:
+                if isinstance(target, ast.Name):
+                    variables[target.id] = _constant_list(stmt.value)
+    return variables
+
+
+def parse_test_source(source: str) -> dict:
+    """Inventory of one test module: {"classes": [...]} (plus "error" if unparsable)."""
+    try:
+        tree = ast.parse(source)
+    except SyntaxError as e:
+        return {"classes": [], "error": str(e)}
+
+    classes = []
+    for node in ast.iter_child_nodes(tree):
+        if not (isinstance(node, ast.ClassDef) and node.name.startswith("Test")):
+            continue
+        class_markers = [_decorator_name(d) for d in node.decorator_list]
+        class_vars = _class_variables(node)
+        methods = []
+        for item in node.body:
+            if not (isinstance(item, ast.FunctionDef) and item.name.startswith("test_")):
+                continue
+            markers = [_decorator_name(d) for d in item.decorator_list]
+            param = _parametrize(item, class_vars)
+            methods.append({
+                "name": item.name,
+                "doc": ast.get_docstring(item) or "",
+                "markers": markers,
+                "is_live": "live" in markers or "live" in class_markers or _has_live_skip(item),
+                "is_parametrized": param is not None,
+                "param_name": param[0] if param else "",
+                "param_values": param[1] if param else [],
+            })
+        classes.append({
+            "name": node.name,
+            "doc": ast.get_docstring(node) or "",
+            "markers": class_markers,
+            "is_live": "live" in class_markers,
+            "methods": methods,
+        })
+    return {"classes": classes}
+
+
+# ============================================================
+# Cached Index
+# ============================================================
+
+def _load_index() -> dict:
+    try:
+        index = json.loads(INDEX_PATH.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return {}
+    return index.get("files", {}) if index.get("version") == INDEX_VERSION else {}
+
+
+def load_inventory(paths: list = None) -> dict:
+    """{file name: inventory entry} for the given test files (default: all).
+
+    Files whose (mtime, size) or content hash matches the cached entry are
+    not re-parsed; the cache is rewritten only when something changed.
+    """
+    if paths is None:
+        paths = sorted(TESTS_DIR.glob("test_*.py"))
+    cached = _load_index()
+    files = dict(cached)
+    result = {}
+    for path in paths:
+        st = path.stat()
+        stamp = [st.st_mtime_ns, st.st_size]
+        entry = cached.get(path.name)
+        if not entry or entry.get("stamp") != stamp:
+            data = path.read_bytes()
+            sha = hashlib.sha256(data).hexdigest()
+            if not entry or entry.get("sha256") != sha:
+                entry = {"sha256": sha, **parse_test_source(data.decode("utf-8"))}
+            entry = files[path.name] = {**entry, "stamp": stamp}
+        result[path.name] = entry
+
+    if files != cached:
+        try:
+            INDEX_PATH.parent.mkdir(exist_ok=True)
+            INDEX_PATH.write_text(
+                json.dumps({"version": INDEX_VERSION, "files": files}, ensure_ascii=False),
+                encoding="utf-8",
+            )
+        except OSError:
+            pass  # the cache is an optimization; a read-only tree still works
+    return result
@@ -0,0 +1,40 @@
+"""
+Niche Analyzer Test Fixtures
+============================
+Shared by the tests of tools/niche-analyzer: puts the analyzer's flat
+script directory on sys.path and builds minimal eval JSONs holding only
+the fields the scoring engine reads.
+"""
+
+import json
+import sys
+from pathlib import Path
+
+NICHE_DIR = Path(__file__).resolve().parent.parent / "tools" / "niche-analyzer"
+if str(NICHE_DIR) not in sys.path:
+    sys.path.insert(0, str(NICHE_DIR))
+
+
+def make_eval(niche_id="niche", *, trend=("STABLE", "STABLE"), yt_median=0, top1=0.0,
+              tweets=0, reddit=0, questions=0, publishers=0, gap=0, ratio=1.0, com_raw=""):
+    """Eval JSON as evaluate_niche writes it, reduced to the scored inputs."""
+    question_raw = json.dumps([{"text": f"q{i}"} for i in range(questions)])
+    return {
+        "niche_id": niche_id,
+        "niche_name_en": niche_id,
+        "niche_name_jp": niche_id,
+        "evaluated_at": "2026-02-21T00:00:00",
+        "steps": {
+            "step0_trend": {"en": {"direction": trend[0]}, "jp": {"direction": trend[1]}},
+            "step1_demand": {
+                "en": {"yt_median_views": yt_median, "yt_top1_pct": top1,
+                       "tweets_30d": tweets, "reddit_posts": reddit},
+                "jp": {},
+            },
+            "step3_knowledge_gap": {"en": {"grok_raw": question_raw}, "jp": {"grok_raw": "[]"}},
+            "step4_supply": {"en": {"twitter_publishers": publishers}, "jp": {}},
+            "step5_gap": {"jp": gap},
+            "step6_localization": {"yt_ratio": ratio},
+            "step7_commercial": {"en": {"grok_raw": ""}, "jp": {"grok_raw": com_raw}},
+        },
+    }
@@ -7,6 +7,7 @@ End-to-end behavioral tests using the same agent definitions as production:
   - Uses each agent's defined model (from .claude/agents/*.md)
   - Captures tool calls via stream-json for dual verification
   - Separates main agent tools from sub-agent (delegated) tools
+  - Reads the stream as it arrives and stops a run once its verdict is decided
 
 Usage:
   python3 tests/run_scenarios.py                    # Run all
@@ -14,6 +15,10 @@ Usage:
   python3 tests/run_scenarios.py --id SC-C01        # Single scenario
   python3 tests/run_scenarios.py --dry-run           # Preview only
   python3 tests/run_scenarios.py --priority critical # Critical only
+  python3 tests/run_scenarios.py --jobs 4 --model-cap opus=1   # 4 at a time, 1 opus
+  python3 tests/run_scenarios.py --no-early-stop     # Let every run finish
+  python3 tests/run_scenarios.py --replay            # Reuse recorded streams if inputs unchanged
+  python3 tests/run_scenarios.py --changed           # Only scenarios whose inputs changed
 """
 
 import subprocess
@@ -23,13 +28,21 @@ import json
 import time
 import datetime
 import argparse
+import threading
+import hashlib
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).resolve().parent))
-from scenarios import SCENARIOS, AGENTS
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from scenarios import SCENARIOS, AGENTS, agent_input_paths
+from tools.core.render import ReportJob, build, load_manifest
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 REPORTS_DIR = BASE_DIR / "reports"
+# Local replay cache (gitignored): raw streams are machine-specific and re-recorded on demand
+RECORDINGS_DIR = Path(__file__).resolve().parent / "recordings"
+INPUTS_MANIFEST = RECORDINGS_DIR / "inputs.json"
 
 # Tools agents typically call during startup (reading MEMORY.md, docs, etc.)
 # These are NOT counted as "forbidden" unless explicitly listed.
@@ -40,29 +53,58 @@ STARTUP_TOOLS = {"Read", "Glob", "Grep"}
 # Stream-JSON Parsing
 # ============================================================
 
-def parse_stream_json(raw_output: str) -> dict:
-    """Parse stream-json output from claude -p --verbose.
+class StreamParser:
+    """Incremental parser for stream-json output from claude -p --verbose.
 
     Separates the main agent's direct tool calls from sub-agent tool calls.
     Rule: After a Task tool_use is seen, subsequent tool calls are from
     the sub-agent (delegated), not from the main agent.
     """
-    direct_tool_calls = []
-    delegated_tool_calls = []
-    text_parts = []
-    total_cost = 0.0
-    num_turns = 0
-    in_delegation = False
-
-    for line in raw_output.strip().split("\n"):
+
+    def __init__(self):
+        self.direct_tool_calls = []
+        self.delegated_tool_calls = []
+        self.text_parts = []
+        self.total_cost = 0.0
+        self.num_turns = 0
+        self.in_delegation = False
+        self._pending = ""
+
+    def feed(self, data: str) -> tuple:
+        """Consume output as it arrives: whole lines or arbitrary chunks.
+
+        Complete lines are parsed as they appear; a trailing fragment is
+        held until the rest of its line arrives (or parsed right away if it
+        is already a whole event, so line-at-a-time callers need no newline).
+        Returns (new direct tool calls, new main-agent text parts) so callers
+        can evaluate rules as events arrive.
+        """
+        new_tools, new_text = [], []
+        *lines, self._pending = (self._pending + data).split("\n")
+        if self._pending.strip() and self._parse(self._pending) is not None:
+            lines.append(self._pending)
+            self._pending = ""
+        for line in lines:
+            event = self._parse(line)
+            if event is not None:
+                tools, text = self._consume(event)
+                new_tools.extend(tools)
+                new_text.extend(text)
+        return new_tools, new_text
+
+    @staticmethod
+    def _parse(line: str):
         line = line.strip()
         if not line:
-            continue
+            return None
         try:
             event = json.loads(line)
         except json.JSONDecodeError:
-            continue
+            return None
+        return event if isinstance(event, dict) else None
 
+    def _consume(self, event: dict) -> tuple:
+        new_tools, new_text = [], []
         etype = event.get("type")
 
         if etype == "assistant":
@@ -74,70 +116,113 @@ def parse_stream_json(raw_output: str) -> dict:
                         "name": block.get("name", ""),
                         "input": block.get("input", {}),
                     }
-                    if in_delegation:
-                        delegated_tool_calls.append(tc)
+                    if self.in_delegation:
+                        self.delegated_tool_calls.append(tc)
                     else:
-                        direct_tool_calls.append(tc)
+                        self.direct_tool_calls.append(tc)
+                        new_tools.append(tc)
                         if tc["name"] == "Task":
-                            in_delegation = True
+                            self.in_delegation = True
                 elif block.get("type") == "text":
-                    if not in_delegation:
-                        text_parts.append(block.get("text", ""))
+                    if not self.in_delegation:
+                        text = block.get("text", "")
+                        self.text_parts.append(text)
+                        new_text.append(text)
 
         elif etype == "result":
-            total_cost = event.get("total_cost_usd", 0.0)
-            num_turns = event.get("num_turns", 0)
+            self.total_cost = event.get("total_cost_usd", 0.0)
+            self.num_turns = event.get("num_turns", 0)
             result_text = event.get("result", "")
             if result_text:
-                text_parts.append(result_text)
+                self.text_parts.append(result_text)
+                new_text.append(result_text)
 
-    return {
-        "direct_tool_calls": direct_tool_calls,
-        "delegated_tool_calls": delegated_tool_calls,
-        "all_tool_calls": direct_tool_calls + delegated_tool_calls,
-        "text_response": "\n".join(text_parts).strip(),
-        "total_cost_usd": total_cost,
-        "num_turns": num_turns,
-    }
+        return new_tools, new_text
 
+    def result(self) -> dict:
+        return {
+            "direct_tool_calls": self.direct_tool_calls,
+            "delegated_tool_calls": self.delegated_tool_calls,
+            "all_tool_calls": self.direct_tool_calls + self.delegated_tool_calls,
+            "text_response": "\n".join(self.text_parts).strip(),
+            "total_cost_usd": self.total_cost,
+            "num_turns": self.num_turns,
+        }
 
-# ============================================================
-# Scenario Execution
-# ============================================================
 
-def run_single_scenario(scenario: dict, timeout: int = 180) -> dict:
-    """Run a single scenario via claude -p --agent with stream-json output.
+def parse_stream_json(raw_output: str) -> dict:
+    """Parse complete stream-json output (see StreamParser)."""
+    parser = StreamParser()
+    parser.feed(raw_output.strip() + "\n")
+    return parser.result()
 
-    Uses the same --agent flag and model as production.
-    Verifies BOTH text keywords AND actual tool calls.
+
+class EarlyVerdict:
+    """Decide a scenario's verdict from stream events before the run ends.
+
+    FAIL is final as soon as the main agent calls a forbidden tool or says
+    a forbidden keyword. PASS is only final when the scenario has no
+    forbidden rules left to violate and every expected rule is satisfied.
+    Mirrors the end-of-run checks in apply_checks.
     """
-    agent = scenario["agent_context"]
-    prompt = scenario["prompt"]
-    max_turns = scenario.get("max_turns", 3)
 
-    # Resolve model from agent definition (production-matched)
-    agent_meta = AGENTS.get(agent, {})
-    model = agent_meta.get("model", "sonnet")
+    def __init__(self, scenario: dict):
+        self.expected_kw = scenario.get("expected_any", [])
+        self.forbidden_kw = scenario.get("forbidden_any", [])
+        self.expected_tools = scenario.get("expected_tools", [])
+        self.forbidden_tools = [t for t in scenario.get("forbidden_tools", []) if t not in STARTUP_TOOLS]
+        self.args_missing = {
+            (tool, arg) for tool, args in scenario.get("expected_tool_args", {}).items() for arg in args
+        }
+        self.kw_ok = not self.expected_kw
+        self.tools_ok = not self.expected_tools
+        self.can_pass_early = (
+            not self.forbidden_kw and not self.forbidden_tools
+            and bool(self.expected_kw or self.expected_tools or self.args_missing)
+        )
 
-    # Text checks
-    expected_kw = scenario.get("expected_any", [])
-    forbidden_kw = scenario.get("forbidden_any", [])
+    def update(self, new_tools: list, new_text: list):
+        """Feed new events; return a reason string once the verdict is decided."""
+        for tc in new_tools:
+            name = tc["name"]
+            if name in self.forbidden_tools:
+                return f"FAIL — forbidden tool {name} called"
+            if name in self.expected_tools:
+                self.tools_ok = True
+            if self.args_missing:
+                input_text = " ".join(str(v) for v in tc["input"].values())
+                self.args_missing = {
+                    (tool, arg) for tool, arg in self.args_missing
+                    if not (tool == name and arg in input_text)
+                }
+        for text in new_text:
+            hit = next((kw for kw in self.forbidden_kw if kw in text), None)
+            if hit:
+                return f"FAIL — forbidden keyword '{hit}'"
+            if not self.kw_ok and any(kw in text for kw in self.expected_kw):
+                self.kw_ok = True
+
+        if self.can_pass_early and self.kw_ok and self.tools_ok and not self.args_missing:
+            return "PASS — all expected rules met, no forbidden rules"
+        return None
 
-    # Tool checks
-    expected_tools = scenario.get("expected_tools", [])
-    forbidden_tools = scenario.get("forbidden_tools", [])
-    expected_tool_args = scenario.get("expected_tool_args", {})
 
-    result = {
+# ============================================================
+# Scenario Execution
+# ============================================================
+
+def new_result(scenario: dict) -> dict:
+    """Empty result record for a scenario (filled by apply_checks)."""
+    return {
         "id": scenario["id"],
         "name": scenario["name"],
         "category": scenario["category"],
         "priority": scenario["priority"],
-        "agent": agent,
-        "model": model,
-        "prompt": prompt,
+        "agent": scenario["agent_context"],
+        "model": scenario_model(scenario),
+        "prompt": scenario["prompt"],
         "pass_criteria": scenario.get("pass_criteria", ""),
-        "max_turns": max_turns,
+        "max_turns": scenario.get("max_turns", 3),
         # Text results
         "response": "",
         "expected_kw_found": [],
@@ -160,8 +245,31 @@ def run_single_scenario(scenario: dict, timeout: int = 180) -> dict:
         "cost_usd": 0.0,
         "num_turns": 0,
         "error": None,
+        "early_verdict": None,
     }
 
+
+def scenario_budget(scenario: dict) -> str:
+    return scenario.get("budget") or ("0.25" if "Task" in scenario.get("expected_tools", []) else "0.10")
+
+
+def run_single_scenario(scenario: dict, timeout: int = 180, early_stop: bool = True,
+                        raw_lines: list = None) -> dict:
+    """Run a single scenario via claude -p --agent with stream-json output.
+
+    Uses the same --agent flag and model as production.
+    Verifies BOTH text keywords AND actual tool calls. stdout is consumed
+    as it streams; with ``early_stop`` the process is killed as soon as
+    EarlyVerdict decides the outcome (cost of a killed run is unknown and
+    reported as 0). Lines read are appended to ``raw_lines`` if given.
+    """
+    agent = scenario["agent_context"]
+    prompt = scenario["prompt"]
+    model = scenario_model(scenario)
+    forbidden_tools = scenario.get("forbidden_tools", [])
+
+    result = new_result(scenario)
+
     start = time.time()
 
     # Unset CLAUDECODE to allow nested invocation
@@ -169,7 +277,7 @@ def run_single_scenario(scenario: dict, timeout: int = 180) -> dict:
     env.pop("CLAUDECODE", None)
 
     # Build command — production-matched: --agent + agent's own model
-    budget = scenario.get("budget") or ("0.25" if "Task" in expected_tools else "0.10")
+    budget = scenario_budget(scenario)
     cmd = [
         "claude", "-p",
         "--agent", agent,
@@ -184,22 +292,20 @@ def run_single_scenario(scenario: dict, timeout: int = 180) -> dict:
     if forbidden_tools:
         cmd.extend(["--disallowedTools", ",".join(forbidden_tools)])
 
-    timed_out = False
+    parser = StreamParser()
+    verdict = EarlyVerdict(scenario) if early_stop else None
     try:
-        proc = subprocess.run(
+        proc = subprocess.Popen(
             cmd,
-            input=prompt,
-            capture_output=True,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
             text=True,
-            timeout=timeout,
+            encoding="utf-8",
+            bufsize=1,
             cwd=str(BASE_DIR),
             env=env,
         )
-        raw = proc.stdout
-    except subprocess.TimeoutExpired as e:
-        timed_out = True
-        raw = (e.stdout or "") if isinstance(e.stdout, str) else (e.stdout or b"").decode("utf-8", errors="replace")
-        result["error"] = f"Timeout ({timeout}s) — partial output analyzed"
     except FileNotFoundError:
         result["error"] = "claude CLI not found"
         result["duration_sec"] = time.time() - start
@@ -209,10 +315,54 @@ def run_single_scenario(scenario: dict, timeout: int = 180) -> dict:
         result["duration_sec"] = time.time() - start
         return result
 
+    # Read events as they stream; kill the child on timeout or once decided
+    expired = threading.Event()
+
+    def expire():
+        expired.set()
+        proc.kill()
+
+    timer = threading.Timer(timeout, expire)
+    timer.daemon = True
+    timer.start()
+    try:
+        try:
+            proc.stdin.write(prompt)
+            proc.stdin.close()
+        except BrokenPipeError:
+            pass
+        for line in proc.stdout:
+            if raw_lines is not None:
+                raw_lines.append(line.rstrip("\n"))
+            new_tools, new_text = parser.feed(line)
+            if verdict and (new_tools or new_text):
+                decided = verdict.update(new_tools, new_text)
+                if decided:
+                    result["early_verdict"] = decided
+                    break
+    finally:
+        timer.cancel()
+        if proc.poll() is None:
+            proc.kill()
+        proc.wait()
+        proc.stdout.close()
+
+    timed_out = expired.is_set()
+    if timed_out:
+        result["error"] = f"Timeout ({timeout}s) — partial output analyzed"
     result["duration_sec"] = time.time() - start
 
-    # Parse stream-json
-    parsed = parse_stream_json(raw)
+    return apply_checks(result, parser.result(), scenario, timed_out)
+
+
+def apply_checks(result: dict, parsed: dict, scenario: dict, timed_out: bool = False) -> dict:
+    """Fill text/tool verdict fields of ``result`` from a parsed stream."""
+    expected_kw = scenario.get("expected_any", [])
+    forbidden_kw = scenario.get("forbidden_any", [])
+    expected_tools = scenario.get("expected_tools", [])
+    forbidden_tools = scenario.get("forbidden_tools", [])
+    expected_tool_args = scenario.get("expected_tool_args", {})
+
     result["response"] = parsed["text_response"]
     result["tool_calls"] = parsed["all_tool_calls"]
     result["cost_usd"] = parsed["total_cost_usd"]
@@ -275,6 +425,226 @@ def run_single_scenario(scenario: dict, timeout: int = 180) -> dict:
     return result
 
 
+# ============================================================
+# Record / Replay
+# ============================================================
+
+def _sha(data) -> str:
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    return hashlib.sha256(data).hexdigest()
+
+
+_file_hashes = {}
+
+
+def file_hash(path: Path) -> str:
+    """Content hash of an input file, memoized for the run ("missing" if absent)."""
+    if path not in _file_hashes:
+        _file_hashes[path] = _sha(path.read_bytes()) if path.exists() else "missing"
+    return _file_hashes[path]
+
+
+def agent_definition_hash(agent: str) -> str:
+    return file_hash(agent_input_paths(agent)["agent"])
+
+
+def recording_key(scenario: dict) -> str:
+    """What the live stream depends on: scenario id, agent definition, prompt,
+    model, and the CLI flags derived from the scenario (budget, blocked tools)."""
+    return _sha(json.dumps([
+        scenario["id"],
+        agent_definition_hash(scenario["agent_context"]),
+        scenario["prompt"],
+        scenario_model(scenario),
+        scenario_budget(scenario),
+        sorted(scenario.get("forbidden_tools", [])),
+    ], ensure_ascii=False))
+
+
+def rules_hash(scenario: dict) -> str:
+    """The pass/fail rules; a truncated stream is only valid for these."""
+    return _sha(json.dumps([
+        scenario.get(k) for k in
+        ("expected_any", "forbidden_any", "expected_tools", "forbidden_tools", "expected_tool_args")
+    ], ensure_ascii=False, sort_keys=True))
+
+
+def save_recording(scenario: dict, result: dict, raw_lines: list):
+    """Store the raw stream of a live run (not errors or timeouts)."""
+    if result["error"]:
+        return
+    RECORDINGS_DIR.mkdir(exist_ok=True)
+    data = {
+        "key": recording_key(scenario),
+        "scenario_id": scenario["id"],
+        "agent": scenario["agent_context"],
+        "model": result["model"],
+        "recorded_at": datetime.datetime.now().isoformat(timespec="seconds"),
+        # An early-stopped stream only proves the verdict for the rules it ran under
+        "complete": not result["early_verdict"],
+        "rules_hash": rules_hash(scenario),
+        "early_verdict": result["early_verdict"],
+        "duration_sec": result["duration_sec"],
+        "stream": raw_lines,
+    }
+    path = RECORDINGS_DIR / f"{scenario['id']}.json"
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(data, ensure_ascii=False, indent=1), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def load_recording(scenario: dict):
+    """Recording still valid for this scenario, or None."""
+    path = RECORDINGS_DIR / f"{scenario['id']}.json"
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return None
+    if data.get("key") != recording_key(scenario):
+        return None
+    if not data.get("complete") and data.get("rules_hash") != rules_hash(scenario):
+        return None
+    return data
+
+
+def replay_scenario(scenario: dict, recording: dict) -> dict:
+    """Verify a scenario offline against its recorded stream."""
+    start = time.time()
+    result = new_result(scenario)
+    result["replayed"] = recording["recorded_at"]
+    result["early_verdict"] = recording.get("early_verdict")
+    parser = StreamParser()
+    for line in recording["stream"]:
+        parser.feed(line + "\n")
+    apply_checks(result, parser.result(), scenario)
+    # Nothing was spent this run; keep what the recording cost for reference
+    result["recorded_cost_usd"], result["cost_usd"] = result["cost_usd"], 0.0
+    result["duration_sec"] = time.time() - start
+    return result
+
+
+def run_or_replay(scenario: dict, timeout: int = 180, early_stop: bool = True,
+                  replay: bool = False, offline: bool = False) -> dict:
+    """Replay from a valid recording when allowed, else run live and record."""
+    if replay or offline:
+        recording = load_recording(scenario)
+        if recording:
+            return replay_scenario(scenario, recording)
+        if offline:
+            result = new_result(scenario)
+            result["error"] = "No valid recording (offline mode)"
+            return result
+    raw_lines = []
+    result = run_single_scenario(scenario, timeout, early_stop, raw_lines=raw_lines)
+    save_recording(scenario, result, raw_lines)
+    return result
+
+
+# ============================================================
+# Change-Impact Selection
+# ============================================================
+
+def scenario_inputs(scenario: dict) -> dict:
+    """Fingerprint of everything a scenario's run depends on.
+
+    The scenario definition itself (prompt, rules, and agent metadata
+    already resolved into it via A()), its model, and each file
+    get_agent_system_prompt assembles: CLAUDE.md, the agent's MEMORY.md
+    and .claude/agents/<agent>.md.
+    """
+    inputs = {
+        "scenario": _sha(json.dumps(scenario, ensure_ascii=False, sort_keys=True)),
+        "model": scenario_model(scenario),
+    }
+    for path in agent_input_paths(scenario["agent_context"]).values():
+        rel = path.relative_to(BASE_DIR).as_posix() if path.is_relative_to(BASE_DIR) else str(path)
+        inputs[rel] = file_hash(path)
+    return inputs
+
+
+def load_inputs_manifest() -> dict:
+    try:
+        return json.loads(INPUTS_MANIFEST.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+
+def changed_inputs(scenario: dict, manifest: dict) -> list:
+    """Inputs that differ from the scenario's last passing run (empty = unchanged)."""
+    last = manifest.get(scenario["id"])
+    if not last:
+        return ["(no passing run recorded)"]
+    current = scenario_inputs(scenario)
+    return [k for k in current if current[k] != last["inputs"].get(k)]
+
+
+def update_inputs_manifest(scenarios: list, results: list):
+    """Remember the inputs of scenarios that passed live in this run.
+
+    Failures are not recorded, so a failing scenario stays selected by
+    --changed until it passes. Replays are not recorded either: the
+    recording key covers only the agent definition, so a replay may not
+    have exercised the current CLAUDE.md / MEMORY.md.
+    """
+    manifest = load_inputs_manifest()
+    now = datetime.datetime.now().isoformat(timespec="seconds")
+    for s, r in zip(scenarios, results):
+        if r["passed"] and not r["error"] and not r.get("replayed"):
+            manifest[s["id"]] = {"inputs": scenario_inputs(s), "passed_at": now}
+    RECORDINGS_DIR.mkdir(exist_ok=True)
+    INPUTS_MANIFEST.write_text(json.dumps(manifest, ensure_ascii=False, indent=1, sort_keys=True),
+                               encoding="utf-8")
+
+
+def scenario_model(scenario: dict) -> str:
+    """Model the scenario's agent runs on (same resolution as run_single_scenario)."""
+    return AGENTS.get(scenario["agent_context"], {}).get("model", "sonnet")
+
+
+def run_scenarios_parallel(scenarios: list, jobs: int, model_caps: dict = None,
+                           run=run_single_scenario, on_result=None) -> list:
+    """Run scenarios on a bounded pool; return results in input order.
+
+    At most ``jobs`` claude processes run at once, and at most
+    ``model_caps[model]`` of them on one model. Scenarios are started in
+    list order as soon as both limits allow, so a capped model never ties
+    up a pool slot while it waits. ``run(scenario)`` produces each result. ``on_result(result, done, total)`` is
+    called from this thread as each scenario finishes.
+    """
+    model_caps = model_caps or {}
+    pending = list(enumerate(scenarios))
+    results = [None] * len(scenarios)
+    running = {}           # future -> (index, model)
+    per_model = {}         # model -> in-flight count
+    done = 0
+
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        while pending or running:
+            # Start everything the pool and per-model caps allow, in order
+            for item in list(pending):
+                if len(running) >= jobs:
+                    break
+                idx, s = item
+                model = scenario_model(s)
+                if per_model.get(model, 0) >= model_caps.get(model, jobs):
+                    continue
+                pending.remove(item)
+                per_model[model] = per_model.get(model, 0) + 1
+                running[pool.submit(run, s)] = (idx, model)
+
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for fut in finished:
+                idx, model = running.pop(fut)
+                per_model[model] -= 1
+                results[idx] = fut.result()
+                done += 1
+                if on_result:
+                    on_result(results[idx], done, len(scenarios))
+
+    return results
+
+
 # ============================================================
 # Terminal Output (detailed, visible)
 # ============================================================
@@ -320,6 +690,10 @@ def print_scenario_detail(r: dict):
     if r["expected_args_missing"]:
         print(f"      args: MISSING={r['expected_args_missing']}")
 
+    if r.get("replayed"):
+        print(f"      replayed: recording from {r['replayed']}")
+    if r.get("early_verdict"):
+        print(f"      early stop: {r['early_verdict']}")
     if r["error"]:
         print(f"      error: {r['error']}")
 
@@ -408,6 +782,8 @@ def generate_report(results: list, duration_sec: float) -> str:
         if r["expected_args_missing"]:
             a = " ".join(f'<span class="kw kw-r">{esc(x)}</span>' for x in r["expected_args_missing"])
             ev += f'<div class="ev ev-bad">Tool args NOT matched: {a}</div>'
+        if r.get("early_verdict"):
+            ev += f'<div class="ev {"ev-ok" if r["passed"] else "ev-bad"}">Stopped early: {esc(r["early_verdict"])}</div>'
         if r["error"]:
             ev += f'<div class="ev ev-bad">Error: {esc(r["error"])}</div>'
 
@@ -421,7 +797,7 @@ def generate_report(results: list, duration_sec: float) -> str:
     <span class="{bc}">{st}</span>
     <span class="sid">{r["id"]}</span>
     <b class="sn">{esc(r["name"])}</b>
-    <span class="sm">{r["agent"]} ({r.get("model","?")}) | {r["duration_sec"]:.1f}s | ${r.get("cost_usd",0):.4f}</span>
+    <span class="sm">{r["agent"]} ({r.get("model","?")}) | {r["duration_sec"]:.1f}s | ${r.get("cost_usd",0):.4f}{" | replayed" if r.get("replayed") else ""}</span>
     {tb} {tlb}
   </div>
   <div class="sd">
@@ -500,6 +876,41 @@ tr.pass td{{background:#f8fff8}}tr.fail td{{background:#fff8f8}}
 </div></body></html>'''
 
 
+def _json_report_job(json_path: Path) -> ReportJob:
+    """HTML report rendered from a saved --json results file."""
+    def render():
+        data = json.loads(json_path.read_text(encoding="utf-8"))
+        results = data["results"]
+        duration = data.get("duration_sec", sum(r.get("duration_sec", 0) for r in results))
+        return generate_report(results, duration)
+
+    return ReportJob(
+        key=f"scenario/{json_path.stem.removeprefix('scenario-report-')}",
+        output=json_path.with_suffix(".html"),
+        inputs=[json_path],
+        render=render,
+        sources=[Path(__file__)],
+        meta={"from_json": True},
+    )
+
+
+def report_jobs() -> list:
+    """Re-render HTML reports from saved --json results (generate-reports-index.py --all).
+
+    Skips reports whose HTML was last written by a run that saved no JSON:
+    the JSON on disk is older than that HTML and would overwrite newer results.
+    """
+    manifest = load_manifest()
+    jobs = []
+    for json_path in sorted(REPORTS_DIR.glob("scenario-report-*.json")):
+        job = _json_report_job(json_path)
+        entry = manifest.get(job.key)
+        if entry and not entry.get("from_json"):
+            continue
+        jobs.append(job)
+    return jobs
+
+
 # ============================================================
 # CLI
 # ============================================================
@@ -513,8 +924,27 @@ def main():
     parser.add_argument("--dry-run", action="store_true")
     parser.add_argument("--json", action="store_true")
     parser.add_argument("--no-open", action="store_true")
+    parser.add_argument("--no-early-stop", action="store_true",
+                        help="Let every run finish even once its verdict is decided")
+    parser.add_argument("--changed", action="store_true",
+                        help="Only scenarios whose inputs changed since their last passing run")
+    parser.add_argument("--replay", action="store_true",
+                        help="Verify from recorded streams where still valid; run the rest live")
+    parser.add_argument("--offline", action="store_true",
+                        help="Replay only; scenarios without a valid recording error out")
+    parser.add_argument("--jobs", "-j", type=int, default=1,
+                        help="Scenarios to run concurrently (default: 1)")
+    parser.add_argument("--model-cap", action="append", default=[], metavar="MODEL=N",
+                        help="Max concurrent scenarios on one model, e.g. opus=1 (repeatable)")
     args = parser.parse_args()
 
+    model_caps = {}
+    for item in args.model_cap:
+        model, _, n = item.partition("=")
+        if not n.isdigit() or int(n) < 1:
+            parser.error(f"--model-cap expects MODEL=N, got '{item}'")
+        model_caps[model] = int(n)
+
     scenarios = SCENARIOS
     if args.id:
         scenarios = [s for s in scenarios if s["id"] == args.id]
@@ -523,6 +953,17 @@ def main():
     if args.priority:
         scenarios = [s for s in scenarios if s["priority"] == args.priority]
 
+    impact = {}
+    if args.changed:
+        manifest = load_inputs_manifest()
+        impact = {s["id"]: changed_inputs(s, manifest) for s in scenarios}
+        skipped = sum(1 for s in scenarios if not impact[s["id"]])
+        scenarios = [s for s in scenarios if impact[s["id"]]]
+        print(f"\n  Change-impact: {len(scenarios)} affected, {skipped} unchanged (skipped)")
+        if not scenarios:
+            print("  Nothing to run.")
+            return 0
+
     if not scenarios:
         print("No matching scenarios found.")
         return 1
@@ -541,6 +982,8 @@ def main():
         et = ",".join(s.get("expected_tools", [])) or "-"
         ft = ",".join(s.get("forbidden_tools", [])) or "-"
         print(f"  [{s['id']}] {s['name']} ({s['agent_context']}/{m}) expect=[{et}] forbid=[{ft}]")
+        if impact.get(s["id"]):
+            print(f"      changed: {', '.join(impact[s['id']])}")
     print()
 
     if args.dry_run:
@@ -553,17 +996,33 @@ def main():
     results = []
     t0 = time.time()
 
-    for i, s in enumerate(scenarios, 1):
-        m = AGENTS.get(s["agent_context"], {}).get("model", "?")
-        print(f"\n  [{i}/{len(scenarios)}] {s['id']}: {s['name']} ({s['agent_context']}/{m})")
-        print(f"      prompt: {s['prompt'][:80]}...")
-        print(f"      running...", flush=True)
+    def run(s):
+        return run_or_replay(s, timeout=args.timeout, early_stop=not args.no_early_stop,
+                             replay=args.replay, offline=args.offline)
+
+    if args.jobs > 1:
+        caps = ", ".join(f"{m}={n}" for m, n in model_caps.items()) or "none"
+        print(f"\n  Parallel: {args.jobs} jobs, model caps: {caps}\n", flush=True)
 
-        r = run_single_scenario(s, timeout=args.timeout)
-        results.append(r)
-        print_scenario_detail(r)
+        def on_result(r, done, total):
+            print(f"  ({done}/{total} done)")
+            print_scenario_detail(r)
+            sys.stdout.flush()
+
+        results = run_scenarios_parallel(scenarios, args.jobs, model_caps, run=run, on_result=on_result)
+    else:
+        for i, s in enumerate(scenarios, 1):
+            m = AGENTS.get(s["agent_context"], {}).get("model", "?")
+            print(f"\n  [{i}/{len(scenarios)}] {s['id']}: {s['name']} ({s['agent_context']}/{m})")
+            print(f"      prompt: {s['prompt'][:80]}...")
+            print(f"      running...", flush=True)
+
+            r = run(s)
+            results.append(r)
+            print_scenario_detail(r)
 
     total_dur = time.time() - t0
+    update_inputs_manifest(scenarios, results)
     passed = sum(1 for r in results if r["passed"])
     failed = len(results) - passed
     total_cost = sum(r.get("cost_usd", 0) for r in results)
@@ -585,13 +1044,24 @@ def main():
     REPORTS_DIR.mkdir(exist_ok=True)
     tag = datetime.datetime.now().strftime("%Y-%m-%d")
     html_path = REPORTS_DIR / f"scenario-report-{tag}.html"
-    html_path.write_text(generate_report(results, total_dur), encoding="utf-8")
-    print(f"  HTML report: {html_path}")
-
     if args.json:
+        # Write the JSON first and render from it, so --all sees it as current
         json_path = REPORTS_DIR / f"scenario-report-{tag}.json"
-        data = {"generated": datetime.datetime.now().isoformat(), "results": results}
+        data = {"generated": datetime.datetime.now().isoformat(), "duration_sec": total_dur,
+                "results": results}
         json_path.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+        build(_json_report_job(json_path), force=True)
+    else:
+        build(ReportJob(
+            key=f"scenario/{tag}",
+            output=html_path,
+            inputs=[results, round(total_dur, 1)],
+            render=lambda: generate_report(results, total_dur),
+            sources=[Path(__file__)],
+            meta={"from_json": False},
+        ), force=True)
+    print(f"  HTML report: {html_path}")
+    if args.json:
         print(f"  JSON report: {json_path}")
 
     # Open report (macOS)
@@ -9,82 +9,200 @@ Usage:
   python3 tests/run_tests.py --live    # Include live behavioral tests
   python3 tests/run_tests.py -v        # Verbose output
   python3 tests/run_tests.py -k role   # Run only role boundary tests
+  python3 tests/run_tests.py --shards 4   # Split test files across 4 processes
+
+Per-test durations are kept in .pytest_cache/ between runs. They balance
+shards and flag tests that got markedly slower than their recent history.
 """
 
 import subprocess
 import sys
 import os
-import re
+import json
+import argparse
+import statistics
+import html as html_lib
+import tempfile
 import datetime
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 TESTS_DIR = BASE_DIR / "tests"
 REPORTS_DIR = BASE_DIR / "reports"
 
+sys.path.insert(0, str(BASE_DIR))
+from tools.core.render import ReportJob, build
+
+SLOWEST_TESTS = 15
+
+TIMINGS_PATH = BASE_DIR / ".pytest_cache" / "run_tests-durations.json"
+TIMINGS_KEEP = 10              # durations remembered per test
+REGRESSION_FACTOR = 2.0        # flag when slower than 2x the recent median...
+REGRESSION_MIN_SEC = 0.05      # ...and by at least this much (ignores noise)
 
-def run_pytest(extra_args=None):
-    """Run pytest and capture results."""
+
+def run_pytest(extra_args=None, junit_path=None, paths=None, capture=False):
+    """Run pytest and return (exit code, captured output or "").
+
+    Per-test results are written to junit_path (JUnit XML) rather than
+    scraped from the console output. Output streams to the console
+    unless capture is set (shards capture so their output doesn't interleave).
+    """
     cmd = [
         sys.executable, "-m", "pytest",
-        str(TESTS_DIR),
+        *[str(p) for p in (paths or [TESTS_DIR])],
         "-v",
         "--tb=short",
         "-q",
+        "-o", "junit_family=xunit1",
+        f"--junitxml={junit_path}",
     ]
     if extra_args:
         cmd.extend(extra_args)
 
+    if not capture:
+        return subprocess.run(cmd, cwd=str(BASE_DIR)).returncode, ""
     result = subprocess.run(
-        cmd,
-        capture_output=True,
-        text=True,
-        cwd=str(BASE_DIR),
+        cmd, cwd=str(BASE_DIR), stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True,
     )
-    return result
-
+    return result.returncode, result.stdout
+
+
+# ============================================================
+# Timing History & Sharding
+# ============================================================
+
+def load_timings():
+    """{test id: [recent durations, oldest first]} from previous runs."""
+    try:
+        return json.loads(TIMINGS_PATH.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+
+def save_timings(timings, tests):
+    """Append this run's durations (skipped tests excluded) and persist."""
+    for t in tests:
+        if t["outcome"] != "skipped":
+            timings[t["id"]] = (timings.get(t["id"], []) + [round(t["duration"], 4)])[-TIMINGS_KEEP:]
+    TIMINGS_PATH.parent.mkdir(exist_ok=True)
+    TIMINGS_PATH.write_text(json.dumps(timings, indent=1, sort_keys=True), encoding="utf-8")
+
+
+def find_regressions(timings, tests):
+    """Tests much slower than their recent median: [(test, median), ...], worst first."""
+    slower = []
+    for t in tests:
+        history = timings.get(t["id"])
+        if t["outcome"] == "skipped" or not history:
+            continue
+        median = statistics.median(history)
+        if t["duration"] > median * REGRESSION_FACTOR and t["duration"] - median > REGRESSION_MIN_SEC:
+            slower.append((t, median))
+    return sorted(slower, key=lambda x: x[0]["duration"] - x[1], reverse=True)
+
+
+def plan_shards(files, timings, shards):
+    """Split test files into balanced shards using recorded durations.
+
+    Files are kept whole (module/class fixtures stay in one process).
+    Longest-first greedy assignment; files with no history are weighted
+    by the median known file time.
+    """
+    weights = {f: 0.0 for f in files}
+    by_rel = {f.relative_to(BASE_DIR).as_posix(): f for f in files}
+    for test_id, history in timings.items():
+        f = by_rel.get(test_id.split("::")[0])
+        if f is not None:
+            weights[f] += statistics.median(history)
+    known = [w for w in weights.values() if w > 0]
+    default = statistics.median(known) if known else 1.0
+    for f in files:
+        weights[f] = weights[f] or default
+
+    buckets = [[0.0, []] for _ in range(min(shards, len(files)))]
+    for f in sorted(files, key=lambda f: (-weights[f], f.name)):
+        bucket = min(buckets, key=lambda b: b[0])
+        bucket[0] += weights[f]
+        bucket[1].append(f)
+    return [sorted(b[1]) for b in buckets if b[1]]
+
+
+def run_sharded(extra_args, tmp, shards, timings):
+    """Run shards in parallel; return (exit code, merged results)."""
+    plan = plan_shards(sorted(TESTS_DIR.glob("test_*.py")), timings, shards)
+    print(f"Running {len(plan)} shards:")
+    for i, files in enumerate(plan):
+        print(f"  [{i + 1}] {', '.join(f.name for f in files)}")
+    print()
 
-def parse_pytest_output(output):
-    """Parse pytest verbose output into structured data."""
+    def run(i):
+        junit_path = Path(tmp) / f"junit-{i}.xml"
+        code, output = run_pytest(extra_args, junit_path, paths=plan[i], capture=True)
+        return code, output, parse_junit_xml(junit_path)
+
+    with ThreadPoolExecutor(max_workers=len(plan)) as pool:
+        outcomes = list(pool.map(run, range(len(plan))))
+
+    merged = {k: [] for k in ("passed", "failed", "skipped", "errors", "tests")}
+    codes = []
+    for i, (code, output, parsed) in enumerate(outcomes):
+        print(f"----- shard {i + 1}/{len(plan)} (exit {code}) -----")
+        print(output)
+        codes.append(code)
+        for k in merged:
+            merged[k].extend(parsed[k])
+    merged["summary"] = {k: len(merged[k]) for k in ("passed", "failed", "skipped", "errors")}
+    # 5 = no tests collected in that shard (e.g. filtered out by -k); not a failure
+    failing = [c for c in codes if c not in (0, 5)]
+    return (failing[0] if failing else (0 if 0 in codes else 5)), merged
+
+
+def _node_id(classname, name):
+    """Rebuild a pytest node id ("tests/test_x.py::TestY::test_z") from JUnit fields."""
+    parts = classname.split(".") if classname else []
+    for i in range(len(parts), 0, -1):
+        path = Path(*parts[:i]).with_suffix(".py")
+        if (BASE_DIR / path).exists():
+            return "::".join([path.as_posix(), *parts[i:], name])
+    return "::".join([*parts, name])
+
+
+def parse_junit_xml(path):
+    """Load per-test outcome, duration and failure text from a JUnit XML report."""
     results = {
         "passed": [],
         "failed": [],
         "skipped": [],
         "errors": [],
+        "tests": [],
     }
-
-    for line in output.split("\n"):
-        line = line.strip()
-        if " PASSED" in line:
-            results["passed"].append(line.replace(" PASSED", ""))
-        elif " FAILED" in line:
-            results["failed"].append(line.replace(" FAILED", ""))
-        elif " SKIPPED" in line:
-            # Extract skip reason
-            results["skipped"].append(line.replace(" SKIPPED", ""))
-        elif " ERROR" in line:
-            results["errors"].append(line.replace(" ERROR", ""))
-
-    # Parse summary line
-    summary_match = re.search(
-        r"(\d+) passed(?:, (\d+) failed)?(?:, (\d+) skipped)?(?:, (\d+) error)?",
-        output
-    )
-    if summary_match:
-        results["summary"] = {
-            "passed": int(summary_match.group(1) or 0),
-            "failed": int(summary_match.group(2) or 0),
-            "skipped": int(summary_match.group(3) or 0),
-            "errors": int(summary_match.group(4) or 0),
+    try:
+        root = ET.parse(path).getroot()
+    except (OSError, ET.ParseError):
+        root = ET.Element("testsuites")
+
+    for case in root.iter("testcase"):
+        test = {
+            "id": _node_id(case.get("classname", ""), case.get("name", "")),
+            "file": case.get("file", ""),
+            "duration": float(case.get("time") or 0),
+            "outcome": "passed",
+            "message": "",
+            "details": "",
         }
-    else:
-        results["summary"] = {
-            "passed": len(results["passed"]),
-            "failed": len(results["failed"]),
-            "skipped": len(results["skipped"]),
-            "errors": len(results["errors"]),
-        }
-
+        for child in case:
+            if child.tag in ("failure", "error", "skipped"):
+                test["outcome"] = {"failure": "failed", "error": "errors"}.get(child.tag, "skipped")
+                test["message"] = child.get("message", "")
+                test["details"] = child.text or ""
+                break
+        results[test["outcome"]].append(test["id"])
+        results["tests"].append(test)
+
+    results["summary"] = {k: len(results[k]) for k in ("passed", "failed", "skipped", "errors")}
     return results
 
 
@@ -105,7 +223,46 @@ def categorize_test(test_name):
     return "Other"
 
 
-def generate_html_report(results, pytest_output, duration_sec):
+def _slowest_tests_html(tests, limit=SLOWEST_TESTS):
+    """Table of the slowest tests by wall time (setup + call + teardown)."""
+    slowest = sorted(tests, key=lambda t: t["duration"], reverse=True)[:limit]
+    if not slowest:
+        return ""
+    rows = ""
+    for t in slowest:
+        rows += f"""
+        <tr class="{'fail' if t['outcome'] in ('failed', 'errors') else 'pass'}">
+          <td><code>{html_lib.escape(t["id"])}</code></td>
+          <td>{t["outcome"]}</td>
+          <td class="num">{t["duration"]:.3f}s</td>
+        </tr>"""
+    return f"""<h2>Slowest Tests</h2>
+  <table>
+    <thead><tr><th>Test</th><th>Outcome</th><th>Duration</th></tr></thead>
+    <tbody>{rows}</tbody>
+  </table>"""
+
+
+def _regressions_html(regressions):
+    if not regressions:
+        return ""
+    rows = ""
+    for t, median in regressions:
+        rows += f"""
+        <tr class="fail">
+          <td><code>{html_lib.escape(t["id"])}</code></td>
+          <td class="num">{median:.3f}s</td>
+          <td class="num">{t["duration"]:.3f}s</td>
+          <td class="num">{t["duration"] / max(median, 1e-6):.1f}x</td>
+        </tr>"""
+    return f"""<h2>Speed Regressions</h2>
+  <table>
+    <thead><tr><th>Test</th><th>Recent median</th><th>This run</th><th>Ratio</th></tr></thead>
+    <tbody>{rows}</tbody>
+  </table>"""
+
+
+def generate_html_report(results, duration_sec, regressions=()):
     """Generate HTML test report."""
     now = datetime.datetime.now()
     date_str = now.strftime("%Y-%m-%d %H:%M")
@@ -150,18 +307,20 @@ def generate_html_report(results, pytest_output, duration_sec):
 
     # Generate failed test details
     failed_html = ""
-    if results["failed"]:
+    failures = [t for t in results["tests"] if t["outcome"] in ("failed", "errors")]
+    if failures:
         failed_html = "<h2>Failed Tests</h2><div class='failed-list'>"
-        for test in results["failed"]:
-            failed_html += f"<div class='failed-item'><code>{test}</code></div>"
-        failed_html += "</div>"
-
-        # Add failure details from pytest output
-        if "FAILURES" in pytest_output:
-            failure_text = pytest_output[pytest_output.find("FAILURES"):]
-            # Escape HTML
-            failure_text = failure_text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
-            failed_html += f"<h3>Details</h3><pre class='failure-detail'>{failure_text}</pre>"
+        for t in failures:
+            failed_html += f"<div class='failed-item'><code>{html_lib.escape(t['id'])}</code></div>"
+        failed_html += "</div><h3>Details</h3>"
+        for t in failures:
+            failed_html += (
+                f"<pre class='failure-detail'><strong>{html_lib.escape(t['id'])}</strong>\n"
+                f"{html_lib.escape(t['details'] or t['message'])}</pre>"
+            )
+
+    slowest_html = _slowest_tests_html(results["tests"])
+    regressions_html = _regressions_html(regressions)
 
     status_emoji = "ALL PASS" if s["failed"] == 0 else f"{s['failed']} FAILURES"
     status_class = "status-pass" if s["failed"] == 0 else "status-fail"
@@ -210,6 +369,7 @@ def generate_html_report(results, pytest_output, duration_sec):
   }}
   th {{ background: #f1f3f5; padding: 0.7rem 1rem; text-align: left; font-size: 0.85rem; }}
   td {{ padding: 0.6rem 1rem; border-top: 1px solid #e9ecef; font-size: 0.85rem; }}
+  td.num {{ text-align: right; font-variant-numeric: tabular-nums; }}
   tr.pass td {{ background: #f8fff8; }}
   tr.fail td {{ background: #fff8f8; }}
   .num-pass {{ color: #198754; font-weight: 600; }}
@@ -223,7 +383,7 @@ def generate_html_report(results, pytest_output, duration_sec):
   .failure-detail {{
     background: #f8f9fa; border: 1px solid #dee2e6; border-radius: 4px;
     padding: 1rem; font-size: 0.8rem; overflow-x: auto; max-height: 600px;
-    overflow-y: auto; white-space: pre-wrap;
+    overflow-y: auto; white-space: pre-wrap; margin-bottom: 0.5rem;
   }}
   .footer {{ margin-top: 2rem; font-size: 0.8rem; color: #adb5bd; text-align: center; }}
 </style>
@@ -249,6 +409,10 @@ def generate_html_report(results, pytest_output, duration_sec):
     <tbody>{category_html}</tbody>
   </table>
 
+  {regressions_html}
+
+  {slowest_html}
+
   {failed_html}
 
   <div class="footer">Generated by tests/run_tests.py</div>
@@ -263,40 +427,48 @@ def main():
     """Run tests and generate report."""
     import time
 
-    # Pass through CLI args to pytest
-    extra_args = sys.argv[1:]
+    # --shards is ours; everything else passes through to pytest
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument("--shards", type=int, default=1)
+    args, extra_args = parser.parse_known_args()
 
     print("=" * 60)
     print("AI Agency HQ - Organizational Test Suite")
     print("=" * 60)
     print()
 
+    timings = load_timings()
     start = time.time()
-    result = run_pytest(extra_args)
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.shards > 1:
+            returncode, parsed = run_sharded(extra_args, tmp, args.shards, timings)
+        else:
+            junit_path = Path(tmp) / "junit.xml"
+            returncode, _ = run_pytest(extra_args, junit_path)
+            parsed = parse_junit_xml(junit_path)
     duration = time.time() - start
 
-    # Print pytest output
-    print(result.stdout)
-    if result.stderr:
-        print(result.stderr)
-
-    # Parse and generate HTML report
-    combined_output = result.stdout + result.stderr
-    parsed = parse_pytest_output(combined_output)
-
-    # Generate HTML
-    html = generate_html_report(parsed, combined_output, duration)
+    regressions = find_regressions(timings, parsed["tests"])
+    save_timings(timings, parsed["tests"])
 
-    # Save report
-    REPORTS_DIR.mkdir(exist_ok=True)
-    report_path = REPORTS_DIR / f"test-report-{datetime.datetime.now().strftime('%Y-%m-%d')}.html"
-    report_path.write_text(html, encoding="utf-8")
+    # Generate and save HTML
+    tag = datetime.datetime.now().strftime('%Y-%m-%d')
+    report_path = REPORTS_DIR / f"test-report-{tag}.html"
+    build(ReportJob(
+        key=f"test-report/{tag}",
+        output=report_path,
+        inputs=[parsed, round(duration, 1), [t["id"] for t, _ in regressions]],
+        render=lambda: generate_html_report(parsed, duration, regressions),
+        sources=[Path(__file__)],
+    ), force=True)
 
     print()
     print("=" * 60)
     s = parsed["summary"]
     print(f"Results: {s['passed']} passed, {s['failed']} failed, "
           f"{s['skipped']} skipped ({duration:.1f}s)")
+    for t, median in regressions:
+        print(f"  SLOWER: {t['id']} {median:.3f}s -> {t['duration']:.3f}s")
     print(f"Report: {report_path}")
     print("=" * 60)
 
@@ -304,7 +476,7 @@ def main():
     if sys.platform == "darwin":
         os.system(f'open "{report_path}"')
 
-    return result.returncode
+    return returncode
 
 
 if __name__ == "__main__":
@@ -2,7 +2,7 @@
 Scenario Test Definitions — v3 (Dynamic + Tool Verification)
 ============================================================
 No hardcoded character names or speech patterns.
-All agent-specific values are loaded from .claude/agents/*.md at import time.
+All agent-specific values are loaded from .claude/agents/*.md (each file parsed once).
 If agent definitions change, tests automatically adapt.
 
 Each scenario verifies BOTH:
@@ -11,6 +11,7 @@ Each scenario verifies BOTH:
 """
 
 import re
+from collections.abc import Mapping
 from pathlib import Path
 
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -21,7 +22,27 @@ AGENTS_DIR = BASE_DIR / ".claude" / "agents"
 # Agent Metadata Loader
 # ============================================================
 
+_META_CACHE = {}  # agent name -> (mtime_ns or None, meta)
+
+
 def load_agent_meta(agent_name: str) -> dict:
+    """Metadata for an agent, parsed once per version of its definition file.
+
+    Cached by mtime, so repeated lookups cost one stat() and an edited
+    file is re-parsed on the next call.
+    """
+    path = AGENTS_DIR / f"{agent_name}.md"
+    try:
+        mtime = path.stat().st_mtime_ns
+    except OSError:
+        mtime = None
+    cached = _META_CACHE.get(agent_name)
+    if cached is None or cached[0] != mtime:
+        cached = _META_CACHE[agent_name] = (mtime, _parse_agent_meta(agent_name, path))
+    return cached[1]
+
+
+def _parse_agent_meta(agent_name: str, path: Path) -> dict:
     """Load metadata from an agent definition file.
 
     Returns:
@@ -34,7 +55,6 @@ def load_agent_meta(agent_name: str) -> dict:
             "model": "sonnet",
         }
     """
-    path = AGENTS_DIR / f"{agent_name}.md"
     if not path.exists():
         return {
             "name": agent_name,
@@ -89,16 +109,31 @@ def load_agent_meta(agent_name: str) -> dict:
     }
 
 
-# Pre-load all agent metadata at import time
-AGENTS = {}
-for _f in AGENTS_DIR.glob("*.md"):
-    _name = _f.stem
-    AGENTS[_name] = load_agent_meta(_name)
+class AgentRegistry(Mapping):
+    """Read-only {agent name: metadata} view over .claude/agents/*.md.
+
+    Nothing is parsed until an agent is looked up; lookups go through
+    the load_agent_meta cache.
+    """
+
+    def __getitem__(self, agent_name: str) -> dict:
+        if not (AGENTS_DIR / f"{agent_name}.md").exists():
+            raise KeyError(agent_name)
+        return load_agent_meta(agent_name)
+
+    def __iter__(self):
+        return iter(sorted(f.stem for f in AGENTS_DIR.glob("*.md")))
+
+    def __len__(self) -> int:
+        return sum(1 for _ in AGENTS_DIR.glob("*.md"))
+
+
+AGENTS = AgentRegistry()
 
 
 def A(agent_name: str) -> dict:
     """Shortcut to get agent metadata."""
-    return AGENTS.get(agent_name, load_agent_meta(agent_name))
+    return load_agent_meta(agent_name)
 
 
 # ============================================================
@@ -482,20 +517,34 @@ SCENARIOS = [
 # Agent Context (for run_scenarios.py)
 # ============================================================
 
+def agent_input_paths(agent_name: str) -> dict:
+    """Files get_agent_system_prompt assembles for an agent, by role.
+
+    Also the dependency list run_scenarios.py uses to decide which
+    scenarios an edit can affect.
+    """
+    base = Path(__file__).resolve().parent.parent
+    return {
+        "claude_md": base / "CLAUDE.md",
+        "memory": base / f".claude/agent-memory/{agent_name}/MEMORY.md",
+        "agent": base / f".claude/agents/{agent_name}.md",
+    }
+
+
 def get_agent_system_prompt(agent_name: str) -> str:
     """Build a minimal system prompt for testing an agent's behavior."""
-    base = Path(__file__).resolve().parent.parent
+    paths = agent_input_paths(agent_name)
 
     parts = []
 
-    claude_md = (base / "CLAUDE.md").read_text(encoding="utf-8")
+    claude_md = paths["claude_md"].read_text(encoding="utf-8")
     parts.append(claude_md)
 
-    mem_path = base / f".claude/agent-memory/{agent_name}/MEMORY.md"
+    mem_path = paths["memory"]
     if mem_path.exists():
         parts.append(f"\n--- Your MEMORY.md ---\n{mem_path.read_text(encoding='utf-8')}")
 
-    agent_path = base / f".claude/agents/{agent_name}.md"
+    agent_path = paths["agent"]
     if agent_path.exists():
         content = agent_path.read_text(encoding="utf-8")
         if content.startswith("---"):
@@ -0,0 +1,157 @@
+"""tests/test_document_store.py — conftest の DocumentStore のテスト
+
+extract_section / extract_table_rows は見出しツリーのキャッシュ経由に
+書き換えた。書き換え前の正規表現実装と同じ結果を返すことを、入れ子の見出し・
+コードフェンス内の見出し・存在しないセクションを含むサンプルで確認する。
+"""
+
+import re
+
+import pytest
+from textwrap import dedent
+from typing import List, Optional
+
+from conftest import DocumentStore, Document, extract_section, extract_table_rows
+
+
+# ============================================================
+# Baseline (regex) implementation, kept verbatim for comparison
+# ============================================================
+
+def baseline_extract_section(content: str, heading_text: str) -> Optional[str]:
+    if not content:
+        return None
+    pattern = r"^(#{1,4})\s+.*" + re.escape(heading_text) + r".*$"
+    match = re.search(pattern, content, re.MULTILINE | re.IGNORECASE)
+    if not match:
+        return None
+    level = len(match.group(1))
+    start = match.end()
+    next_heading = re.search(
+        rf"^#{{{1},{level}}}\s+", content[start:], re.MULTILINE
+    )
+    if next_heading:
+        return content[start:start + next_heading.start()]
+    return content[start:]
+
+
+def baseline_extract_table_rows(section: str) -> List[List[str]]:
+    if not section:
+        return []
+    rows = []
+    for line in section.split("\n"):
+        line = line.strip()
+        if line.startswith("|") and not re.match(r"\|[\s\-:]+\|", line):
+            cells = [c.strip() for c in line.split("|")[1:-1]]
+            if cells:
+                rows.append(cells)
+    return rows
+
+
+# ============================================================
+# Fixtures
+# ============================================================
+
+SAMPLE = dedent("""\
+    ---
+    name: ceo
+    model: opus
+    ---
+    # CEO エージェント
+
+    前文。
+
+    ## 権限
+    | 項目 | 上限 | 承認 |
+    |------|-----:|:----:|
+    | 支出 | ¥30,000 | CEO |
+    | 契約 | — | 株主 |
+
+    ### 例外
+    - 緊急時は事後報告
+
+    #### Deep Detail
+    | a | b |
+    |---|---|
+    | 1 | 2 |
+
+    ##### too deep to be a heading
+    ## Delegation Rules
+    ```bash
+    # comment in a fence
+    ## not really a heading
+    echo done
+    ```
+    after fence
+
+    #hashtag without space
+    ## 報告ライン
+    last section, no trailing heading""")
+
+QUERIES = [
+    "CEO", "権限", "例外", "deep detail", "DELEGATION", "comment in a fence",
+    "not really", "報告", "too deep", "hashtag", "存在しない", "",
+]
+
+
+# ============================================================
+# Parity with the baseline
+# ============================================================
+
+@pytest.mark.static
+class TestParityWithBaseline:
+    @pytest.mark.parametrize("query", QUERIES)
+    def test_extract_section(self, query):
+        assert extract_section(SAMPLE, query) == baseline_extract_section(SAMPLE, query)
+
+    @pytest.mark.parametrize("query", QUERIES)
+    def test_extract_table_rows(self, query):
+        section = extract_section(SAMPLE, query)
+        assert extract_table_rows(section) == baseline_extract_table_rows(section)
+
+    def test_table_rows_of_arbitrary_text(self):
+        text = "intro\n| x | y |\n| --- | --- |\n|1|2|\n"
+        assert extract_table_rows(text) == baseline_extract_table_rows(text)
+
+    def test_missing_section_and_empty_input(self):
+        assert extract_section(SAMPLE, "存在しない") is None
+        assert extract_section("", "権限") is None
+        assert extract_section(None, "権限") is None
+        assert extract_table_rows(None) == []
+
+    def test_nested_section_includes_children(self):
+        body = extract_section(SAMPLE, "権限")
+        assert "### 例外" in body and "#### Deep Detail" in body
+        assert "Delegation" not in body
+        assert extract_table_rows(body)[-1] == ["1", "2"]
+
+
+# ============================================================
+# DocumentStore caching
+# ============================================================
+
+@pytest.mark.static
+class TestDocumentStore:
+    def test_document_is_parsed_once(self):
+        store = DocumentStore()
+        assert store.parse(SAMPLE) is store.parse(SAMPLE)
+
+    def test_frontmatter_and_body(self):
+        doc = Document(SAMPLE)
+        assert doc.frontmatter == {"name": "ceo", "model": "opus"}
+        assert doc.body.lstrip().startswith("# CEO エージェント")
+
+    def test_heading_tree(self):
+        doc = Document(SAMPLE)
+        root = doc.roots[0]
+        assert root.title == "CEO エージェント"
+        assert [c.title for c in root.children][:1] == ["権限"]
+        assert [c.title for c in root.children[0].children] == ["例外"]
+
+    def test_returned_rows_are_copies(self):
+        section = extract_section(SAMPLE, "権限")
+        extract_table_rows(section)[0][0] = "changed"
+        assert extract_table_rows(section)[0][0] == "項目"
+
+    def test_missing_file_reads_none(self):
+        assert DocumentStore().read("no/such/file.md") is None
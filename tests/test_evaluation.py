@@ -0,0 +1,63 @@
+"""tests/test_evaluation.py — evaluation のテスト
+
+evaluate_batch の結果収集をテストする。失敗したニッチは結果から外し、
+on_complete コールバックが例外を出しても残りのニッチの収集を続ける。
+evaluate_niche と Xpoz クライアントは偽物に差し替え、外部APIは呼ばない。
+"""
+
+import pytest
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "tools" / "niche-analyzer"))
+
+import evaluation
+
+NICHES = [("trivia-shorts", "trivia", "雑学"), ("news-curation", "news", "ニュース"), ("pet-vlogs", "pets", "ペット")]
+
+
+@pytest.fixture
+def batch(monkeypatch):
+    """evaluate_batch with a fake evaluate_niche; niches added to the returned set fail."""
+    failing = set()
+
+    def fake_evaluate(niche_id, kw_en, kw_jp, scan_date, *, scheduler, xpoz, out):
+        out.write(f"  evaluating {niche_id}\n")
+        if niche_id in failing:
+            raise RuntimeError("collection failed")
+        return {"niche_id": niche_id, "keywords": {"en": kw_en, "jp": kw_jp}}
+
+    monkeypatch.setattr(evaluation.xpoz_client, "XpozClient", lambda: object())
+    monkeypatch.setattr(evaluation, "evaluate_niche", fake_evaluate)
+    return failing
+
+
+# ============================================================
+# evaluate_batch
+# ============================================================
+
+@pytest.mark.static
+class TestEvaluateBatch:
+    def test_all_niches_are_collected(self, batch):
+        seen = []
+        results = evaluation.evaluate_batch(NICHES, "2026-02-21", on_complete=lambda nid, r: seen.append(nid))
+        assert sorted(results) == sorted(n for n, _, _ in NICHES)
+        assert sorted(seen) == sorted(results)
+
+    def test_failed_niche_is_left_out(self, batch):
+        batch.add("news-curation")
+        results = evaluation.evaluate_batch(NICHES, "2026-02-21", max_workers=1)
+        assert sorted(results) == ["pet-vlogs", "trivia-shorts"]
+
+    def test_failing_callback_does_not_abort_the_batch(self, batch, capsys):
+        seen = []
+
+        def on_complete(niche_id, result):
+            seen.append(niche_id)
+            if niche_id == "trivia-shorts":
+                raise ValueError("scorecard write failed")
+
+        results = evaluation.evaluate_batch(NICHES, "2026-02-21", on_complete=on_complete, max_workers=1)
+        assert sorted(results) == sorted(n for n, _, _ in NICHES)
+        assert sorted(seen) == sorted(results)
+        assert "on_complete failed for trivia-shorts: scorecard write failed" in capsys.readouterr().err
@@ -0,0 +1,88 @@
+"""tests/test_grok_parse.py — grok_parse のテスト
+
+Grok の自由記述応答からJSONレコードを取り出す処理をテストする。
+コードフェンス、文中埋め込み、途中で切れた配列、引用番号 "[1]" の読み飛ばし。
+"""
+
+import json
+
+import pytest
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "tools" / "niche-analyzer"))
+
+import grok_parse
+
+
+# ============================================================
+# extract_json
+# ============================================================
+
+@pytest.mark.static
+class TestExtractJson:
+    def test_bare_json(self):
+        assert grok_parse.extract_json('[{"a": 1}]') == [{"a": 1}]
+
+    def test_fenced_json(self):
+        text = 'Here you go:\n```json\n[{"a": 1}, {"a": 2}]\n```\nHope this helps.'
+        assert grok_parse.extract_json(text) == [{"a": 1}, {"a": 2}]
+
+    def test_wrapper_embedded_in_prose(self):
+        text = 'Results [see below]: {"results": [{"a": 1}]} end'
+        assert grok_parse.extract_json(text) == {"results": [{"a": 1}]}
+
+    def test_citation_before_array_is_skipped(self):
+        text = 'Based on posts [1], here are questions:\n[{"q": "x"}, {"q": "y"}]'
+        assert grok_parse.extract_json(text) == [{"q": "x"}, {"q": "y"}]
+
+    def test_citation_before_truncated_array(self):
+        text = 'Sources [1][2]:\n[{"q": "x"}, {"q": "y"}, {"q": "cut of'
+        assert grok_parse.extract_json(text) == [{"q": "x"}, {"q": "y"}]
+
+    def test_truncated_array_keeps_complete_elements(self):
+        text = 'Answer: [{"a": 1}, {"a": 2}, {"a": 3, "b": "cut of'
+        assert grok_parse.extract_json(text) == [{"a": 1}, {"a": 2}]
+
+    def test_salvage_array_stops_at_first_broken_element(self):
+        decoder = json.JSONDecoder()
+        assert grok_parse._salvage_array(decoder, '[1, 2,\n 3, {"x"', 0) == [1, 2, 3]
+        assert grok_parse._salvage_array(decoder, '[{"x', 0) == []
+
+    def test_no_records_yield_none(self):
+        assert grok_parse.extract_json("ERROR: timeout") is None
+        assert grok_parse.extract_json("No relevant posts found.") is None
+        assert grok_parse.extract_json("See [1] and [2].") is None
+        assert grok_parse.extract_json("") is None
+
+
+# ============================================================
+# parse_items / parse_commercial
+# ============================================================
+
+@pytest.mark.static
+class TestParseItems:
+    def test_citation_does_not_zero_the_count(self):
+        record = grok_parse.parse_items('Based on posts [1], here are questions:\n[{"q":"x"},{"q":"y"}]')
+        assert record["item_count"] == 2
+
+    def test_unwraps_dict(self):
+        record = grok_parse.parse_items('{"note": [1], "results": [{"a": 1}, "noise", {"a": 2}]}')
+        assert record["items"] == [{"a": 1}, {"a": 2}]
+        assert record["item_count"] == 2
+        assert not record["failed"]
+
+    def test_prose_only(self):
+        record = grok_parse.parse_items("Nothing matched.")
+        assert record["items"] is None
+        assert record["item_count"] == 0
+        assert not record["failed"]
+
+    def test_error_is_failed(self):
+        record = grok_parse.parse_items("ERROR: 503")
+        assert record["failed"] and record["item_count"] == 0
+
+    def test_commercial_counts_keywords_unless_failed(self):
+        assert grok_parse.parse_commercial("収益 と 副業 の話")["commercial_hits"] == 2
+        failed = grok_parse.parse_commercial("ERROR: 収益 副業")
+        assert failed["failed"] and failed["commercial_hits"] == 0
@@ -0,0 +1,85 @@
+"""tests/test_history.py — history のテスト
+
+スキャン横断の履歴インデックス(SQLite)のバックフィルをテストする。
+最初の読み手による構築、評価が先にDBを作った場合、二重実行の防止。
+"""
+
+import json
+
+import pytest
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from niche_fixtures import make_eval
+import history
+
+
+# ============================================================
+# Fixtures
+# ============================================================
+
+@pytest.fixture
+def scans(tmp_path, monkeypatch):
+    """Scan directory with two eval JSONs; history backfills from here."""
+    base = tmp_path / "scans"
+    for date, niche_id in (("2026-02-01", "trivia-shorts"), ("2026-02-08", "news-curation")):
+        eval_dir = base / date / "eval"
+        eval_dir.mkdir(parents=True)
+        (eval_dir / f"{niche_id}.json").write_text(json.dumps(make_eval(niche_id)), encoding="utf-8")
+    monkeypatch.setattr(history, "OUTPUT_BASE", base)
+    return base
+
+
+def _eval_count(conn):
+    return conn.execute("SELECT COUNT(*) FROM evals").fetchone()[0]
+
+
+# ============================================================
+# Backfill
+# ============================================================
+
+@pytest.mark.static
+class TestHistoryBackfill:
+    def test_first_reader_backfills(self, scans, tmp_path):
+        conn = history.connect(tmp_path / "h.sqlite", build_if_missing=True)
+        assert _eval_count(conn) == 2
+        assert history._is_backfilled(conn)
+        conn.close()
+
+    def test_eval_first_db_is_still_backfilled(self, scans, tmp_path):
+        """evaluate_niche may create the DB with one eval before any reader."""
+        db = tmp_path / "h.sqlite"
+        conn = history.connect(db)
+        history.record_eval(make_eval("fresh-niche"), "2026-02-15", conn)
+        assert not history._is_backfilled(conn)
+        conn.close()
+
+        conn = history.connect(db, build_if_missing=True)
+        assert _eval_count(conn) == 3
+        conn.close()
+
+    def test_backfill_runs_once(self, scans, tmp_path):
+        db = tmp_path / "h.sqlite"
+        history.connect(db, build_if_missing=True).close()
+        extra = scans / "2026-02-15" / "eval"
+        extra.mkdir(parents=True)
+        (extra / "late.json").write_text(json.dumps(make_eval("late")), encoding="utf-8")
+        conn = history.connect(db, build_if_missing=True)
+        assert _eval_count(conn) == 2
+        conn.close()
+
+    def test_rebuild_picks_up_new_scans(self, scans, tmp_path):
+        db = tmp_path / "h.sqlite"
+        history.connect(db, build_if_missing=True).close()
+        extra = scans / "2026-02-15" / "eval"
+        extra.mkdir(parents=True)
+        (extra / "late.json").write_text(json.dumps(make_eval("late")), encoding="utf-8")
+        assert history.rebuild(scans, db) == 3
+
+    def test_metrics_include_scores(self, scans, tmp_path):
+        conn = history.connect(tmp_path / "h.sqlite", build_if_missing=True)
+        metrics = {m for (m,) in conn.execute("SELECT DISTINCT metric FROM metrics")}
+        conn.close()
+        assert {"score.total", "score.adjusted", "step1_demand.en.yt_median_views"} <= metrics
@@ -0,0 +1,116 @@
+"""tests/test_http_session.py — http_session のテスト
+
+共有セッションのリトライ規則をテストする。POST は 429/503 のみ再送し、
+502/504 は GET のみ再送する。読み取りタイムアウトは再送しない。
+ローカルのHTTPサーバーで実際の送信回数も確認する(外部通信なし)。
+"""
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "tools" / "niche-analyzer"))
+
+import http_session
+from config import HTTP_RETRY_STATUSES, HTTP_POST_RETRY_STATUSES
+
+
+# ============================================================
+# Fixtures
+# ============================================================
+
+@pytest.fixture
+def retry():
+    return http_session.new_session().get_adapter("https://api.x.ai").max_retries
+
+
+@pytest.fixture
+def server():
+    """Local server answering every request with the status in its path."""
+    hits = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def _reply(self):
+            hits.append((self.command, self.path))
+            length = int(self.headers.get("Content-Length") or 0)
+            self.rfile.read(length)
+            self.send_response(int(self.path.strip("/")))
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+        do_GET = do_POST = _reply
+
+        def log_message(self, *args):
+            pass
+
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}", hits
+    httpd.shutdown()
+    httpd.server_close()
+
+
+# ============================================================
+# Retry rules
+# ============================================================
+
+@pytest.mark.static
+class TestRetryRules:
+    @pytest.mark.parametrize("status", HTTP_RETRY_STATUSES)
+    def test_get_retries_every_retry_status(self, retry, status):
+        assert retry.is_retry("GET", status)
+
+    @pytest.mark.parametrize("status", HTTP_RETRY_STATUSES)
+    def test_post_retries_only_when_not_accepted(self, retry, status):
+        assert retry.is_retry("POST", status) == (status in HTTP_POST_RETRY_STATUSES)
+
+    def test_gateway_errors_are_not_retried_for_post(self, retry):
+        assert not retry.is_retry("POST", 502)
+        assert not retry.is_retry("post", 504)
+
+    def test_other_statuses_are_not_retried(self, retry):
+        assert not retry.is_retry("GET", 500)
+        assert not retry.is_retry("POST", 400)
+
+    def test_read_timeouts_are_not_retried(self, retry):
+        assert retry.read == 0
+        assert retry.connect == retry.total
+
+    def test_retry_survives_backoff_increments(self, retry):
+        """urllib3 rebuilds Retry via new(); the POST rule must carry over."""
+        assert isinstance(retry.new(total=1), http_session._Retry)
+
+    def test_shared_session_is_reused(self, monkeypatch):
+        monkeypatch.setattr(http_session, "_session", None)
+        assert http_session.get_session() is http_session.get_session()
+
+
+# ============================================================
+# Requests actually sent
+# ============================================================
+
+@pytest.mark.static
+class TestRetriesOnTheWire:
+    @staticmethod
+    def _send(method, url):
+        session = http_session.new_session(max_retries=2, backoff_factor=0)
+        return session.request(method, url, data=b"{}" if method == "POST" else None, timeout=5)
+
+    def test_post_502_is_sent_once(self, server):
+        base, hits = server
+        assert self._send("POST", f"{base}/502").status_code == 502
+        assert len(hits) == 1
+
+    def test_post_503_is_retried(self, server):
+        base, hits = server
+        assert self._send("POST", f"{base}/503").status_code == 503
+        assert len(hits) == 3
+
+    def test_get_502_is_retried(self, server):
+        base, hits = server
+        assert self._send("GET", f"{base}/502").status_code == 502
+        assert len(hits) == 3
@@ -0,0 +1,191 @@
+"""tests/test_inventory.py — tests/inventory のテスト
+
+テストファイルのAST走査によるライブ判定(マーカー・pytest.skip の理由文字列)と、
+.pytest_cache/ のインベントリキャッシュの無効化(mtime・内容・INDEX_VERSION)をテストする。
+"""
+
+import json
+import os
+
+import pytest
+from pathlib import Path
+from textwrap import dedent
+
+import sys
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import inventory
+from inventory import parse_test_source
+
+
+def _methods(source: str) -> dict:
+    """{method name: is_live} of every test method in the source."""
+    parsed = parse_test_source(dedent(source))
+    return {m["name"]: m["is_live"] for c in parsed["classes"] for m in c["methods"]}
+
+
+# ============================================================
+# Live detection
+# ============================================================
+
+@pytest.mark.static
+class TestLiveDetection:
+    def test_skip_reason_with_live_word(self):
+        methods = _methods("""
+            class TestX:
+                def test_a(self):
+                    pytest.skip("requires live API")
+
+                def test_b(self):
+                    if not KEY:
+                        pytest.skip(reason="LIVE only")
+        """)
+        assert methods == {"test_a": True, "test_b": True}
+
+    def test_live_inside_other_words_is_not_live(self):
+        methods = _methods("""
+            class TestX:
+                def test_alive(self):
+                    pytest.skip("server not alive")
+
+                def test_delivery(self):
+                    pytest.skip("delivery queue empty")
+
+                def test_lived(self):
+                    pytest.skip("short-lived token expired")
+        """)
+        assert methods == {"test_alive": False, "test_delivery": False, "test_lived": False}
+
+    def test_non_literal_reason_is_not_live(self):
+        methods = _methods("""
+            class TestX:
+                def test_variable(self):
+                    reason = "live"
+                    pytest.skip(reason)
+
+                def test_fstring(self):
+                    pytest.skip(f"live {name}")
+
+                def test_concat(self):
+                    pytest.skip("li" + "ve")
+        """)
+        assert methods == {"test_variable": False, "test_fstring": False, "test_concat": False}
+
+    def test_live_marker_on_method_or_class(self):
+        parsed = parse_test_source(dedent("""
+            class TestMethod:
+                @pytest.mark.live
+                def test_a(self):
+                    pass
+
+                def test_b(self):
+                    pass
+
+            @pytest.mark.live
+            class TestClass:
+                def test_c(self):
+                    pass
+        """))
+        method_cls, live_cls = parsed["classes"]
+        assert [m["is_live"] for m in method_cls["methods"]] == [True, False]
+        assert live_cls["is_live"] and live_cls["methods"][0]["is_live"]
+
+    def test_other_skip_calls_are_ignored(self):
+        methods = _methods("""
+            class TestX:
+                def test_a(self):
+                    skip_if("live")
+                    pytest.importorskip("live")
+        """)
+        assert methods == {"test_a": False}
+
+    def test_syntax_error_is_reported(self):
+        parsed = parse_test_source("class TestX(:\n")
+        assert parsed["classes"] == [] and "error" in parsed
+
+
+# ============================================================
+# Cached index
+# ============================================================
+
+SOURCE = dedent("""\
+    class TestX:
+        def test_a(self):
+            pass
+""")
+
+
+@pytest.fixture
+def tests_dir(tmp_path, monkeypatch):
+    """Temporary tests/ with one file; counts parse_test_source calls."""
+    monkeypatch.setattr(inventory, "INDEX_PATH", tmp_path / ".pytest_cache" / "test-inventory.json")
+    monkeypatch.setattr(inventory, "TESTS_DIR", tmp_path)
+    calls = []
+    parse = inventory.parse_test_source
+
+    def counting(source):
+        calls.append(source)
+        return parse(source)
+
+    monkeypatch.setattr(inventory, "parse_test_source", counting)
+    path = tmp_path / "test_sample.py"
+    path.write_text(SOURCE, encoding="utf-8")
+    os.utime(path, ns=(1_000_000_000, 1_000_000_000))
+    return path, calls
+
+
+def _method_names(entry):
+    return [m["name"] for c in entry["classes"] for m in c["methods"]]
+
+
+@pytest.mark.static
+class TestInventoryCache:
+    def test_unchanged_file_is_not_read(self, tests_dir, monkeypatch):
+        path, calls = tests_dir
+        inventory.load_inventory()
+        monkeypatch.setattr(Path, "read_bytes", lambda self: pytest.fail(f"re-read {self}"))
+        assert _method_names(inventory.load_inventory()["test_sample.py"]) == ["test_a"]
+        assert len(calls) == 1
+
+    def test_touched_file_is_rehashed_not_reparsed(self, tests_dir):
+        path, calls = tests_dir
+        inventory.load_inventory()
+        os.utime(path, ns=(2_000_000_000, 2_000_000_000))
+        entry = inventory.load_inventory()["test_sample.py"]
+        assert len(calls) == 1
+        assert entry["stamp"][0] == 2_000_000_000
+
+    def test_edited_file_is_reparsed(self, tests_dir):
+        path, calls = tests_dir
+        inventory.load_inventory()
+        path.write_text(SOURCE + "\n    def test_b(self):\n        pass\n", encoding="utf-8")
+        os.utime(path, ns=(2_000_000_000, 2_000_000_000))
+        assert _method_names(inventory.load_inventory()["test_sample.py"]) == ["test_a", "test_b"]
+        assert len(calls) == 2
+
+    def test_same_mtime_different_size_is_reparsed(self, tests_dir):
+        path, calls = tests_dir
+        inventory.load_inventory()
+        path.write_text(SOURCE.replace("test_a", "test_abc"), encoding="utf-8")
+        os.utime(path, ns=(1_000_000_000, 1_000_000_000))
+        assert _method_names(inventory.load_inventory()["test_sample.py"]) == ["test_abc"]
+
+    def test_stale_index_version_is_ignored(self, tests_dir):
+        path, calls = tests_dir
+        inventory.load_inventory()
+        index = json.loads(inventory.INDEX_PATH.read_text(encoding="utf-8"))
+        assert index["version"] == inventory.INDEX_VERSION
+        index["version"] = inventory.INDEX_VERSION - 1
+        inventory.INDEX_PATH.write_text(json.dumps(index), encoding="utf-8")
+        inventory.load_inventory()
+        assert len(calls) == 2
+        index = json.loads(inventory.INDEX_PATH.read_text(encoding="utf-8"))
+        assert index["version"] == inventory.INDEX_VERSION
+
+    def test_unreadable_index_is_rebuilt(self, tests_dir):
+        path, calls = tests_dir
+        inventory.INDEX_PATH.parent.mkdir()
+        inventory.INDEX_PATH.write_text("{not json", encoding="utf-8")
+        inventory.load_inventory()
+        assert len(calls) == 1
+        assert "test_sample.py" in json.loads(inventory.INDEX_PATH.read_text(encoding="utf-8"))["files"]
@@ -0,0 +1,107 @@
+"""tests/test_render.py — tools/core/render のテスト
+
+HTMLレポート共通レンダリング層の再生成判定をテストする。
+入力が同じならスキップ、入力変更・--force・出力欠落なら再生成、
+内容が同じなら書き込まない(mtimeを保つ)。
+"""
+
+import os
+
+import pytest
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from tools.core import render
+
+
+# ============================================================
+# Fixtures
+# ============================================================
+
+@pytest.fixture
+def render_root(tmp_path, monkeypatch):
+    """Point the render manifest at a temporary tree."""
+    monkeypatch.setattr(render, "ROOT", tmp_path)
+    monkeypatch.setattr(render, "MANIFEST_PATH", tmp_path / "reports" / ".render-manifest.json")
+    return tmp_path
+
+
+def _job(root, data, renders, meta=None):
+    source = root / "input.txt"
+    source.write_text(data, encoding="utf-8")
+
+    def _render():
+        renders.append(data)
+        return f"<p>{data}</p>"
+
+    return render.ReportJob(
+        key="sample", output=root / "reports" / "sample.html",
+        inputs=[source, {"option": 1}], render=_render, meta=meta or {},
+    )
+
+
+# ============================================================
+# build / build_all
+# ============================================================
+
+@pytest.mark.static
+class TestBuild:
+    def test_unchanged_inputs_skip_rendering(self, render_root):
+        renders = []
+        assert render.build(_job(render_root, "a", renders))
+        assert not render.build(_job(render_root, "a", renders))
+        assert renders == ["a"]
+        assert render.last_output("sample") == render_root / "reports" / "sample.html"
+
+    def test_changed_input_or_force_rebuilds(self, render_root):
+        renders = []
+        render.build(_job(render_root, "a", renders))
+        assert render.build(_job(render_root, "b", renders))
+        assert render.build(_job(render_root, "b", renders), force=True)
+        assert renders == ["a", "b", "b"]
+
+    def test_missing_output_rebuilds(self, render_root):
+        renders = []
+        job = _job(render_root, "a", renders)
+        render.build(job)
+        job.output.unlink()
+        assert render.is_stale(job)
+        assert render.build(job)
+
+    def test_meta_is_kept_in_manifest(self, render_root):
+        render.build(_job(render_root, "a", [], meta={"from_json": True}))
+        entry = render.load_manifest()["sample"]
+        assert entry["from_json"] is True
+        assert entry["output"] == "reports/sample.html"
+
+    def test_generator_source_is_an_input(self, render_root):
+        renders = []
+        generator = render_root / "generator.py"
+        generator.write_text("v1", encoding="utf-8")
+        job = _job(render_root, "a", renders)
+        job.sources = [generator]
+        render.build(job)
+        generator.write_text("v2", encoding="utf-8")
+        assert render.is_stale(job)
+
+
+# ============================================================
+# write_if_changed
+# ============================================================
+
+@pytest.mark.static
+class TestWriteIfChanged:
+    def test_identical_content_is_not_rewritten(self, tmp_path):
+        path = tmp_path / "out.html"
+        assert render.write_if_changed(path, "x")
+        os.utime(path, (1000, 1000))
+        assert not render.write_if_changed(path, "x")
+        assert path.stat().st_mtime == 1000
+
+    def test_changed_content_is_written(self, tmp_path):
+        path = tmp_path / "nested" / "out.html"
+        assert render.write_if_changed(path, "x")
+        assert render.write_if_changed(path, "y")
+        assert path.read_text(encoding="utf-8") == "y"
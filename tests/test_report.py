@@ -0,0 +1,141 @@
+"""tests/test_report.py — report のテスト
+
+スキャンレポートのニッチ別フラグメントキャッシュをテストする。
+評価JSONが1件変われば そのニッチだけ再描画し、描画・スコアリングのコードや
+COMMERCIAL_KEYWORDS が変われば全件を描画し直す。
+"""
+
+import json
+
+import pytest
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from niche_fixtures import make_eval
+import report
+import scoring
+
+SCAN_DATE = "2026-02-21"
+NICHES = ("trivia-shorts", "news-curation", "asmr-cooking")
+
+
+# ============================================================
+# Fixtures
+# ============================================================
+
+@pytest.fixture
+def scan(tmp_path, monkeypatch):
+    """Scan directory with three evals; records which niches get rendered."""
+    eval_dir = tmp_path / SCAN_DATE / "eval"
+    eval_dir.mkdir(parents=True)
+    for i, niche_id in enumerate(NICHES):
+        _write_eval(eval_dir, make_eval(niche_id, yt_median=1000 * (i + 1)))
+    monkeypatch.setattr(report, "OUTPUT_BASE", tmp_path)
+    monkeypatch.setattr(report.history, "series_for_all", lambda *a, **kw: {})
+
+    rendered = []
+    render_niche = report._render_niche
+
+    def recording(data, scored, i):
+        rendered.append(scored.table.ids[i])
+        return render_niche(data, scored, i)
+
+    monkeypatch.setattr(report, "_render_niche", recording)
+    return eval_dir, rendered
+
+
+def _write_eval(eval_dir: Path, data: dict):
+    path = eval_dir / f"{data['niche_id']}.json"
+    path.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+
+
+# ============================================================
+# Fragment cache
+# ============================================================
+
+@pytest.mark.static
+class TestFragmentCache:
+    def test_first_run_renders_every_niche(self, scan):
+        eval_dir, rendered = scan
+        path = report.generate_report(SCAN_DATE)
+        assert sorted(rendered) == sorted(NICHES)
+        assert path.exists()
+        cache = json.loads((eval_dir.parent / report.FRAGMENT_CACHE).read_text(encoding="utf-8"))
+        assert cache["renderer"] == report._RENDERER
+        assert sorted(cache["niches"]) == sorted(NICHES)
+
+    def test_unchanged_scan_renders_nothing(self, scan):
+        eval_dir, rendered = scan
+        path = report.generate_report(SCAN_DATE)
+        before = path.stat().st_mtime_ns
+        rendered.clear()
+        report.generate_report(SCAN_DATE)
+        assert rendered == []
+        assert path.stat().st_mtime_ns == before
+
+    def test_changed_eval_rerenders_only_that_niche(self, scan):
+        eval_dir, rendered = scan
+        report.generate_report(SCAN_DATE)
+        rendered.clear()
+        _write_eval(eval_dir, make_eval("news-curation", yt_median=999_999))
+        report.generate_report(SCAN_DATE)
+        assert rendered == ["news-curation"]
+
+    def test_new_and_removed_evals(self, scan):
+        eval_dir, rendered = scan
+        report.generate_report(SCAN_DATE)
+        rendered.clear()
+        (eval_dir / "asmr-cooking.json").unlink()
+        _write_eval(eval_dir, make_eval("pet-vlogs"))
+        report.generate_report(SCAN_DATE)
+        assert rendered == ["pet-vlogs"]
+        cache = json.loads((eval_dir.parent / report.FRAGMENT_CACHE).read_text(encoding="utf-8"))
+        assert sorted(cache["niches"]) == ["news-curation", "pet-vlogs", "trivia-shorts"]
+
+    def test_renderer_change_rerenders_everything(self, scan, monkeypatch):
+        eval_dir, rendered = scan
+        report.generate_report(SCAN_DATE)
+        rendered.clear()
+        monkeypatch.setattr(report, "_RENDERER", "0" * 16)
+        report.generate_report(SCAN_DATE)
+        assert sorted(rendered) == sorted(NICHES)
+
+    def test_force_rerenders_everything(self, scan):
+        eval_dir, rendered = scan
+        report.generate_report(SCAN_DATE)
+        rendered.clear()
+        report.generate_report(SCAN_DATE, force=True)
+        assert sorted(rendered) == sorted(NICHES)
+
+    def test_unreadable_cache_is_ignored(self, scan):
+        eval_dir, rendered = scan
+        (eval_dir.parent / report.FRAGMENT_CACHE).write_text("{truncated", encoding="utf-8")
+        report.generate_report(SCAN_DATE)
+        assert sorted(rendered) == sorted(NICHES)
+
+
+# ============================================================
+# Renderer hash
+# ============================================================
+
+@pytest.mark.static
+class TestRendererHash:
+    def test_default_matches_module_constant(self):
+        assert report._renderer_hash() == report._RENDERER
+
+    def test_scoring_source_change_changes_hash(self, tmp_path):
+        sources = [tmp_path / Path(p).name for p in report._RENDERER_SOURCES]
+        for src, dst in zip(report._RENDERER_SOURCES, sources):
+            dst.write_bytes(Path(src).read_bytes())
+        assert report._renderer_hash(sources) == report._RENDERER
+
+        scoring_copy = tmp_path / Path(scoring.__file__).name
+        scoring_copy.write_bytes(scoring_copy.read_bytes() + b"\n# tweak\n")
+        assert report._renderer_hash(sources) != report._RENDERER
+
+    def test_commercial_keywords_change_changes_hash(self):
+        keywords = list(report.COMMERCIAL_KEYWORDS)
+        assert report._renderer_hash(keywords=keywords) == report._RENDERER
+        assert report._renderer_hash(keywords=keywords + ["サブスク"]) != report._RENDERER
@@ -0,0 +1,73 @@
+"""tests/test_response_cache.py — response_cache のテスト
+
+ディスク上のレスポンスキャッシュの往復、TTLによる期限切れ、
+mtimeを使ったLRU削除、書き込み失敗時の一時ファイル掃除をテストする。
+"""
+
+import json
+import os
+
+import pytest
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "tools" / "niche-analyzer"))
+
+from response_cache import ResponseCache
+
+
+# ============================================================
+# Fixtures
+# ============================================================
+
+@pytest.fixture
+def cache(tmp_path):
+    return ResponseCache(tmp_path / "cache", ttl=60, max_bytes=1_000_000)
+
+
+# ============================================================
+# ResponseCache
+# ============================================================
+
+@pytest.mark.static
+class TestResponseCache:
+    def test_roundtrip(self, cache):
+        key = cache.make_key("model", "prompt", None, "2026-02-21")
+        cache.put(key, {"answer": "回答"})
+        assert cache.get(key) == {"answer": "回答"}
+
+    def test_key_depends_on_every_part(self, cache):
+        assert cache.make_key("a", "b") == cache.make_key("a", "b")
+        assert cache.make_key("a", "b") != cache.make_key("a", "b", "2026-02-22")
+
+    def test_miss_returns_none(self, cache):
+        assert cache.get(cache.make_key("never stored")) is None
+
+    def test_expired_entry_is_dropped(self, cache):
+        key = cache.make_key("old")
+        cache.put(key, [1, 2, 3])
+        path = cache.directory / f"{key}.json"
+        entry = json.loads(path.read_text(encoding="utf-8"))
+        entry["created"] -= cache.ttl + 1
+        path.write_text(json.dumps(entry), encoding="utf-8")
+        assert cache.get(key) is None
+        assert not path.exists()
+
+    def test_lru_entry_is_evicted_first(self, cache):
+        a, b, c = (cache.make_key(name) for name in "abc")
+        cache.put(a, "x" * 100)
+        size = (cache.directory / f"{a}.json").stat().st_size
+        cache.max_bytes = size * 2 + size // 2   # room for two entries
+        cache.put(b, "x" * 100)
+        os.utime(cache.directory / f"{a}.json", (1000, 1000))
+        os.utime(cache.directory / f"{b}.json", (2000, 2000))
+        assert cache.get(a) is not None          # a becomes most recently used
+        cache.put(c, "x" * 100)
+        assert cache.get(b) is None
+        assert cache.get(a) is not None
+        assert cache.get(c) is not None
+
+    def test_failed_put_leaves_no_temp_file(self, cache):
+        with pytest.raises(TypeError):
+            cache.put(cache.make_key("bad"), {"value": object()})
+        assert list(cache.directory.glob("*.tmp")) == []
@@ -0,0 +1,249 @@
+"""tests/test_run_scenarios.py — run_scenarios の変更影響選択のテスト
+
+--changed が参照する入力マニフェスト(合格したライブ実行の入力指紋)の
+記録ルールと、stream-json の逐次パース・早期判定(EarlyVerdict)をテストする。
+claude CLI は呼ばない(早期停止は偽の claude スクリプトで確認する)。
+"""
+
+import json
+import os
+
+import pytest
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import run_scenarios
+from run_scenarios import StreamParser, EarlyVerdict
+from scenarios import SCENARIOS
+
+
+# ============================================================
+# Fixtures
+# ============================================================
+
+@pytest.fixture
+def manifest_dir(tmp_path, monkeypatch):
+    """入力マニフェストを一時ディレクトリに向ける。"""
+    monkeypatch.setattr(run_scenarios, "RECORDINGS_DIR", tmp_path)
+    monkeypatch.setattr(run_scenarios, "INPUTS_MANIFEST", tmp_path / "inputs.json")
+    return tmp_path
+
+
+def _result(scenario, passed=True, error="", replayed=False):
+    r = run_scenarios.new_result(scenario)
+    r["passed"] = passed
+    r["error"] = error
+    if replayed:
+        r["replayed"] = True
+    return r
+
+
+# ============================================================
+# update_inputs_manifest / changed_inputs
+# ============================================================
+
+@pytest.mark.static
+class TestInputsManifest:
+    def test_live_pass_is_recorded(self, manifest_dir):
+        s = SCENARIOS[0]
+        run_scenarios.update_inputs_manifest([s], [_result(s)])
+        manifest = run_scenarios.load_inputs_manifest()
+        assert s["id"] in manifest
+        assert run_scenarios.changed_inputs(s, manifest) == []
+
+    def test_failure_is_not_recorded(self, manifest_dir):
+        s = SCENARIOS[0]
+        run_scenarios.update_inputs_manifest([s], [_result(s, passed=False)])
+        manifest = run_scenarios.load_inputs_manifest()
+        assert s["id"] not in manifest
+        assert run_scenarios.changed_inputs(s, manifest)
+
+    def test_error_is_not_recorded(self, manifest_dir):
+        s = SCENARIOS[0]
+        run_scenarios.update_inputs_manifest([s], [_result(s, error="timeout")])
+        assert s["id"] not in run_scenarios.load_inputs_manifest()
+
+    def test_replayed_pass_is_not_recorded(self, manifest_dir):
+        """Replays never ran against the current CLAUDE.md/MEMORY.md."""
+        s = SCENARIOS[0]
+        run_scenarios.update_inputs_manifest([s], [_result(s, replayed=True)])
+        manifest = run_scenarios.load_inputs_manifest()
+        assert s["id"] not in manifest
+        assert run_scenarios.changed_inputs(s, manifest)
+
+    def test_replay_keeps_previous_live_fingerprint(self, manifest_dir):
+        s = SCENARIOS[0]
+        run_scenarios.update_inputs_manifest([s], [_result(s)])
+        before = run_scenarios.load_inputs_manifest()[s["id"]]
+        run_scenarios.update_inputs_manifest([s], [_result(s, replayed=True)])
+        assert run_scenarios.load_inputs_manifest()[s["id"]] == before
+
+
+# ============================================================
+# StreamParser / EarlyVerdict
+# ============================================================
+
+def _tool(name, **inputs):
+    return json.dumps({"type": "assistant", "message": {"content": [
+        {"type": "tool_use", "name": name, "input": inputs},
+    ]}})
+
+
+def _text(text):
+    return json.dumps({"type": "assistant", "message": {"content": [{"type": "text", "text": text}]}})
+
+
+def _final(text="", cost=0.02):
+    return json.dumps({"type": "result", "result": text, "total_cost_usd": cost, "num_turns": 2})
+
+
+def _scenario(**rules):
+    return {
+        "id": "SC-T01", "name": "fixture", "category": "C", "priority": "high",
+        "agent_context": "ceo", "prompt": "テスト", **rules,
+    }
+
+
+def _verdicts(scenario, lines):
+    """Verdict reason after each stream line (None while undecided)."""
+    parser, verdict = StreamParser(), EarlyVerdict(scenario)
+    return [verdict.update(*parser.feed(line + "\n")) for line in lines]
+
+
+@pytest.mark.static
+class TestStreamParser:
+    STREAM = [_text("確認します"), _tool("Read", file_path="docs/status.md"),
+              _tool("Task", subagent_type="analyst"), _tool("WebSearch", query="x"),
+              _final("完了しました")]
+
+    def test_direct_and_delegated_tools(self):
+        parsed = run_scenarios.parse_stream_json("\n".join(self.STREAM))
+        assert [t["name"] for t in parsed["direct_tool_calls"]] == ["Read", "Task"]
+        assert [t["name"] for t in parsed["delegated_tool_calls"]] == ["WebSearch"]
+        assert parsed["text_response"] == "確認します\n完了しました"
+        assert parsed["total_cost_usd"] == 0.02
+
+    def test_chunks_splitting_lines(self):
+        """Arbitrary chunk boundaries (mid-line, mid-UTF-8 text) give the same result."""
+        raw = "\n".join(self.STREAM) + "\n"
+        whole = run_scenarios.parse_stream_json(raw)
+        for size in (1, 7, 64):
+            parser = StreamParser()
+            for i in range(0, len(raw), size):
+                parser.feed(raw[i:i + size])
+            assert parser.result() == whole
+
+    def test_events_are_reported_once_their_line_completes(self):
+        parser = StreamParser()
+        line = _tool("Edit", file_path="a.md")
+        assert parser.feed(line[:20]) == ([], [])
+        tools, text = parser.feed(line[20:] + "\n")
+        assert [t["name"] for t in tools] == ["Edit"]
+
+    def test_garbage_lines_are_ignored(self):
+        parser = StreamParser()
+        parser.feed("warning: not json\n[1, 2]\n" + _text("ok") + "\n")
+        assert parser.result()["text_response"] == "ok"
+
+
+@pytest.mark.static
+class TestEarlyVerdict:
+    def test_forbidden_tool_fails_immediately(self):
+        verdicts = _verdicts(
+            _scenario(expected_any=["承認"], forbidden_tools=["Edit"]),
+            [_text("進めます"), _tool("Edit", file_path="a.md"), _text("承認")],
+        )
+        assert verdicts[0] is None
+        assert verdicts[1].startswith("FAIL") and "Edit" in verdicts[1]
+
+    def test_forbidden_keyword_fails(self):
+        verdicts = _verdicts(_scenario(forbidden_any=["実行しました"]), [_text("予算を実行しました")])
+        assert verdicts[0].startswith("FAIL")
+
+    def test_startup_tools_are_never_forbidden_early(self):
+        verdicts = _verdicts(_scenario(forbidden_tools=["Read"]), [_tool("Read", file_path="x")])
+        assert verdicts == [None]
+
+    def test_pass_once_expected_rules_met(self):
+        verdicts = _verdicts(
+            _scenario(expected_any=["エスカレーション"], expected_tools=["Task"],
+                      expected_tool_args={"Task": ["legal"]}),
+            [_text("エスカレーションします"), _tool("Task", subagent_type="legal")],
+        )
+        assert verdicts[0] is None
+        assert verdicts[1].startswith("PASS")
+
+    def test_missing_tool_arg_blocks_pass(self):
+        verdicts = _verdicts(
+            _scenario(expected_tools=["Task"], expected_tool_args={"Task": ["legal"]}),
+            [_tool("Task", subagent_type="analyst"), _final("done")],
+        )
+        assert verdicts == [None, None]
+
+    def test_no_early_pass_with_forbidden_rules(self):
+        """A later turn could still break a forbidden rule, so only the end decides."""
+        for rules in ({"forbidden_any": ["承認しました"]}, {"forbidden_tools": ["Edit"]}):
+            verdicts = _verdicts(
+                _scenario(expected_any=["確認"], expected_tools=["Task"], **rules),
+                [_text("確認します"), _tool("Task", subagent_type="analyst"), _final("確認済み")],
+            )
+            assert verdicts == [None, None, None]
+
+    def test_no_rules_never_decides(self):
+        assert _verdicts(_scenario(), [_text("hi"), _final("bye")]) == [None, None]
+
+    def test_delegated_tools_do_not_count(self):
+        verdicts = _verdicts(
+            _scenario(forbidden_tools=["Edit"]),
+            [_tool("Task", subagent_type="writer"), _tool("Edit", file_path="a.md")],
+        )
+        assert verdicts == [None, None]
+
+
+@pytest.mark.static
+class TestEarlyStop:
+    """run_single_scenario against a fake `claude` that streams then hangs."""
+
+    @pytest.fixture
+    def fake_claude(self, tmp_path, monkeypatch):
+        def install(lines):
+            script = tmp_path / "claude"
+            script.write_text(
+                "#!" + sys.executable + "\n"
+                "import sys, time\n"
+                "sys.stdin.read()\n"
+                f"for line in {lines!r}:\n"
+                "    print(line, flush=True)\n"
+                "time.sleep(30)\n",
+                encoding="utf-8",
+            )
+            script.chmod(0o755)
+            monkeypatch.setenv("PATH", f"{tmp_path}{os.pathsep}{os.environ['PATH']}")
+        return install
+
+    def test_early_fail_kills_the_run(self, fake_claude):
+        fake_claude([_text("進めます"), _tool("Edit", file_path="a.md")])
+        r = run_scenarios.run_single_scenario(_scenario(forbidden_tools=["Edit"]), timeout=20)
+        assert r["early_verdict"].startswith("FAIL")
+        assert not r["passed"] and r["forbidden_tools_found"] == ["Edit"]
+        assert r["duration_sec"] < 10
+
+    def test_early_pass_kills_the_run(self, fake_claude):
+        fake_claude([_text("法務に確認します"), _tool("Task", subagent_type="legal")])
+        r = run_scenarios.run_single_scenario(
+            _scenario(expected_any=["法務"], expected_tools=["Task"]), timeout=20,
+        )
+        assert r["early_verdict"].startswith("PASS")
+        assert r["passed"] and r["error"] is None
+        assert r["duration_sec"] < 10
+
+    def test_forbidden_rules_wait_for_the_end(self, fake_claude):
+        fake_claude([_text("法務に確認します"), _tool("Task", subagent_type="legal")])
+        r = run_scenarios.run_single_scenario(
+            _scenario(expected_any=["法務"], expected_tools=["Task"], forbidden_any=["承認"]),
+            timeout=2,
+        )
+        assert r["early_verdict"] is None
+        assert r["error"].startswith("Timeout")
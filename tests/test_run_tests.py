@@ -0,0 +1,202 @@
+"""tests/test_run_tests.py — run_tests のテスト
+
+JUnit XML(xunit1)からの結果読み込み、pytest ノードIDの復元、
+実行時間履歴によるシャード分割と遅延(リグレッション)検出をテストする。
+pytest のサブプロセスは起動しない。
+"""
+
+import pytest
+from pathlib import Path
+from textwrap import dedent
+
+import sys
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import run_tests
+
+
+# ============================================================
+# Fixtures
+# ============================================================
+
+JUNIT_XML = dedent("""\
+    <?xml version="1.0" encoding="utf-8"?>
+    <testsuites>
+      <testsuite name="pytest" errors="1" failures="1" skipped="1" tests="5" time="1.9">
+        <testcase classname="tests.test_alpha.TestRoles" name="test_ceo" file="tests/test_alpha.py" time="0.012"/>
+        <testcase classname="tests.test_alpha.TestRoles" name="test_model[ceo-opus]" file="tests/test_alpha.py" time="0.5">
+          <failure message="AssertionError: sonnet != opus">assert 'sonnet' == 'opus'</failure>
+        </testcase>
+        <testcase classname="tests.test_alpha" name="test_module_level" file="tests/test_alpha.py" time="0.3">
+          <error message="fixture 'docs' not found">E fixture 'docs' not found</error>
+        </testcase>
+        <testcase classname="tests.test_beta.TestLive" name="test_spawn" file="tests/test_beta.py" time="0">
+          <skipped type="pytest.skip" message="live test">skipped</skipped>
+        </testcase>
+        <testcase classname="tests.test_beta.TestLive" name="test_no_time" file="tests/test_beta.py"/>
+      </testsuite>
+    </testsuites>
+""")
+
+
+@pytest.fixture
+def tree(tmp_path, monkeypatch):
+    """Temporary repo root holding tests/test_alpha.py and tests/test_beta.py."""
+    (tmp_path / "tests").mkdir()
+    for name in ("test_alpha.py", "test_beta.py"):
+        (tmp_path / "tests" / name).write_text("", encoding="utf-8")
+    monkeypatch.setattr(run_tests, "BASE_DIR", tmp_path)
+    return tmp_path
+
+
+@pytest.fixture
+def junit(tree):
+    path = tree / "junit.xml"
+    path.write_text(JUNIT_XML, encoding="utf-8")
+    return path
+
+
+# ============================================================
+# _node_id
+# ============================================================
+
+@pytest.mark.static
+class TestNodeId:
+    def test_class_method(self, tree):
+        assert run_tests._node_id("tests.test_alpha.TestRoles", "test_ceo") == \
+            "tests/test_alpha.py::TestRoles::test_ceo"
+
+    def test_module_level_function(self, tree):
+        assert run_tests._node_id("tests.test_alpha", "test_x") == "tests/test_alpha.py::test_x"
+
+    def test_parametrized_name_is_kept(self, tree):
+        assert run_tests._node_id("tests.test_alpha.TestRoles", "test_model[ceo-opus]") == \
+            "tests/test_alpha.py::TestRoles::test_model[ceo-opus]"
+
+    def test_unknown_module_falls_back_to_dotted_parts(self, tree):
+        assert run_tests._node_id("tests.test_gone.TestX", "test_y") == "tests::test_gone::TestX::test_y"
+
+
+# ============================================================
+# parse_junit_xml
+# ============================================================
+
+@pytest.mark.static
+class TestParseJunitXml:
+    def test_outcomes(self, junit):
+        results = run_tests.parse_junit_xml(junit)
+        assert results["summary"] == {"passed": 2, "failed": 1, "skipped": 1, "errors": 1}
+        assert results["failed"] == ["tests/test_alpha.py::TestRoles::test_model[ceo-opus]"]
+        assert results["errors"] == ["tests/test_alpha.py::test_module_level"]
+        assert results["skipped"] == ["tests/test_beta.py::TestLive::test_spawn"]
+
+    def test_durations_and_messages(self, junit):
+        tests = {t["id"]: t for t in run_tests.parse_junit_xml(junit)["tests"]}
+        failed = tests["tests/test_alpha.py::TestRoles::test_model[ceo-opus]"]
+        assert failed["duration"] == 0.5
+        assert failed["message"] == "AssertionError: sonnet != opus"
+        assert "assert 'sonnet' == 'opus'" in failed["details"]
+        assert tests["tests/test_beta.py::TestLive::test_no_time"]["duration"] == 0.0
+
+    def test_missing_or_broken_file_is_empty(self, tree):
+        broken = tree / "broken.xml"
+        broken.write_text("<testsuites><testcase", encoding="utf-8")
+        for path in (tree / "missing.xml", broken):
+            results = run_tests.parse_junit_xml(path)
+            assert results["tests"] == []
+            assert results["summary"] == {"passed": 0, "failed": 0, "skipped": 0, "errors": 0}
+
+
+# ============================================================
+# Timings / regressions / shards
+# ============================================================
+
+def _test(test_id, duration, outcome="passed"):
+    return {"id": test_id, "duration": duration, "outcome": outcome}
+
+
+@pytest.fixture
+def timings_path(tmp_path, monkeypatch):
+    path = tmp_path / ".pytest_cache" / "durations.json"
+    monkeypatch.setattr(run_tests, "TIMINGS_PATH", path)
+    return path
+
+
+@pytest.mark.static
+class TestTimings:
+    def test_roundtrip_keeps_recent_history(self, timings_path):
+        assert run_tests.load_timings() == {}
+        timings = {}
+        for i in range(run_tests.TIMINGS_KEEP + 3):
+            run_tests.save_timings(timings, [_test("t::a", i), _test("t::s", 9, "skipped")])
+        saved = run_tests.load_timings()
+        assert saved["t::a"] == [float(i) for i in range(3, run_tests.TIMINGS_KEEP + 3)]
+        assert "t::s" not in saved
+
+    def test_broken_file_is_empty(self, timings_path):
+        timings_path.parent.mkdir()
+        timings_path.write_text("{not json", encoding="utf-8")
+        assert run_tests.load_timings() == {}
+
+
+@pytest.mark.static
+class TestFindRegressions:
+    HISTORY = {"t::a": [0.1, 0.1, 0.2], "t::b": [0.01, 0.01, 0.01], "t::c": [1.0]}
+
+    def test_threshold(self):
+        factor, floor = run_tests.REGRESSION_FACTOR, run_tests.REGRESSION_MIN_SEC
+        tests = [
+            _test("t::a", 0.1 * factor + floor + 0.01),   # slower by factor and floor
+            _test("t::b", 0.01 * factor * 3),             # 6x slower but under the floor
+            _test("t::c", 1.0 * factor),                  # exactly factor: not flagged
+        ]
+        flagged = run_tests.find_regressions(self.HISTORY, tests)
+        assert [(t["id"], median) for t, median in flagged] == [("t::a", 0.1)]
+
+    def test_worst_first_and_skips_ignored(self):
+        tests = [_test("t::a", 0.5), _test("t::c", 5.0), _test("t::b", 9.0, "skipped"),
+                 _test("t::new", 9.0)]
+        flagged = run_tests.find_regressions(self.HISTORY, tests)
+        assert [t["id"] for t, _ in flagged] == ["t::c", "t::a"]
+
+
+@pytest.mark.static
+class TestPlanShards:
+    @staticmethod
+    def _files(tree, *names):
+        files = []
+        for name in names:
+            path = tree / "tests" / name
+            path.write_text("", encoding="utf-8")
+            files.append(path)
+        return files
+
+    def test_balanced_by_recorded_durations(self, tree):
+        files = self._files(tree, "test_a.py", "test_b.py", "test_c.py", "test_d.py")
+        timings = {
+            "tests/test_a.py::TestX::test_1": [3.0],
+            "tests/test_a.py::TestX::test_2": [1.0],
+            "tests/test_b.py::test_1": [3.0],
+            "tests/test_c.py::test_1": [1.0, 2.0, 100.0],   # median 2.0
+            "tests/test_d.py::test_1": [2.0],
+        }
+        plan = run_tests.plan_shards(files, timings, 2)
+        weights = [sum({"test_a.py": 4, "test_b.py": 3, "test_c.py": 2, "test_d.py": 2}[f.name]
+                       for f in shard) for shard in plan]
+        assert sorted(weights) == [5, 6]
+        assert sorted(f.name for shard in plan for f in shard) == [f.name for f in files]
+
+    def test_unknown_files_get_median_weight(self, tree):
+        files = self._files(tree, "test_a.py", "test_b.py", "test_new1.py", "test_new2.py")
+        timings = {"tests/test_a.py::t": [10.0], "tests/test_b.py::t": [2.0]}
+        plan = run_tests.plan_shards(files, timings, 2)
+        # New files weigh the median known file time (6): a+b = new1+new2 = 12
+        assert sorted([f.name for f in shard] for shard in plan) == [
+            ["test_a.py", "test_b.py"], ["test_new1.py", "test_new2.py"],
+        ]
+
+    def test_no_history_and_more_shards_than_files(self, tree):
+        files = self._files(tree, "test_a.py", "test_b.py")
+        plan = run_tests.plan_shards(files, {}, 4)
+        assert len(plan) == 2
+        assert all(len(shard) == 1 for shard in plan)
@@ -0,0 +1,93 @@
+"""tests/test_scheduler.py — scheduler のテスト
+
+データソース別スレッドプールの同時実行上限、未知ソースの拒否、
+キーワード引数の受け渡し、レート制限による呼び出し間隔をテストする。
+"""
+
+import threading
+import time
+
+import pytest
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "tools" / "niche-analyzer"))
+
+from scheduler import Scheduler, _RateGate
+
+
+# ============================================================
+# Scheduler
+# ============================================================
+
+@pytest.mark.static
+class TestScheduler:
+    def test_concurrency_is_capped_per_source(self):
+        lock = threading.Lock()
+        state = {"active": 0, "peak": 0}
+
+        def call():
+            with lock:
+                state["active"] += 1
+                state["peak"] = max(state["peak"], state["active"])
+            time.sleep(0.02)
+            with lock:
+                state["active"] -= 1
+
+        with Scheduler({"grok": 2}, rates={"grok": None}) as scheduler:
+            futures = [scheduler.submit("grok", call) for _ in range(8)]
+            for f in futures:
+                f.result()
+        assert state["peak"] == 2
+
+    def test_sources_do_not_share_slots(self):
+        release = threading.Event()
+        with Scheduler({"grok": 1, "ytdlp": 1}, rates={"grok": None, "ytdlp": None}) as scheduler:
+            blocked = scheduler.submit("grok", release.wait, 5)
+            assert scheduler.submit("ytdlp", lambda: "done").result(timeout=2) == "done"
+            release.set()
+            assert blocked.result()
+
+    def test_unknown_source_is_rejected(self):
+        with Scheduler() as scheduler:
+            with pytest.raises(KeyError):
+                scheduler.submit("bing", print)
+
+    def test_kwargs_are_forwarded(self):
+        with Scheduler(rates={"grok": 1000}) as scheduler:
+            outcome = {}
+            scheduler.submit("grok", lambda outcome: outcome.update(cached=True), outcome=outcome).result()
+        assert outcome == {"cached": True}
+
+
+# ============================================================
+# _RateGate
+# ============================================================
+
+@pytest.mark.static
+class TestRateGate:
+    def test_call_starts_are_spaced(self):
+        gate = _RateGate(20)  # 50 ms apart
+        start = time.monotonic()
+        for _ in range(5):
+            gate.wait()
+        assert time.monotonic() - start >= 4 * gate.interval - 0.01
+
+    def test_concurrent_waiters_get_distinct_slots(self):
+        gate = _RateGate(20)
+        starts = []
+        lock = threading.Lock()
+
+        def wait():
+            gate.wait()
+            with lock:
+                starts.append(time.monotonic())
+
+        threads = [threading.Thread(target=wait) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        starts.sort()
+        gaps = [b - a for a, b in zip(starts, starts[1:])]
+        assert min(gaps) >= gate.interval - 0.02
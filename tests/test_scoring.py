@@ -0,0 +1,122 @@
+"""tests/test_scoring.py — scoring のテスト
+
+表駆動スコアリングエンジンの閾値境界(以上/超過の区別)、DECLINING減点、
+総合評価の段階、what-if 用の閾値上書きをテストする。
+"""
+
+import pytest
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from niche_fixtures import make_eval
+import scoring
+
+
+def _steps(*evals, thresholds=None):
+    """Step scores of each eval, in order."""
+    scored = scoring.score(scoring.NicheTable.from_evals(list(evals)), thresholds)
+    return [{key: scored.steps[key][i] for key in scoring.STEP_KEYS} for i in range(len(evals))]
+
+
+# ============================================================
+# Threshold edges
+# ============================================================
+
+@pytest.mark.static
+class TestScoringThresholds:
+    T = scoring.THRESHOLDS
+
+    def test_demand_needs_multi_source_for_full_score(self):
+        strong = self.T["demand_strong"]
+        multi = self.T["multi_source"] + 1
+        s = _steps(
+            make_eval(yt_median=strong, tweets=multi),
+            make_eval(yt_median=strong),
+            make_eval(yt_median=strong - 1, reddit=multi),
+            make_eval(yt_median=self.T["demand_moderate"] - 1, tweets=multi),
+        )
+        assert [x["step1_demand"] for x in s] == [3, 2, 2, 1]
+
+    def test_multi_source_is_strictly_greater(self):
+        at_limit = make_eval(yt_median=self.T["demand_strong"], tweets=self.T["multi_source"])
+        assert _steps(at_limit)[0]["step1_demand"] == 2
+
+    def test_engagement_outlier_drops_one_level(self):
+        high = self.T["engagement_high"] + 1
+        s = _steps(
+            make_eval(yt_median=high, top1=self.T["outlier_top1"]),
+            make_eval(yt_median=high, top1=self.T["outlier_top1"] + 0.01),
+            make_eval(yt_median=self.T["engagement_high"]),
+        )
+        assert [x["step2_engagement"] for x in s] == [3, 2, 2]
+
+    def test_question_counts_are_inclusive(self):
+        s = _steps(
+            make_eval(questions=self.T["questions_rich"]),
+            make_eval(questions=self.T["questions_rich"] - 1),
+            make_eval(questions=self.T["questions_moderate"] - 1),
+        )
+        assert [x["step3_knowledge_gap"] for x in s] == [3, 2, 1]
+
+    def test_supply_blue_ocean_needs_demand(self):
+        s = _steps(
+            make_eval(publishers=self.T["supply_blue_pub"] - 1, yt_median=self.T["supply_blue_median"]),
+            make_eval(publishers=self.T["supply_blue_pub"] - 1, yt_median=self.T["supply_blue_median"] - 1),
+            make_eval(publishers=self.T["supply_blue_pub"]),
+            make_eval(publishers=self.T["supply_moderate_pub"]),
+        )
+        assert [x["step4_supply"] for x in s] == [3, 1, 2, 1]
+
+    def test_gap_and_localization_are_strictly_greater(self):
+        s = _steps(
+            make_eval(gap=self.T["gap_high"], ratio=self.T["localization_strong"]),
+            make_eval(gap=self.T["gap_high"] + 1, ratio=self.T["localization_strong"] + 0.1),
+        )
+        assert (s[0]["step5_gap"], s[0]["step6_localization"]) == (2, 2)
+        assert (s[1]["step5_gap"], s[1]["step6_localization"]) == (3, 3)
+
+    def test_commercial_failed_scores_one(self):
+        s = _steps(
+            make_eval(com_raw="収益 アフィ 副業 稼"),
+            make_eval(com_raw="収益 アフィ"),
+            make_eval(com_raw="ERROR: 収益 アフィ 副業 稼"),
+        )
+        assert [x["step7_commercial"] for x in s] == [3, 2, 1]
+
+
+# ============================================================
+# Penalty, rating and overrides
+# ============================================================
+
+@pytest.mark.static
+class TestScoringRating:
+    T = scoring.THRESHOLDS
+
+    def test_rating_tiers(self):
+        assert scoring.rating_for(self.T["rating_3"], False) == scoring.STAR[3]
+        assert scoring.rating_for(self.T["rating_3"] - 1, False) == scoring.STAR[2]
+        assert scoring.rating_for(self.T["rating_2"] - 1, False) == scoring.STAR[1]
+
+    def test_both_declining_lowers_one_tier(self):
+        assert scoring.rating_for(self.T["rating_3"], True) == scoring.STAR[2]
+        assert scoring.rating_for(0, True) == scoring.STAR[1]
+
+    def test_declining_penalty(self):
+        scored = scoring.score(scoring.NicheTable.from_evals([
+            make_eval(trend=("DECLINING", "DECLINING")),
+            make_eval(trend=("GROWING", "DECLINING")),
+            make_eval(),
+        ]))
+        assert scored.penalty == [3, 1, 0]
+        assert scored.adjusted == [t - p for t, p in zip(scored.total, scored.penalty)]
+
+    def test_overrides_move_the_edge(self):
+        data = make_eval(gap=250)
+        assert _steps(data)[0]["step5_gap"] == 3
+        assert _steps(data, thresholds={"gap_high": 300})[0]["step5_gap"] == 2
+
+    def test_unknown_override_is_rejected(self):
+        with pytest.raises(KeyError, match="gap_hihg"):
+            scoring.score(scoring.NicheTable.from_evals([make_eval()]), {"gap_hihg": 1})
@@ -0,0 +1,149 @@
+"""tests/test_trend_scan.py — trend_scan のテスト
+
+Stage 1 トレンドスキャンのニッチ統合(カテゴリ・言語をまたぐ同名ニッチの重複排除)と
+出力レイアウト(カテゴリなし/1件はスキャン直下、複数件は categories/<slug>/)をテストする。
+Grok は呼ばない。
+"""
+
+import json
+
+import pytest
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "tools" / "niche-analyzer"))
+
+import trend_scan
+from scheduler import Scheduler
+from trend_scan import _dedupe_niches, _slug
+
+SCAN_DATE = "2026-02-21"
+
+
+def _answer(*niches, prose="Here are the trends [1]:"):
+    """Grok answer text: prose, then a JSON array of niche records."""
+    return prose + "\n" + json.dumps([{"niche": n, "description": f"about {n}"} for n in niches])
+
+
+# ============================================================
+# _dedupe_niches
+# ============================================================
+
+@pytest.mark.static
+class TestDedupeNiches:
+    def test_same_niche_across_categories_is_merged(self):
+        niches = _dedupe_niches({
+            ("en", "education"): _answer("AI Trivia Shorts", "Study With Me"),
+            ("en", "entertainment"): _answer("ai trivia shorts", "Meme Recaps"),
+            ("jp", "education"): _answer("AI-Trivia Shorts"),
+        })
+        top = niches[0]
+        assert top["key"] == "aitriviashorts"
+        assert top["niche"] == "AI Trivia Shorts"  # first spelling seen is kept
+        assert top["mentions"] == 3
+        assert top["categories"] == ["education", "entertainment"]
+        assert top["langs"] == ["en", "jp"]
+        assert [n["key"] for n in niches[1:]] == ["memerecaps", "studywithme"]
+
+    def test_japanese_names_are_matched(self):
+        niches = _dedupe_niches({
+            ("jp", "a"): _answer("雑学 ショート"),
+            ("jp", "b"): _answer("雑学ショート"),
+        })
+        assert len(niches) == 1
+        assert niches[0]["categories"] == ["a", "b"]
+
+    def test_no_category_and_examples_are_capped(self):
+        niches = _dedupe_niches({
+            ("en", None): _answer(*["Pet Vlogs"] * 5),
+        })
+        assert niches[0]["categories"] == []
+        assert niches[0]["mentions"] == 5
+        assert len(niches[0]["examples"]) == 3
+
+    def test_prose_and_blank_names_are_skipped(self):
+        niches = _dedupe_niches({
+            ("en", None): "No JSON here, sorry.",
+            ("jp", None): json.dumps([{"niche": "  "}, "text", {"views": 1}]),
+        })
+        assert niches == []
+
+    def test_slug_keeps_japanese(self):
+        assert _slug("Food & Cooking") == "food-cooking"
+        assert _slug("料理・グルメ") == "料理-グルメ"
+        assert _slug("!!!") == "category"
+
+
+# ============================================================
+# run_scan layout
+# ============================================================
+
+@pytest.fixture
+def scan(tmp_path, monkeypatch):
+    """run_scan against a fake Grok that answers per category; returns the scan dir."""
+    calls = []
+
+    def fake_search(prompt, outcome=None):
+        calls.append(prompt)
+        category = next((c for c in ("Education", "Entertainment") if c in prompt), None)
+        niches = ["AI Trivia Shorts"] + ([f"{category} Only"] if category else [])
+        return {"output": [{"type": "message", "content": [
+            {"type": "output_text", "text": _answer(*niches)},
+        ]}]}
+
+    monkeypatch.setattr(trend_scan, "OUTPUT_BASE", tmp_path)
+    monkeypatch.setattr(trend_scan.grok_client, "search", fake_search)
+    monkeypatch.setattr(trend_scan, "Scheduler", lambda limits=None: Scheduler(limits, rates={"grok": None}))
+    return tmp_path / SCAN_DATE, calls
+
+
+def _json(path: Path):
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+@pytest.mark.static
+class TestRunScanLayout:
+    def test_no_category_writes_top_level(self, scan):
+        scan_dir, calls = scan
+        trend_scan.run_scan(SCAN_DATE)
+        assert len(calls) == 2
+        assert {p.name for p in scan_dir.glob("stage1-raw-*.json")} == {"stage1-raw-en.json", "stage1-raw-jp.json"}
+        assert not (scan_dir / "categories").exists()
+        assert _json(scan_dir / "meta.json")["category_filter"] is None
+
+    def test_single_category_writes_top_level(self, scan):
+        scan_dir, calls = scan
+        trend_scan.run_scan(SCAN_DATE, "Education")
+        assert len(calls) == 2
+        raw = _json(scan_dir / "stage1-raw-en.json")
+        assert raw["category"] == "Education"
+        assert not (scan_dir / "categories").exists()
+        assert _json(scan_dir / "meta.json")["category_filter"] == "Education"
+
+    def test_one_item_list_is_a_single_category(self, scan):
+        scan_dir, calls = scan
+        trend_scan.run_scan(SCAN_DATE, ["Education", "Education"])
+        assert (scan_dir / "stage1-raw-jp.json").exists()
+        assert not (scan_dir / "categories").exists()
+
+    def test_several_categories_write_subdirectories(self, scan):
+        scan_dir, calls = scan
+        trend_scan.run_scan(SCAN_DATE, ["Education", "Entertainment"])
+        assert len(calls) == 4
+        assert not list(scan_dir.glob("stage1-raw-*.json"))
+        for slug in ("education", "entertainment"):
+            for lang in ("en", "jp"):
+                assert (scan_dir / "categories" / slug / f"stage1-raw-{lang}.json").exists()
+        assert _json(scan_dir / "meta.json")["category_filter"] == ["Education", "Entertainment"]
+
+    def test_niches_are_merged_across_categories(self, scan):
+        scan_dir, calls = scan
+        trend_scan.run_scan(SCAN_DATE, ["Education", "Entertainment"])
+        niches = _json(scan_dir / "stage1-niches.json")
+        shared = niches[0]
+        assert shared["key"] == "aitriviashorts"
+        assert shared["mentions"] == 4
+        assert sorted(shared["categories"]) == ["Education", "Entertainment"]
+        assert sorted(n["key"] for n in niches[1:]) == ["educationonly", "entertainmentonly"]
+        meta = _json(scan_dir / "meta.json")
+        assert meta["stage1_niches"] == 3 and meta["stage1_completed"]
@@ -0,0 +1,224 @@
+"""tests/test_xpoz_client.py — xpoz_client のテスト
+
+checkOperationStatus のポーリング(_OperationPoller)を偽の時計と偽のステータス応答で
+テストする。待機は仮想時間で進むので実時間では待たない。Xpoz には接続しない。
+"""
+
+import threading
+
+import pytest
+import requests
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "tools" / "niche-analyzer"))
+
+import xpoz_client
+from xpoz_client import _OperationPoller, _jittered
+
+
+class FakeClock:
+    """Virtual monotonic clock; only moves when advanced."""
+
+    def __init__(self):
+        self.now = 1000.0
+        self._lock = threading.Lock()
+
+    def __call__(self) -> float:
+        with self._lock:
+            return self.now
+
+    def advance(self, seconds: float):
+        with self._lock:
+            self.now += seconds
+
+
+class FakeCondition(threading.Condition):
+    """Condition whose timed wait advances the fake clock instead of sleeping."""
+
+    def __init__(self, clock: FakeClock):
+        super().__init__()
+        self.clock = clock
+
+    def wait(self, timeout=None):
+        self.clock.advance(timeout)
+        return True
+
+
+@pytest.fixture
+def no_jitter(monkeypatch):
+    monkeypatch.setattr(xpoz_client.random, "uniform", lambda a, b: 1.0)
+
+
+@pytest.fixture
+def make_poller():
+    """Build pollers on a fake clock; shut their check pools down afterwards."""
+    pollers = []
+
+    def _make(statuses):
+        clock = FakeClock()
+        checks = []
+        lock = threading.Lock()
+
+        def check(op_id, timeout):
+            with lock:
+                checks.append((op_id, clock(), timeout))
+            return statuses(op_id, clock)
+
+        poller = _OperationPoller(check, clock=clock)
+        poller._cond = FakeCondition(clock)
+        pollers.append(poller)
+        return poller, clock, checks
+
+    yield _make
+    for poller in pollers:
+        poller._pool.shutdown(wait=True)
+
+
+def _pending_then_done(polls_needed):
+    counts = {}
+
+    def statuses(op_id, clock):
+        counts[op_id] = counts.get(op_id, 0) + 1
+        if counts[op_id] >= polls_needed:
+            return "success: true", {"success": True, "op": op_id}
+        return "status: running", {"status": "running"}
+
+    return statuses
+
+
+# ============================================================
+# Backoff
+# ============================================================
+
+@pytest.mark.static
+class TestBackoff:
+    def test_interval_grows_by_backoff_until_capped(self, make_poller, no_jitter):
+        poller, clock, checks = make_poller(_pending_then_done(10))
+        start = clock()
+        assert poller.add("op1").result(timeout=5) == {"success": True, "op": "op1"}
+
+        times = [t - start for _, t, _ in checks]
+        gaps = [b - a for a, b in zip([0.0] + times, times)]
+        expected = [min(xpoz_client.XPOZ_POLL_INITIAL * xpoz_client.XPOZ_POLL_BACKOFF ** i,
+                        xpoz_client.XPOZ_POLL_MAX_INTERVAL) for i in range(10)]
+        assert gaps == pytest.approx(expected)
+        assert gaps[-1] == xpoz_client.XPOZ_POLL_MAX_INTERVAL
+
+    def test_jitter_stays_within_bounds(self):
+        jitter = xpoz_client.XPOZ_POLL_JITTER
+        values = [_jittered(2.0) for _ in range(500)]
+        assert all(2.0 * (1 - jitter) <= v <= 2.0 * (1 + jitter) for v in values)
+        assert len(set(values)) > 1
+
+    def test_check_timeout_is_capped_by_remaining_time(self, make_poller, no_jitter, monkeypatch):
+        monkeypatch.setattr(xpoz_client, "XPOZ_MAX_WAIT", 10.0)
+        poller, clock, checks = make_poller(_pending_then_done(2))
+        poller.add("op1").result(timeout=5)
+        assert checks[0][2] == pytest.approx(10.0 - xpoz_client.XPOZ_POLL_INITIAL)
+        assert all(timeout <= xpoz_client.XPOZ_CHECK_TIMEOUT for _, _, timeout in checks)
+
+
+# ============================================================
+# Deadline and failures
+# ============================================================
+
+@pytest.mark.static
+class TestDeadline:
+    def test_never_finishing_operation_times_out(self, make_poller, no_jitter):
+        poller, clock, checks = make_poller(lambda op_id, clock: ("status: running", {"status": "running"}))
+        start = clock()
+        with pytest.raises(TimeoutError, match="op1"):
+            poller.add("op1").result(timeout=5)
+        assert clock() - start == pytest.approx(xpoz_client.XPOZ_MAX_WAIT)
+        assert all(t - start <= xpoz_client.XPOZ_MAX_WAIT for _, t, _ in checks)
+
+    def test_slow_checks_count_toward_the_deadline(self, make_poller, no_jitter):
+        def slow(op_id, clock):
+            clock.advance(25.0)  # request latency is on the same monotonic clock
+            return "status: running", {"status": "running"}
+
+        poller, clock, checks = make_poller(slow)
+        with pytest.raises(TimeoutError):
+            poller.add("op1").result(timeout=5)
+        assert len(checks) <= xpoz_client.XPOZ_MAX_WAIT / 25.0 + 1
+
+    def test_request_timeout_is_retried(self, make_poller, no_jitter):
+        calls = []
+
+        def flaky(op_id, clock):
+            calls.append(op_id)
+            if len(calls) == 1:
+                raise requests.Timeout("slow status check")
+            return "success: true", {"success": True}
+
+        poller, clock, checks = make_poller(flaky)
+        assert poller.add("op1").result(timeout=5) == {"success": True}
+        assert len(checks) == 2
+
+    def test_request_timeout_past_deadline_expires(self, make_poller, no_jitter):
+        def hang(op_id, clock):
+            clock.advance(xpoz_client.XPOZ_MAX_WAIT)
+            raise requests.Timeout("slow status check")
+
+        poller, clock, checks = make_poller(hang)
+        with pytest.raises(TimeoutError):
+            poller.add("op1").result(timeout=5)
+        assert len(checks) == 1
+
+    def test_failed_status_raises(self, make_poller, no_jitter):
+        poller, clock, checks = make_poller(lambda op_id, clock: ("status: failed", {"status": "failed"}))
+        with pytest.raises(RuntimeError, match="status: failed"):
+            poller.add("op1").result(timeout=5)
+
+    def test_other_check_errors_propagate(self, make_poller, no_jitter):
+        def broken(op_id, clock):
+            raise ValueError("bad SSE")
+
+        poller, clock, checks = make_poller(broken)
+        with pytest.raises(ValueError, match="bad SSE"):
+            poller.add("op1").result(timeout=5)
+
+
+# ============================================================
+# Several operations
+# ============================================================
+
+@pytest.mark.static
+class TestManyOperations:
+    def test_operations_finish_independently(self, make_poller, no_jitter):
+        needed = {"a": 1, "b": 3, "c": 6}
+        counts = {}
+
+        def statuses(op_id, clock):
+            counts[op_id] = counts.get(op_id, 0) + 1
+            done = counts[op_id] >= needed[op_id]
+            return "", {"success": True, "op": op_id} if done else {"status": "running"}
+
+        poller, clock, checks = make_poller(statuses)
+        futures = {op_id: poller.add(op_id) for op_id in needed}
+        assert {k: f.result(timeout=5)["op"] for k, f in futures.items()} == {"a": "a", "b": "b", "c": "c"}
+        assert counts == needed
+        assert poller._heap == []
+
+    def test_one_slow_check_does_not_block_the_others(self, make_poller, no_jitter):
+        release = threading.Event()
+
+        def statuses(op_id, clock):
+            if op_id == "slow":
+                release.wait(5)
+            return "", {"success": True, "op": op_id}
+
+        poller, clock, checks = make_poller(statuses)
+        slow = poller.add("slow")
+        fast = [poller.add(f"fast{i}") for i in range(xpoz_client.XPOZ_POLL_WORKERS - 1)]
+        for f in fast:
+            assert f.result(timeout=5)["success"]
+        assert not slow.done()
+        release.set()
+        assert slow.result(timeout=5)["op"] == "slow"
+
+    def test_thread_restarts_after_going_idle(self, make_poller, no_jitter):
+        poller, clock, checks = make_poller(_pending_then_done(1))
+        poller.add("first").result(timeout=5)
+        assert poller.add("second").result(timeout=5)["op"] == "second"
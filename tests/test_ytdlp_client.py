@@ -0,0 +1,267 @@
+"""tests/test_ytdlp_client.py — ytdlp_client のテスト
+
+検索結果の統計(中央値・パーセンタイル・Gini係数・上位1本の集中度)を
+既知の入力でテストする。検索の締め切りは、途中で止まる偽の yt_dlp モジュールで
+確認する(途中までの結果が返ること、打ち切られた結果はキャッシュしないこと)。
+実際の yt-dlp は呼ばない。
+"""
+
+import functools
+import json
+import os
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "tools" / "niche-analyzer"))
+
+import ytdlp_client
+from response_cache import ResponseCache
+from ytdlp_client import video_stats
+
+
+def _videos(*views, channels=None):
+    channels = channels or [f"UC{i}" for i in range(len(views))]
+    return [{"view_count": v, "channel_id": c} for v, c in zip(views, channels)]
+
+
+# ============================================================
+# video_stats
+# ============================================================
+
+@pytest.mark.static
+class TestVideoStats:
+    def test_empty(self):
+        st = video_stats([])
+        assert st["count"] == 0
+        assert (st["total"], st["avg"], st["median"], st["p90"]) == (0, 0.0, 0, 0)
+        assert (st["top1_pct"], st["gini"], st["unique_channels"]) == (0.0, 0.0, 0)
+
+    def test_single_video(self):
+        st = video_stats(_videos(500))
+        assert (st["median"], st["p25"], st["p75"], st["p90"]) == (500, 500, 500, 500)
+        assert st["top1_pct"] == 1.0
+        assert st["gini"] == 0.0
+
+    def test_uniform_views_have_zero_gini(self):
+        st = video_stats(_videos(1000, 1000, 1000, 1000))
+        assert st["gini"] == 0.0
+        assert st["top1_pct"] == 0.25
+        assert st["avg"] == 1000.0
+
+    def test_one_dominant_video(self):
+        st = video_stats(_videos(0, 0, 0, 100))
+        assert st["gini"] == 0.75          # (n - 1) / n: one video has everything
+        assert st["top1_pct"] == 1.0
+        assert st["median"] == 0
+
+    def test_percentiles_odd_count(self):
+        st = video_stats(_videos(50, 10, 40, 20, 30))
+        assert (st["median"], st["p25"], st["p75"], st["p90"]) == (30, 20, 40, 46)
+
+    def test_percentiles_even_count(self):
+        st = video_stats(_videos(40, 10, 30, 20))
+        assert (st["median"], st["p25"], st["p75"], st["p90"]) == (25, 18, 32, 37)
+
+    def test_missing_counts_and_channels(self):
+        videos = [{"view_count": None, "channel_id": "UCa"}, {"channel_id": "UCa"}, {"view_count": 10}]
+        st = video_stats(videos)
+        assert st["total"] == 10
+        assert st["unique_channels"] == 1
+
+    def test_input_is_not_reordered(self):
+        videos = _videos(30, 10, 20)
+        video_stats(videos)
+        assert [v["view_count"] for v in videos] == [30, 10, 20]
+
+
+# ============================================================
+# Single-metric helpers
+# ============================================================
+
+@pytest.mark.static
+class TestMetricHelpers:
+    def test_helpers_match_video_stats(self):
+        videos = _videos(100, 300, 200, channels=["UCa", "UCa", "UCb"])
+        st = video_stats(videos)
+        assert ytdlp_client.total_views(videos) == st["total"] == 600
+        assert ytdlp_client.unique_channels(videos) == 2
+        assert ytdlp_client.avg_views(videos) == 200.0
+        assert ytdlp_client.median_views(videos) == 200
+        assert ytdlp_client.top1_concentration(videos) == 0.5
+
+    def test_given_stats_are_not_recomputed(self, monkeypatch):
+        videos = _videos(100, 300)
+        st = video_stats(videos)
+
+        def fail(_):
+            raise AssertionError("video_stats recomputed")
+
+        monkeypatch.setattr(ytdlp_client, "video_stats", fail)
+        for helper in (ytdlp_client.total_views, ytdlp_client.unique_channels, ytdlp_client.avg_views,
+                       ytdlp_client.median_views, ytdlp_client.top1_concentration):
+            helper(videos, st)
+
+
+# ============================================================
+# Search deadline (in-process yt_dlp)
+# ============================================================
+
+class FakeYoutubeDL:
+    """yt_dlp.YoutubeDL stand-in: yields ``entries`` lazily, then stalls until released."""
+
+    entries = []
+    release = None
+    calls = 0
+
+    def __init__(self, opts):
+        self.opts = opts
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def extract_info(self, url, download=True, process=True):
+        assert not download and not process
+        type(self).calls += 1
+
+        def lazy():
+            yield from self.entries
+            self.release.wait(10)
+
+        return {"entries": lazy()}
+
+
+@pytest.fixture
+def fake_ytdlp(monkeypatch, tmp_path):
+    """In-process search through FakeYoutubeDL, with a temporary cache."""
+    release = threading.Event()
+    ydl = type("YDL", (FakeYoutubeDL,), {"entries": [], "release": release, "calls": 0})
+    monkeypatch.setattr(ytdlp_client, "yt_dlp", SimpleNamespace(YoutubeDL=ydl))
+    monkeypatch.setattr(ytdlp_client, "_cache", ResponseCache(tmp_path / "cache", ttl=3600, max_bytes=1 << 20))
+    yield ydl
+    release.set()
+
+
+def _entries(n):
+    return [{"id": f"v{i}", "title": f"video {i}", "channel_id": "UCa", "view_count": i * 10} for i in range(n)]
+
+
+@pytest.mark.static
+class TestInProcessDeadline:
+    def test_stalled_search_returns_partial_results(self, fake_ytdlp):
+        fake_ytdlp.entries = _entries(2)
+        outcome = {}
+        start = time.monotonic()
+        videos = list(ytdlp_client.iter_videos("cats", 5, deadline=0.3, outcome=outcome))
+        assert time.monotonic() - start < 3
+        assert [v["id"] for v in videos] == ["v0", "v1"]
+        assert outcome == {"timed_out": True}
+
+    def test_max_results_stops_before_deadline(self, fake_ytdlp):
+        fake_ytdlp.entries = _entries(5)
+        outcome = {}
+        videos = list(ytdlp_client.iter_videos("cats", 3, deadline=10, outcome=outcome))
+        assert len(videos) == 3
+        assert outcome == {}
+
+    def test_extractor_error_yields_nothing(self, fake_ytdlp, monkeypatch):
+        def broken(self, *a, **kw):
+            raise RuntimeError("network down")
+
+        monkeypatch.setattr(fake_ytdlp, "extract_info", broken)
+        outcome = {}
+        assert list(ytdlp_client.iter_videos("cats", 3, deadline=5, outcome=outcome)) == []
+        assert outcome == {}
+
+    def test_timed_out_search_is_not_cached(self, fake_ytdlp, monkeypatch):
+        monkeypatch.setattr(ytdlp_client, "iter_videos", functools.partial(ytdlp_client.iter_videos, deadline=0.3))
+        fake_ytdlp.entries = _entries(2)
+        assert len(ytdlp_client.search_videos("cats", 5)) == 2
+        fake_ytdlp.release.set()
+        fake_ytdlp.entries = _entries(5)
+        assert len(ytdlp_client.search_videos("cats", 5)) == 5
+        assert fake_ytdlp.calls == 2
+
+    def test_complete_search_is_cached(self, fake_ytdlp):
+        fake_ytdlp.entries = _entries(3)
+        first = ytdlp_client.search_videos("cats", 3)
+        assert ytdlp_client.search_videos("cats", 3) == first
+        assert fake_ytdlp.calls == 1
+
+
+# ============================================================
+# Search deadline (yt-dlp executable)
+# ============================================================
+
+@pytest.fixture
+def fake_executable(monkeypatch, tmp_path):
+    """Write a fake yt-dlp that prints JSON lines, then sleeps; returns a writer."""
+    monkeypatch.setattr(ytdlp_client, "yt_dlp", None)
+
+    def _write(lines, sleep=30):
+        script = tmp_path / "yt-dlp"
+        script.write_text(
+            f"#!{sys.executable}\n"
+            "import sys, time\n"
+            f"for line in {lines!r}:\n"
+            "    print(line, flush=True)\n"
+            f"time.sleep({sleep})\n",
+            encoding="utf-8",
+        )
+        os.chmod(script, 0o755)
+        monkeypatch.setattr(ytdlp_client, "YTDLP_PATH", script)
+        return script
+
+    return _write
+
+
+def _json_lines(n):
+    return [json.dumps(e) for e in _entries(n)]
+
+
+@pytest.mark.static
+class TestSubprocessDeadline:
+    def test_stalled_process_is_killed_with_partial_results(self, fake_executable):
+        fake_executable(_json_lines(2))
+        outcome = {}
+        start = time.monotonic()
+        videos = list(ytdlp_client.iter_videos("cats", 5, deadline=1.0, outcome=outcome))
+        assert time.monotonic() - start < 10
+        assert [v["id"] for v in videos] == ["v0", "v1"]
+        assert outcome == {"timed_out": True}
+
+    def test_max_results_stops_early(self, fake_executable):
+        fake_executable(_json_lines(5))
+        outcome = {}
+        start = time.monotonic()
+        videos = list(ytdlp_client.iter_videos("cats", 3, deadline=20, outcome=outcome))
+        assert time.monotonic() - start < 10
+        assert len(videos) == 3
+        assert outcome == {}
+
+    def test_blank_and_non_json_lines_are_skipped(self, fake_executable):
+        fake_executable(["", "WARNING: throttled", *_json_lines(2)], sleep=0)
+        outcome = {}
+        assert len(list(ytdlp_client.iter_videos("cats", 5, deadline=10, outcome=outcome))) == 2
+        assert outcome == {}
+
+    def test_missing_executable_yields_nothing(self, fake_executable, monkeypatch, tmp_path):
+        monkeypatch.setattr(ytdlp_client, "YTDLP_PATH", tmp_path / "missing" / "yt-dlp")
+        assert list(ytdlp_client.iter_videos("cats", 3)) == []
+
+    def test_timed_out_search_is_not_cached(self, fake_executable, monkeypatch, tmp_path):
+        monkeypatch.setattr(ytdlp_client, "_cache", ResponseCache(tmp_path / "cache", ttl=3600, max_bytes=1 << 20))
+        monkeypatch.setattr(ytdlp_client, "iter_videos", functools.partial(ytdlp_client.iter_videos, deadline=1.0))
+        fake_executable(_json_lines(2))
+        assert len(ytdlp_client.search_videos("cats", 5)) == 2
+        fake_executable(_json_lines(5), sleep=0)
+        assert len(ytdlp_client.search_videos("cats", 5)) == 5
+        fake_executable([], sleep=0)
+        assert len(ytdlp_client.search_videos("cats", 5)) == 5  # now served from cache
@@ -0,0 +1,127 @@
+"""HTMLレポート共通レンダリング層
+
+各ジェネレーター(session-report, generate-reports-index, run_tests,
+run_scenarios, generate_catalog, generate_perspective_report)が共有する。
+レポートの入力(ファイル内容・データ)とジェネレーター自身のソースを
+ハッシュし、前回生成時から変わっていなければ再生成も書き込みもしない。
+
+使い方:
+    from tools.core.render import ReportJob, build
+    job = ReportJob(
+        key="session/2026-02-19",
+        output=REPORTS_DIR / "session-2026-02-19.html",
+        inputs=[log_path, {"recovery": False}],
+        render=lambda: generate_html(...),
+        sources=[Path(__file__)],
+    )
+    build(job)              # 変更なしならスキップ
+    build_all(jobs)         # --all バッチ用
+"""
+
+import hashlib
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+ROOT = Path(__file__).resolve().parents[2]
+REPORTS_DIR = ROOT / "reports"
+MANIFEST_PATH = REPORTS_DIR / ".render-manifest.json"
+
+
+@dataclass
+class ReportJob:
+    """1つのHTMLレポートの生成単位。"""
+    key: str                                # 出力名が日付で変わっても不変の識別子
+    output: Path
+    inputs: list                            # Path(内容をハッシュ)またはJSON化できる値
+    render: Callable[[], str]
+    sources: List[Path] = field(default_factory=list)  # テンプレートを持つジェネレーター
+    meta: dict = field(default_factory=dict)           # マニフェストに残す生成オプション
+
+
+def _digest_value(h, value):
+    if isinstance(value, Path):
+        h.update(value.as_posix().encode())
+        h.update(value.read_bytes() if value.exists() else b"<missing>")
+    else:
+        h.update(json.dumps(value, ensure_ascii=False, sort_keys=True, default=str).encode())
+    h.update(b"\0")
+
+
+def inputs_hash(job: ReportJob) -> str:
+    """入力・ジェネレーターソース・この共通層のソースのSHA-256。"""
+    h = hashlib.sha256()
+    for src in [Path(__file__), *job.sources]:
+        _digest_value(h, src)
+    for value in job.inputs:
+        _digest_value(h, value)
+    return h.hexdigest()
+
+
+def load_manifest() -> Dict[str, dict]:
+    try:
+        return json.loads(MANIFEST_PATH.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+
+def _save_manifest(manifest: Dict[str, dict]):
+    MANIFEST_PATH.parent.mkdir(parents=True, exist_ok=True)
+    MANIFEST_PATH.write_text(
+        json.dumps(manifest, ensure_ascii=False, indent=1, sort_keys=True), encoding="utf-8"
+    )
+
+
+def is_stale(job: ReportJob, manifest: Optional[Dict[str, dict]] = None) -> bool:
+    """前回生成時から入力が変わったか、出力が無ければTrue。"""
+    entry = (load_manifest() if manifest is None else manifest).get(job.key)
+    if not entry or entry.get("hash") != inputs_hash(job):
+        return True
+    return not (ROOT / entry["output"]).exists()
+
+
+def last_output(key: str) -> Optional[Path]:
+    """前回このジョブが書いた出力パス(日付入りファイル名の案内用)。"""
+    entry = load_manifest().get(key)
+    return ROOT / entry["output"] if entry else None
+
+
+def write_if_changed(path: Path, text: str) -> bool:
+    """内容が同じなら書き込まない(mtimeを保つ)。書いたらTrue。"""
+    try:
+        if path.read_text(encoding="utf-8") == text:
+            return False
+    except OSError:
+        pass
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+    return True
+
+
+def _output_rel(path: Path) -> str:
+    try:
+        return path.resolve().relative_to(ROOT).as_posix()
+    except ValueError:
+        return str(path)
+
+
+def build_all(jobs: List[ReportJob], *, force: bool = False) -> List[ReportJob]:
+    """古くなったジョブだけ生成する。生成したジョブのリストを返す。"""
+    manifest = load_manifest()
+    built = []
+    for job in jobs:
+        if not force and not is_stale(job, manifest):
+            continue
+        digest = inputs_hash(job)
+        write_if_changed(job.output, job.render())
+        manifest[job.key] = {**job.meta, "hash": digest, "output": _output_rel(job.output)}
+        built.append(job)
+    if built:
+        _save_manifest(manifest)
+    return built
+
+
+def build(job: ReportJob, *, force: bool = False) -> bool:
+    """1件生成する。入力が変わっていなければスキップしてFalse。"""
+    return bool(build_all([job], force=force))
@@ -765,6 +765,9 @@ function renderNicheDetail(niche, scanDate) {
         + '<div class="niche-bar-wrap"><div class="niche-bar" style="width:' + pct + '%;background:' + overallColor + '"></div></div>'
         + '</div>';
 
+    // History across scans (filled in asynchronously)
+    html += '<div class="niche-history" id="nicheHistory"></div>';
+
     // Step cards grid
     html += '<div class="niche-steps-grid">';
     stepScores.forEach((s, i) => {
@@ -813,6 +816,50 @@ function renderNicheDetail(niche, scanDate) {
 
     html += '</div>';
     main.innerHTML = html;
+    loadNicheHistory(niche.id);
+}
+
+const NICHE_HISTORY_METRICS = [
+    ["score.adjusted", "Score"],
+    ["step1_demand.en.yt_top20_views", "YT EN"],
+    ["step1_demand.jp.yt_top20_views", "YT JP"],
+    ["step4_supply.jp.twitter_publishers", "JP Publishers"],
+];
+
+async function loadNicheHistory(nicheId) {
+    const qs = "niche=" + encodeURIComponent(nicheId)
+        + NICHE_HISTORY_METRICS.map(m => "&metric=" + encodeURIComponent(m[0])).join("");
+    let data;
+    try {
+        const r = await fetch("/api/niche-history?" + qs);
+        data = await r.json();
+    } catch (e) {
+        return;
+    }
+    const el = document.getElementById("nicheHistory");
+    if (!el) return;
+    let html = "";
+    NICHE_HISTORY_METRICS.forEach(([metric, label]) => {
+        const points = (data.series || {})[metric] || [];
+        if (points.length < 2) return;
+        const last = points[points.length - 1].value;
+        html += '<div class="niche-history-item"><span class="niche-history-label">' + esc(label) + '</span>'
+            + sparklineSvg(points) + '<span class="niche-history-val">' + fmtNum(last) + '</span></div>';
+    });
+    el.innerHTML = html;
+}
+
+function sparklineSvg(points, width = 96, height = 20) {
+    const values = points.map(p => p.value);
+    const lo = Math.min(...values), hi = Math.max(...values);
+    const span = hi - lo || 1;
+    const step = width / (points.length - 1);
+    const coords = values.map((v, i) => (i * step).toFixed(1) + "," + (height - (v - lo) / span * height).toFixed(1)).join(" ");
+    const color = values[values.length - 1] > values[0] ? "#22c55e" : values[values.length - 1] < values[0] ? "#ef4444" : "#888";
+    const title = points.map(p => p.date + ": " + fmtNum(p.value)).join(" → ");
+    return '<svg width="' + width + '" height="' + height + '" viewBox="0 0 ' + width + ' ' + height + '">'
+        + '<title>' + esc(title) + '</title>'
+        + '<polyline fill="none" stroke="' + color + '" stroke-width="1.5" points="' + coords + '"/></svg>';
 }
 
 function scoreStep1(s) {
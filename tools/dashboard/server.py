@@ -10,6 +10,7 @@ import os
 import sys
 import glob
 import re
+import sqlite3
 import urllib.parse
 from datetime import datetime
 from collections import defaultdict
@@ -648,6 +649,37 @@ def api_niche_scans():
     return {"scans": scans}
 
 
+# ── API: /api/niche-history ───────────────────────────────
+
+def api_niche_history(qs):
+    """Per-metric series for one niche from the niche-analyzer history index."""
+    db_path = REPO_DIR / "content" / "niche-analysis" / "history.sqlite"
+    niche_id = qs.get("niche", [""])[0]
+    metrics = qs.get("metric") or ["score.adjusted"]
+    try:
+        last = int(qs.get("last", ["10"])[0])
+    except ValueError:
+        last = 10
+    series = {m: [] for m in metrics}
+    if not niche_id or not db_path.exists():
+        return {"niche": niche_id, "series": series}
+
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    try:
+        for metric in metrics:
+            rows = conn.execute(
+                "SELECT scan_date, value FROM metrics WHERE niche_id = ? AND metric = ? "
+                "ORDER BY scan_date DESC LIMIT ?",
+                (niche_id, metric, last),
+            ).fetchall()
+            series[metric] = [{"date": d, "value": v} for d, v in reversed(rows)]
+    except sqlite3.Error:
+        pass
+    finally:
+        conn.close()
+    return {"niche": niche_id, "series": series}
+
+
 # ── Static File Serving ───────────────────────────────────
 
 MIME_TYPES = {
@@ -682,6 +714,11 @@ class Handler(http.server.BaseHTTPRequestHandler):
             self.respond(200, "application/json", json.dumps(data, ensure_ascii=False))
             return
 
+        if path == "/api/niche-history":
+            data = api_niche_history(urllib.parse.parse_qs(parsed.query))
+            self.respond(200, "application/json", json.dumps(data, ensure_ascii=False))
+            return
+
         # Niche report HTML (serve static file)
         if path.startswith("/api/niche-report"):
             qs = urllib.parse.parse_qs(parsed.query)
@@ -5,16 +5,31 @@ reports/ 配下のHTMLファイルを一覧にするダッシュボード生成
 Usage:
     python3 tools/generate-reports-index.py
     python3 tools/generate-reports-index.py --open
+    python3 tools/generate-reports-index.py --all          # 古くなった全レポートを再生成してから一覧化
+    python3 tools/generate-reports-index.py --all --force  # 入力に関係なく全レポートを再生成
 """
 
 import sys
 import re
 import subprocess
+import importlib.util
 from pathlib import Path
 from datetime import datetime
 
 REPO_ROOT = Path(__file__).resolve().parent.parent
 REPORTS_DIR = REPO_ROOT / "reports"
+sys.path.insert(0, str(REPO_ROOT))
+
+from tools.core.render import ReportJob, build, build_all
+
+# Generators whose reports can be rebuilt from files on disk (--all).
+# Each exposes report_jobs() -> list[ReportJob].
+BATCH_GENERATORS = [
+    REPO_ROOT / "tools" / "session-report.py",
+    REPO_ROOT / "tests" / "generate_catalog.py",
+    REPO_ROOT / "tests" / "generate_perspective_report.py",
+    REPO_ROOT / "tests" / "run_scenarios.py",
+]
 
 REPORT_TYPES = {
     "session": ("セッション報告", "#4CAF50"),
@@ -43,8 +58,8 @@ def extract_date(name: str) -> str:
     return match.group(1) if match else ""
 
 
-def generate_index():
-    """Generate reports/index.html."""
+def generate_index(force: bool = False):
+    """Generate reports/index.html (skipped when the report list is unchanged)."""
     html_files = sorted(
         [
             f
@@ -54,7 +69,25 @@ def generate_index():
         key=lambda f: f.stat().st_mtime,
         reverse=True,
     )
+    listing = [(f.name, f.stat().st_size, f.stat().st_mtime) for f in html_files]
+
+    output = REPORTS_DIR / "index.html"
+    job = ReportJob(
+        key="index",
+        output=output,
+        inputs=[listing],
+        render=lambda: render_index(html_files),
+        sources=[Path(__file__)],
+    )
+    if build(job, force=force):
+        print(f"Generated: {output} ({len(html_files)} reports)")
+    else:
+        print(f"Up to date: {output} ({len(html_files)} reports)")
+    return output
+
 
+def render_index(html_files: list) -> str:
+    """HTML for the report list."""
     rows = []
     for f in html_files:
         label, color = classify_report(f.name)
@@ -153,14 +186,34 @@ footer {{
 </body>
 </html>"""
 
-    output = REPORTS_DIR / "index.html"
-    output.write_text(html, encoding="utf-8")
-    print(f"Generated: {output} ({total} reports)")
-    return output
+    return html
+
+
+def _load_generator(path: Path):
+    sys.path.insert(0, str(path.parent))
+    spec = importlib.util.spec_from_file_location(path.stem.replace("-", "_"), path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def build_all_reports(force: bool = False) -> int:
+    """Rebuild every stale report from BATCH_GENERATORS in this process."""
+    jobs = []
+    for path in BATCH_GENERATORS:
+        jobs.extend(_load_generator(path).report_jobs())
+    built = build_all(jobs, force=force)
+    for job in built:
+        print(f"Generated: {job.output}")
+    print(f"{len(built)} of {len(jobs)} reports rebuilt ({len(jobs) - len(built)} up to date)")
+    return len(built)
 
 
 def main():
-    output = generate_index()
+    force = "--force" in sys.argv
+    if "--all" in sys.argv:
+        build_all_reports(force=force)
+    output = generate_index(force=force)
     if "--open" in sys.argv:
         subprocess.run(["open", str(output)])
 
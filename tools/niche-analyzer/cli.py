@@ -2,13 +2,23 @@
 """Niche Demand Analyzer — CLI entry point.
 
 Usage:
-    python3 tools/niche-analyzer/cli.py scan [--date YYYY-MM-DD]
+    python3 tools/niche-analyzer/cli.py scan [--date YYYY-MM-DD] [--category NAME ...] [--category-file FILE]
     python3 tools/niche-analyzer/cli.py evaluate --niche ID --en KEYWORD --jp KEYWORD [--date YYYY-MM-DD]
+    python3 tools/niche-analyzer/cli.py evaluate-batch (--file NICHES | --item ID EN JP ...) [--date YYYY-MM-DD] [--report] [--workers N]
     python3 tools/niche-analyzer/cli.py scorecard --niche ID --date YYYY-MM-DD [--html] [--open]
+    python3 tools/niche-analyzer/cli.py scorecards --date YYYY-MM-DD (--all | --niche ID ...) [--report] [--workers N]
+    python3 tools/niche-analyzer/cli.py rank --date YYYY-MM-DD [--date ...] [--set KEY=VALUE ...]
+    python3 tools/niche-analyzer/cli.py history [--niche ID] [--metric NAME] [--last N] [--rebuild]
     python3 tools/niche-analyzer/cli.py test
+
+Grok responses and yt-dlp searches are cached per day under
+~/.cache/niche-analyzer; pass --no-cache before the subcommand to force
+fresh API calls.
 """
 
 import argparse
+import csv
+import json
 import sys
 from datetime import datetime
 from pathlib import Path
@@ -19,7 +29,13 @@ sys.path.insert(0, str(Path(__file__).parent))
 
 def cmd_scan(args):
     from trend_scan import run_scan
-    run_scan(args.date, args.category)
+    categories = list(args.category or [])
+    if args.category_file:
+        lines = Path(args.category_file).read_text(encoding="utf-8").splitlines()
+        categories.extend(
+            ln.strip() for ln in lines if ln.strip() and not ln.lstrip().startswith("#")
+        )
+    run_scan(args.date, categories or None, max_parallel=args.parallel)
 
 
 def cmd_evaluate(args):
@@ -30,14 +46,146 @@ def cmd_evaluate(args):
     generate_scorecard(args.niche, args.date, html=True, open_browser=args.open)
 
 
+def cmd_evaluate_batch(args):
+    from evaluation import evaluate_batch
+    from scorecard import generate_scorecard
+
+    niches = list(args.item or [])
+    if args.file:
+        niches.extend(_load_batch_file(Path(args.file)))
+    if not niches:
+        print("Error: no niches given (use --file or --item)", file=sys.stderr)
+        sys.exit(1)
+
+    def on_complete(niche_id, result):
+        generate_scorecard(niche_id, args.date, html=True)
+
+    results = evaluate_batch(niches, args.date, on_complete=on_complete, max_workers=args.workers)
+    print(f"\n  Batch complete: {len(results)}/{len(niches)} niches evaluated")
+
+    if args.report and results:
+        from report import generate_report
+        generate_report(args.date)
+
+
+def _load_batch_file(path: Path) -> list[tuple[str, str, str]]:
+    """Read (niche_id, en, jp) tuples from JSON or TSV/CSV.
+
+    JSON: list of [id, en, jp] or {"niche_id"/"id", "en", "jp"}.
+    Text: one niche per line, tab- or comma-separated; '#' starts a comment.
+    """
+    text = path.read_text(encoding="utf-8")
+    if path.suffix == ".json":
+        niches = []
+        for entry in json.loads(text):
+            if isinstance(entry, dict):
+                entry = (entry.get("niche_id") or entry.get("id"), entry["en"], entry["jp"])
+            niche_id, en, jp = entry
+            niches.append((niche_id, en, jp))
+        return niches
+
+    lines = [ln for ln in text.splitlines() if ln.strip() and not ln.lstrip().startswith("#")]
+    delimiter = "\t" if any("\t" in ln for ln in lines) else ","
+    niches = []
+    for row in csv.reader(lines, delimiter=delimiter):
+        row = [c.strip() for c in row]
+        if len(row) != 3:
+            print(f"Error: expected 'id, en, jp' in {path}: {row}", file=sys.stderr)
+            sys.exit(1)
+        niches.append(tuple(row))
+    return niches
+
+
 def cmd_scorecard(args):
     from scorecard import generate_scorecard
     generate_scorecard(args.niche, args.date, html=args.html, open_browser=args.open)
 
 
+def cmd_scorecards(args):
+    from scorecard import generate_scorecards
+    paths = generate_scorecards(
+        args.date, None if args.all else args.niche,
+        html=not args.no_html, report=args.report, workers=args.workers,
+    )
+    print(f"\n  {len(paths)} scorecards written")
+
+
 def cmd_report(args):
     from report import generate_report
-    generate_report(args.date, open_browser=args.open)
+    generate_report(args.date, open_browser=args.open, force=args.force)
+
+
+def cmd_rank(args):
+    """Rank niches across scans; --set overrides thresholds for what-if runs."""
+    import time
+    import scoring
+
+    overrides = {}
+    for item in args.set or []:
+        key, _, value = item.partition("=")
+        if key not in scoring.THRESHOLDS:
+            print(f"Error: unknown threshold '{key}'. Known: {', '.join(scoring.THRESHOLDS)}",
+                  file=sys.stderr)
+            sys.exit(1)
+        kind = type(scoring.THRESHOLDS[key])
+        try:
+            overrides[key] = kind(value)
+        except ValueError:
+            print(f"Error: --set {key} expects {kind.__name__} (e.g. {key}={scoring.THRESHOLDS[key]}), "
+                  f"got '{value}'", file=sys.stderr)
+            sys.exit(1)
+
+    table = scoring.NicheTable.from_scans(args.date)
+    if not len(table):
+        print("No eval JSONs found.", file=sys.stderr)
+        sys.exit(1)
+    start = time.perf_counter()
+    base = scoring.score(table)
+    what_if = scoring.score(table, overrides) if overrides else base
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    base_rank = {row: pos for pos, row in enumerate(base.ranking(), 1)}
+    print(f"\n  {len(table)} niches from {len(args.date)} scan(s), scored in {elapsed_ms:.1f} ms")
+    if overrides:
+        print(f"  What-if: {', '.join(f'{k}={v}' for k, v in overrides.items())}")
+    print()
+    for pos, i in enumerate(what_if.ranking()[:args.top], 1):
+        line = (f"  {pos:>3}. {what_if.rating[i]:<3} {what_if.adjusted[i]:>2}/{scoring.MAX_TOTAL}  "
+                f"{table.ids[i]:<30} {table.scan_dates[i]}")
+        if overrides:
+            delta = what_if.adjusted[i] - base.adjusted[i]
+            line += f"  (was #{base_rank[i]}, {delta:+d}pt)"
+        print(line)
+
+
+def cmd_history(args):
+    """Query the cross-scan history index (or rebuild it from scan dirs)."""
+    import history
+    from config import HISTORY_DB
+
+    if args.rebuild:
+        n = history.rebuild()
+        print(f"Indexed {n} evals → {HISTORY_DB}")
+        return
+    if not args.metric:
+        names = history.metric_names(args.niche)
+        if not names:
+            print("No history recorded yet.", file=sys.stderr)
+            sys.exit(1)
+        print("\n".join(names))
+        return
+
+    if args.niche:
+        data = {args.niche: history.series(args.niche, args.metric, last=args.last)}
+    else:
+        data = history.series_for_all(args.metric, last=args.last)
+    if not any(data.values()):
+        print(f"No history for metric '{args.metric}'.", file=sys.stderr)
+        sys.exit(1)
+    print(f"\n  {args.metric}\n")
+    for niche_id, points in sorted(data.items()):
+        values = "  ".join(f"{d}={v:g}" for d, v in points)
+        print(f"  {niche_id:<30} {values}")
 
 
 def cmd_test(args):
@@ -81,12 +229,18 @@ def main():
         description="Niche Demand Analyzer",
         formatter_class=argparse.RawDescriptionHelpFormatter,
     )
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Bypass the on-disk Grok / yt-dlp response caches")
     sub = parser.add_subparsers(dest="command")
 
     # scan
     p_scan = sub.add_parser("scan", help="Stage 1: Trend Scan (Grok x_search)")
     p_scan.add_argument("--date", default=datetime.now().strftime("%Y-%m-%d"))
-    p_scan.add_argument("--category", default=None, help="Category filter (optional)")
+    p_scan.add_argument("--category", action="append", default=None,
+                        help="Category filter (optional, repeatable; scanned in parallel)")
+    p_scan.add_argument("--category-file", help="File with one category per line")
+    p_scan.add_argument("--parallel", type=int, default=None,
+                        help="Max concurrent Grok calls (default: config limit)")
     p_scan.set_defaults(func=cmd_scan)
 
     # evaluate
@@ -98,6 +252,16 @@ def main():
     p_eval.add_argument("--open", action="store_true", help="Open HTML in browser")
     p_eval.set_defaults(func=cmd_evaluate)
 
+    # evaluate-batch
+    p_batch = sub.add_parser("evaluate-batch", help="Stage 3: Evaluate many niches with shared rate limits")
+    p_batch.add_argument("--file", help="JSON or TSV/CSV file of niche_id, en, jp")
+    p_batch.add_argument("--item", nargs=3, action="append", metavar=("ID", "EN", "JP"),
+                         help="One niche (repeatable)")
+    p_batch.add_argument("--date", default=datetime.now().strftime("%Y-%m-%d"))
+    p_batch.add_argument("--report", action="store_true", help="Regenerate report.html when done")
+    p_batch.add_argument("--workers", type=int, help="Niches evaluated at once (default: EVAL_BATCH_WORKERS)")
+    p_batch.set_defaults(func=cmd_evaluate_batch)
+
     # scorecard
     p_sc = sub.add_parser("scorecard", help="Generate scorecard from eval data")
     p_sc.add_argument("--niche", required=True)
@@ -106,12 +270,42 @@ def main():
     p_sc.add_argument("--open", action="store_true")
     p_sc.set_defaults(func=cmd_scorecard)
 
+    # scorecards (whole scan, scored once)
+    p_scs = sub.add_parser("scorecards", help="Generate scorecards for a whole scan in one pass")
+    p_scs.add_argument("--date", required=True)
+    which = p_scs.add_mutually_exclusive_group(required=True)
+    which.add_argument("--all", action="store_true", help="Every niche in the scan")
+    which.add_argument("--niche", action="append", help="Niche ID (repeatable)")
+    p_scs.add_argument("--no-html", action="store_true", help="Markdown only")
+    p_scs.add_argument("--report", action="store_true",
+                       help="Also regenerate report.html from the same scores")
+    p_scs.add_argument("--workers", type=int, help="Render threads (default: CPU count)")
+    p_scs.set_defaults(func=cmd_scorecards)
+
     # report
     p_report = sub.add_parser("report", help="Generate full HTML report for all niches")
     p_report.add_argument("--date", default=datetime.now().strftime("%Y-%m-%d"))
     p_report.add_argument("--open", action="store_true", help="Open in browser")
+    p_report.add_argument("--force", action="store_true",
+                          help="Re-render every niche, ignoring cached fragments")
     p_report.set_defaults(func=cmd_report)
 
+    # rank
+    p_rank = sub.add_parser("rank", help="Rank niches across scans (threshold what-if)")
+    p_rank.add_argument("--date", action="append", required=True, help="Scan date (repeatable)")
+    p_rank.add_argument("--set", action="append", metavar="KEY=VALUE",
+                        help="Override a scoring threshold (repeatable)")
+    p_rank.add_argument("--top", type=int, default=50)
+    p_rank.set_defaults(func=cmd_rank)
+
+    # history
+    p_hist = sub.add_parser("history", help="Per-niche metric history across scans")
+    p_hist.add_argument("--niche", help="Niche ID (default: all niches)")
+    p_hist.add_argument("--metric", help="Metric name, e.g. score.adjusted (omit to list metrics)")
+    p_hist.add_argument("--last", type=int, default=10, help="Most recent N scans")
+    p_hist.add_argument("--rebuild", action="store_true", help="Rebuild the index from eval JSONs")
+    p_hist.set_defaults(func=cmd_history)
+
     # test
     p_test = sub.add_parser("test", help="Test all data sources")
     p_test.set_defaults(func=cmd_test)
@@ -121,6 +315,12 @@ def main():
         parser.print_help()
         sys.exit(1)
 
+    if args.no_cache:
+        import grok_client
+        import ytdlp_client
+        grok_client.disable_cache()
+        ytdlp_client.disable_cache()
+
     args.func(args)
 
 
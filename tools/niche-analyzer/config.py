@@ -14,13 +14,30 @@ if _env_path.exists():
 # ── Project paths ──
 PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
 OUTPUT_BASE = PROJECT_ROOT / "content" / "niche-analysis" / "scans"
+HISTORY_DB = OUTPUT_BASE.parent / "history.sqlite"   # derived; rebuild with `cli.py history --rebuild`
 YTDLP_PATH = Path.home() / "Library" / "Python" / "3.9" / "bin" / "yt-dlp"
+YTDLP_DEADLINE = 60.0   # per search; slower searches return what arrived so far
 
 # ── Grok API ──
 XAI_API_KEY = os.environ.get("XAI_API_KEY", "")
 GROK_API_BASE = "https://api.x.ai/v1"
 GROK_MODEL = "grok-4-1-fast"
 GROK_TIMEOUT = 120
+GROK_CALL_COST_USD = 0.56            # per billed x_search call (cache hits are free)
+
+# ── Response cache (on-disk, content-addressed) ──
+CACHE_DIR = Path.home() / ".cache" / "niche-analyzer"
+GROK_CACHE_TTL = 24 * 3600           # keys also include the day
+GROK_CACHE_MAX_BYTES = 200 * 1024 * 1024
+YTDLP_CACHE_TTL = 24 * 3600          # keys also include the day
+YTDLP_CACHE_MAX_BYTES = 50 * 1024 * 1024
+
+# ── HTTP (shared keep-alive session for Grok + Xpoz) ──
+HTTP_POOL_SIZE = 10            # connections kept open per host
+HTTP_MAX_RETRIES = 3           # connect errors + retryable statuses
+HTTP_BACKOFF_FACTOR = 0.5      # sleeps 0.5s, 1s, 2s between retries
+HTTP_RETRY_STATUSES = (429, 502, 503, 504)   # GET
+HTTP_POST_RETRY_STATUSES = (429, 503)         # POST: only "not accepted, try later"
 
 
 # ── Xpoz MCP ──
@@ -40,8 +57,31 @@ def load_xpoz_config() -> tuple[str, str]:
 # ── Defaults ──
 DEFAULT_YT_RESULTS = 20
 DEFAULT_TWITTER_DAYS = 30
-XPOZ_POLL_INTERVAL = 2.0
-XPOZ_MAX_WAIT = 120.0
+XPOZ_POLL_INITIAL = 0.5          # first status check after this many seconds
+XPOZ_POLL_MAX_INTERVAL = 8.0     # backoff ceiling between checks
+XPOZ_POLL_BACKOFF = 1.5          # interval multiplier per unfinished check
+XPOZ_POLL_JITTER = 0.2           # ±20% randomization of each interval
+XPOZ_MAX_WAIT = 120.0            # per operation, wall-clock (monotonic)
+XPOZ_CHECK_TIMEOUT = 30.0        # per status-check request (also capped by the op's deadline)
+XPOZ_POLL_WORKERS = 4            # status checks in flight at once across operations
+
+# ── Concurrency (max in-flight calls per data source) ──
+SOURCE_CONCURRENCY = {
+    "grok": 6,
+    "xpoz": 4,      # each slot still blocks on its operation's result
+    "ytdlp": 4,     # in-process searches are network-bound; subprocess mode costs ~1 CPU each
+}
+EVAL_BATCH_WORKERS = 4  # niches in flight at once in evaluate_batch (their calls share the limits above)
+
+# ── Rate limits (max call starts per second per data source, None = unlimited) ──
+SOURCE_RATE_LIMIT = {
+    "grok": 2.0,
+    "xpoz": 4.0,
+    "ytdlp": None,
+}
+
+# ── Step 7 scoring: JP monetization keywords counted in Grok answers ──
+COMMERCIAL_KEYWORDS = ["収益", "アフィ", "副業", "稼", "Brain", "note", "販売"]
 
 # ── Stage 1 prompts ──
 TREND_SCAN_PROMPT_EN = """\
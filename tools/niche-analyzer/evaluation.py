@@ -1,14 +1,22 @@
 """Stage 3: Niche evaluation — 8-step data collection (Step 0-7)."""
 
+import io
 import json
 import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
 from pathlib import Path
+from typing import TextIO
 
-from config import OUTPUT_BASE, DEFAULT_YT_RESULTS, DEFAULT_TWITTER_DAYS
+from config import (
+    OUTPUT_BASE, DEFAULT_YT_RESULTS, DEFAULT_TWITTER_DAYS, GROK_CALL_COST_USD, EVAL_BATCH_WORKERS,
+)
 import grok_client
+import grok_parse
+import history
 import ytdlp_client
 import xpoz_client
+from scheduler import Scheduler
 
 
 def evaluate_niche(
@@ -16,11 +24,19 @@ def evaluate_niche(
     keyword_en: str,
     keyword_jp: str,
     scan_date: str = None,
+    *,
+    scheduler: Scheduler = None,
+    xpoz: xpoz_client.XpozClient = None,
+    out: TextIO = None,
 ) -> dict:
     """Run full 8-step evaluation (Step 0-7) for a single niche.
 
     All data collection happens here (zero Claude tokens).
     Judgment/interpretation is left to the CEO session.
+
+    Pass a shared ``scheduler`` / ``xpoz`` client to run several niches
+    under one set of rate limits (see evaluate_batch). Progress goes to
+    ``out`` (default: stdout).
     """
     scan_date = scan_date or datetime.now().strftime("%Y-%m-%d")
     end_date = scan_date
@@ -28,13 +44,13 @@ def evaluate_niche(
         datetime.strptime(scan_date, "%Y-%m-%d") - timedelta(days=DEFAULT_TWITTER_DAYS)
     ).strftime("%Y-%m-%d")
 
-    print(f"\n{'='*60}")
-    print(f"  Evaluating: {niche_id}")
-    print(f"  EN: {keyword_en}  |  JP: {keyword_jp}")
-    print(f"  Date range: {start_date} → {end_date}")
-    print(f"{'='*60}\n")
+    print(f"\n{'='*60}", file=out)
+    print(f"  Evaluating: {niche_id}", file=out)
+    print(f"  EN: {keyword_en}  |  JP: {keyword_jp}", file=out)
+    print(f"  Date range: {start_date} → {end_date}", file=out)
+    print(f"{'='*60}\n", file=out)
 
-    xpoz = xpoz_client.XpozClient()
+    xpoz = xpoz or xpoz_client.XpozClient()
 
     result = {
         "niche_id": niche_id,
@@ -47,68 +63,79 @@ def evaluate_niche(
         "api_calls": {"grok": 0, "xpoz": 0, "ytdlp": 0},
     }
 
-    # ── Step 0: Trend Direction ──
-    print("  [0/8] Trend Direction (Grok)...")
-    trend_en = _safe_grok(
-        f"What is the Google Trends direction for '{keyword_en}' over the last 12 months? "
-        "Answer ONLY with one of: GROWING, STABLE, DECLINING. "
-        "Then give a one-sentence reason."
-    )
-    trend_jp = _safe_grok(
-        f"What is the Google Trends direction for '{keyword_jp}' over the last 12 months? "
-        "Answer ONLY with one of: GROWING, STABLE, DECLINING. "
-        "Then give a one-sentence reason."
-    )
-    result["api_calls"]["grok"] += 2
+    # ── Data collection (Steps 0-4, 7 run concurrently) ──
+    jobs = _collection_jobs(xpoz, keyword_en, keyword_jp, start_date, end_date)
+    print(f"  Collecting data: {len(jobs)} calls in parallel "
+          f"(Grok {_count_source(jobs, 'grok')}, yt-dlp {_count_source(jobs, 'ytdlp')}, "
+          f"Xpoz {_count_source(jobs, 'xpoz')})...", file=out)
+    own_scheduler = scheduler is None
+    scheduler = scheduler or Scheduler()
+    grok_outcomes = {name: {} for name, (source, *_) in jobs.items() if source == "grok"}
+    try:
+        futures = {
+            name: scheduler.submit(source, fn, *args, **(
+                {"outcome": grok_outcomes[name]} if name in grok_outcomes else {}
+            ))
+            for name, (source, fn, *args) in jobs.items()
+        }
+        raw = {name: f.result() for name, f in futures.items()}
+    finally:
+        if own_scheduler:
+            scheduler.shutdown()
+    for source, *_ in jobs.values():
+        result["api_calls"][source] += 1
+    grok_cached = sum(1 for o in grok_outcomes.values() if o.get("cached"))
 
+    # ── Step 0: Trend Direction ──
+    print("  [0/8] Trend Direction (Grok)...", file=out)
     result["steps"]["step0_trend"] = {
-        "en": _parse_trend(trend_en),
-        "jp": _parse_trend(trend_jp),
+        "en": _parse_trend(raw["trend_en"]),
+        "jp": _parse_trend(raw["trend_jp"]),
     }
     print(f"        Trend EN: {result['steps']['step0_trend']['en']['direction']} | "
-          f"JP: {result['steps']['step0_trend']['jp']['direction']}")
+          f"JP: {result['steps']['step0_trend']['jp']['direction']}", file=out)
 
     # ── Step 1: Demand Volume ──
-    print("  [1/8] Demand Volume...")
-    yt_en = ytdlp_client.search_videos(keyword_en, DEFAULT_YT_RESULTS)
-    yt_jp = ytdlp_client.search_videos(keyword_jp, DEFAULT_YT_RESULTS)
-    result["api_calls"]["ytdlp"] += 2
+    print("  [1/8] Demand Volume...", file=out)
+    yt_en, yt_jp = raw["yt_en"], raw["yt_jp"]
+    tw_count_en, tw_count_jp = raw["tw_count_en"], raw["tw_count_jp"]
+    reddit_en, reddit_jp = raw["reddit_en"], raw["reddit_jp"]
 
-    tw_count_en = _safe_count(xpoz, keyword_en, start_date, end_date)
-    tw_count_jp = _safe_count(xpoz, keyword_jp, start_date, end_date)
-    result["api_calls"]["xpoz"] += 2
-
-    reddit_en = _safe_call(xpoz.get_reddit_posts, keyword_en, start_date, end_date)
-    reddit_jp = _safe_call(xpoz.get_reddit_posts, keyword_jp, start_date, end_date)
-    result["api_calls"]["xpoz"] += 2
+    st_en, st_jp = ytdlp_client.video_stats(yt_en), ytdlp_client.video_stats(yt_jp)
 
     result["steps"]["step1_demand"] = {
         "en": {
-            "yt_top20_views": ytdlp_client.total_views(yt_en),
-            "yt_video_count": len(yt_en),
-            "yt_median_views": ytdlp_client.median_views(yt_en),
-            "yt_top1_pct": ytdlp_client.top1_concentration(yt_en),
+            "yt_top20_views": st_en["total"],
+            "yt_video_count": st_en["count"],
+            "yt_median_views": st_en["median"],
+            "yt_p25_views": st_en["p25"],
+            "yt_p75_views": st_en["p75"],
+            "yt_p90_views": st_en["p90"],
+            "yt_top1_pct": st_en["top1_pct"],
+            "yt_gini": st_en["gini"],
             "tweets_30d": tw_count_en,
             "reddit_posts": _count_items(reddit_en),
         },
         "jp": {
-            "yt_top20_views": ytdlp_client.total_views(yt_jp),
-            "yt_video_count": len(yt_jp),
-            "yt_median_views": ytdlp_client.median_views(yt_jp),
-            "yt_top1_pct": ytdlp_client.top1_concentration(yt_jp),
+            "yt_top20_views": st_jp["total"],
+            "yt_video_count": st_jp["count"],
+            "yt_median_views": st_jp["median"],
+            "yt_p25_views": st_jp["p25"],
+            "yt_p75_views": st_jp["p75"],
+            "yt_p90_views": st_jp["p90"],
+            "yt_top1_pct": st_jp["top1_pct"],
+            "yt_gini": st_jp["gini"],
             "tweets_30d": tw_count_jp,
             "reddit_posts": _count_items(reddit_jp),
         },
     }
-    print(f"        YT EN: {ytdlp_client.total_views(yt_en):,} views (median {ytdlp_client.median_views(yt_en):,}) | "
-          f"JP: {ytdlp_client.total_views(yt_jp):,} views (median {ytdlp_client.median_views(yt_jp):,})")
+    print(f"        YT EN: {st_en['total']:,} views (median {st_en['median']:,}) | "
+          f"JP: {st_jp['total']:,} views (median {st_jp['median']:,})", file=out)
 
     # ── Step 2: Engagement Density ──
-    print("  [2/8] Engagement Density...")
-    tw_posts_en = _safe_call(xpoz.get_twitter_posts, keyword_en, start_date, end_date)
-    tw_posts_jp = _safe_call(xpoz.get_twitter_posts, keyword_jp, start_date, end_date)
-    ig_posts_en = _safe_call(xpoz.get_instagram_posts, keyword_en, start_date, end_date)
-    result["api_calls"]["xpoz"] += 3
+    print("  [2/8] Engagement Density...", file=out)
+    tw_posts_en, tw_posts_jp = raw["tw_posts_en"], raw["tw_posts_jp"]
+    ig_posts_en = raw["ig_posts_en"]
 
     result["steps"]["step2_engagement"] = {
         "en": {
@@ -116,57 +143,42 @@ def evaluate_niche(
             "twitter_avg_likes": _avg_field(_get_items(tw_posts_en), "likeCount"),
             "twitter_avg_retweets": _avg_field(_get_items(tw_posts_en), "retweetCount"),
             "instagram_total_posts": _count_items(ig_posts_en),
-            "yt_avg_views": ytdlp_client.avg_views(yt_en),
+            "yt_avg_views": st_en["avg"],
         },
         "jp": {
             "twitter_total_posts": _count_items(tw_posts_jp),
             "twitter_avg_likes": _avg_field(_get_items(tw_posts_jp), "likeCount"),
             "twitter_avg_retweets": _avg_field(_get_items(tw_posts_jp), "retweetCount"),
-            "yt_avg_views": ytdlp_client.avg_views(yt_jp),
+            "yt_avg_views": st_jp["avg"],
         },
     }
 
     # ── Step 3: Knowledge Gap ──
-    print("  [3/8] Knowledge Gap (Grok)...")
-    grok_gap_en = _safe_grok(
-        f'Search X/Twitter for people asking questions about "{keyword_en}". '
-        f'Look for "how to", "beginner", "help", "tips" related to {keyword_en}. '
-        f'Return up to 15 results as JSON array: text, author, date, likes.'
-    )
-    grok_gap_jp = _safe_grok(
-        f'X/Twitterで「{keyword_jp} 始め方」「{keyword_jp} 初心者」「{keyword_jp} 教えて」'
-        f'など質問を検索。15件まで。JSON配列で: text, author, date, likes'
-    )
-    result["api_calls"]["grok"] += 2
-
+    print("  [3/8] Knowledge Gap (Grok)...", file=out)
     result["steps"]["step3_knowledge_gap"] = {
-        "en": {"grok_raw": grok_gap_en},
-        "jp": {"grok_raw": grok_gap_jp},
+        "en": grok_parse.parse_items(raw["gap_en"]),
+        "jp": grok_parse.parse_items(raw["gap_jp"]),
     }
 
     # ── Step 4: Competitive Supply ──
-    print("  [4/8] Competitive Supply...")
-    tw_users_en = _safe_call(xpoz.get_twitter_users, keyword_en, start_date, end_date)
-    tw_users_jp = _safe_call(xpoz.get_twitter_users, keyword_jp, start_date, end_date)
-    result["api_calls"]["xpoz"] += 2
-
-    en_publishers = _count_items(tw_users_en)
-    jp_publishers = _count_items(tw_users_jp)
+    print("  [4/8] Competitive Supply...", file=out)
+    en_publishers = _count_items(raw["tw_users_en"])
+    jp_publishers = _count_items(raw["tw_users_jp"])
 
     result["steps"]["step4_supply"] = {
         "en": {
-            "yt_channels": ytdlp_client.unique_channels(yt_en),
+            "yt_channels": st_en["unique_channels"],
             "twitter_publishers": en_publishers,
         },
         "jp": {
-            "yt_channels": ytdlp_client.unique_channels(yt_jp),
+            "yt_channels": st_jp["unique_channels"],
             "twitter_publishers": jp_publishers,
         },
     }
-    print(f"        Publishers EN: {en_publishers:,} | JP: {jp_publishers:,}")
+    print(f"        Publishers EN: {en_publishers:,} | JP: {jp_publishers:,}", file=out)
 
     # ── Step 5: Supply-Demand Gap ──
-    print("  [5/8] Supply-Demand Gap (calculated)...")
+    print("  [5/8] Supply-Demand Gap (calculated)...", file=out)
     s1 = result["steps"]["step1_demand"]
     s4 = result["steps"]["step4_supply"]
     result["steps"]["step5_gap"] = {
@@ -175,7 +187,7 @@ def evaluate_niche(
     }
 
     # ── Step 6: Localization Ratio ──
-    print("  [6/8] Localization Ratio (calculated)...")
+    print("  [6/8] Localization Ratio (calculated)...", file=out)
     result["steps"]["step6_localization"] = {
         "yt_ratio": round(s1["en"]["yt_top20_views"] / max(s1["jp"]["yt_top20_views"], 1), 2),
         "twitter_ratio": round(s1["en"]["tweets_30d"] / max(s1["jp"]["tweets_30d"], 1), 2),
@@ -183,28 +195,17 @@ def evaluate_niche(
     }
 
     # ── Step 7: Commercial Signals ──
-    print("  [7/8] Commercial Signals (Grok)...")
-    grok_com_en = _safe_grok(
-        f'Search X/Twitter for monetization activity around "{keyword_en}". '
-        f'Look for: affiliate, sponsorship, course selling, "make money", income reports. '
-        f'Return up to 15 results as JSON array: text, author, date, likes, commercial_type.'
-    )
-    grok_com_jp = _safe_grok(
-        f'X/Twitterで「{keyword_jp} 収益」「{keyword_jp} アフィリエイト」「{keyword_jp} 副業」'
-        f'など収益化に関する投稿を検索。15件まで。'
-        f'JSON配列で: text, author, date, likes, commercial_type'
-    )
-    result["api_calls"]["grok"] += 2
-
+    print("  [7/8] Commercial Signals (Grok)...", file=out)
     result["steps"]["step7_commercial"] = {
-        "en": {"grok_raw": grok_com_en},
-        "jp": {"grok_raw": grok_com_jp},
+        "en": grok_parse.parse_commercial(raw["com_en"]),
+        "jp": grok_parse.parse_commercial(raw["com_jp"]),
     }
 
     # ── Save ──
     total_calls = sum(result["api_calls"].values())
-    grok_cost = result["api_calls"]["grok"] * 0.56
+    grok_cost = (result["api_calls"]["grok"] - grok_cached) * GROK_CALL_COST_USD
     result["api_calls"]["total"] = total_calls
+    result["api_calls"]["grok_cached"] = grok_cached
     result["api_calls"]["estimated_cost_usd"] = round(grok_cost, 2)
 
     scan_dir = OUTPUT_BASE / scan_date
@@ -214,16 +215,133 @@ def evaluate_niche(
     eval_path = eval_dir / f"{niche_id}.json"
     eval_path.write_text(json.dumps(result, indent=2, ensure_ascii=False), encoding="utf-8")
 
-    print(f"\n  Saved: {eval_path}")
-    print(f"  API calls: {total_calls} (Grok: {result['api_calls']['grok']}, "
-          f"Xpoz: {result['api_calls']['xpoz']}, yt-dlp: {result['api_calls']['ytdlp']})")
-    print(f"  Estimated cost: ${grok_cost:.2f}")
+    print(f"\n  Saved: {eval_path}", file=out)
+    try:
+        history.record_eval(result, scan_date)
+    except Exception as e:  # the index is derived data; never lose an eval over it
+        print(f"    [warn] history index not updated: {e}", file=sys.stderr)
+    print(f"  API calls: {total_calls} (Grok: {result['api_calls']['grok']} [{grok_cached} cached], "
+          f"Xpoz: {result['api_calls']['xpoz']}, yt-dlp: {result['api_calls']['ytdlp']})", file=out)
+    print(f"  Estimated cost: ${grok_cost:.2f}", file=out)
 
     return result
 
 
+def evaluate_batch(
+    niches: list[tuple[str, str, str]],
+    scan_date: str = None,
+    *,
+    on_complete=None,
+    max_workers: int = None,
+) -> dict:
+    """Evaluate many (niche_id, keyword_en, keyword_jp) tuples in one process.
+
+    All niches share one Scheduler (so concurrency and rate limits are
+    global to the batch) and one XpozClient (initialized once). Each eval
+    JSON is written as soon as its niche finishes; ``on_complete(niche_id,
+    result)`` is called at the same point; an exception it raises is
+    logged and the batch carries on. Returns {niche_id: result} for the
+    niches that succeeded.
+
+    At most ``max_workers`` niches (default EVAL_BATCH_WORKERS) are in
+    flight at once. Each niche's progress is buffered and printed as one
+    block when it finishes, so concurrent niches don't interleave.
+    """
+    scan_date = scan_date or datetime.now().strftime("%Y-%m-%d")
+    xpoz = xpoz_client.XpozClient()
+    results = {}
+    logs = {niche_id: io.StringIO() for niche_id, _, _ in niches}
+
+    print(f"\n  Batch: {len(niches)} niches for {scan_date}")
+    with Scheduler() as scheduler, ThreadPoolExecutor(
+        max_workers=max(min(len(niches), max_workers or EVAL_BATCH_WORKERS), 1),
+        thread_name_prefix="niche-batch",
+    ) as pool:
+        futures = {
+            pool.submit(
+                evaluate_niche, niche_id, kw_en, kw_jp, scan_date,
+                scheduler=scheduler, xpoz=xpoz, out=logs[niche_id],
+            ): niche_id
+            for niche_id, kw_en, kw_jp in niches
+        }
+        for future in as_completed(futures):
+            niche_id = futures[future]
+            print(logs.pop(niche_id).getvalue(), end="")
+            try:
+                result = future.result()
+            except Exception as e:
+                print(f"    [warn] {niche_id} failed: {e}", file=sys.stderr)
+                continue
+            results[niche_id] = result
+            print(f"  Done: {niche_id} ({len(results)}/{len(niches)})")
+            if on_complete:
+                try:
+                    on_complete(niche_id, result)
+                except Exception as e:
+                    # The eval is already written; a bad callback mustn't drop the rest
+                    print(f"    [warn] on_complete failed for {niche_id}: {e}", file=sys.stderr)
+
+    return results
+
+
 # ── Helpers ──
 
+def _collection_jobs(xpoz, keyword_en, keyword_jp, start, end) -> dict:
+    """All independent external calls for one niche.
+
+    Returns {name: (source, fn, *args)}. Every fn is a _safe_* wrapper,
+    so a failing call yields a fallback value instead of raising.
+    """
+    return {
+        # Step 0
+        "trend_en": ("grok", _safe_grok, _trend_prompt(keyword_en)),
+        "trend_jp": ("grok", _safe_grok, _trend_prompt(keyword_jp)),
+        # Step 1
+        "yt_en": ("ytdlp", _safe_videos, keyword_en, DEFAULT_YT_RESULTS),
+        "yt_jp": ("ytdlp", _safe_videos, keyword_jp, DEFAULT_YT_RESULTS),
+        "tw_count_en": ("xpoz", _safe_count, xpoz, keyword_en, start, end),
+        "tw_count_jp": ("xpoz", _safe_count, xpoz, keyword_jp, start, end),
+        "reddit_en": ("xpoz", _safe_call, xpoz.get_reddit_posts, keyword_en, start, end),
+        "reddit_jp": ("xpoz", _safe_call, xpoz.get_reddit_posts, keyword_jp, start, end),
+        # Step 2
+        "tw_posts_en": ("xpoz", _safe_call, xpoz.get_twitter_posts, keyword_en, start, end),
+        "tw_posts_jp": ("xpoz", _safe_call, xpoz.get_twitter_posts, keyword_jp, start, end),
+        "ig_posts_en": ("xpoz", _safe_call, xpoz.get_instagram_posts, keyword_en, start, end),
+        # Step 3
+        "gap_en": ("grok", _safe_grok,
+                   f'Search X/Twitter for people asking questions about "{keyword_en}". '
+                   f'Look for "how to", "beginner", "help", "tips" related to {keyword_en}. '
+                   f'Return up to 15 results as JSON array: text, author, date, likes.'),
+        "gap_jp": ("grok", _safe_grok,
+                   f'X/Twitterで「{keyword_jp} 始め方」「{keyword_jp} 初心者」「{keyword_jp} 教えて」'
+                   f'など質問を検索。15件まで。JSON配列で: text, author, date, likes'),
+        # Step 4
+        "tw_users_en": ("xpoz", _safe_call, xpoz.get_twitter_users, keyword_en, start, end),
+        "tw_users_jp": ("xpoz", _safe_call, xpoz.get_twitter_users, keyword_jp, start, end),
+        # Step 7
+        "com_en": ("grok", _safe_grok,
+                   f'Search X/Twitter for monetization activity around "{keyword_en}". '
+                   f'Look for: affiliate, sponsorship, course selling, "make money", income reports. '
+                   f'Return up to 15 results as JSON array: text, author, date, likes, commercial_type.'),
+        "com_jp": ("grok", _safe_grok,
+                   f'X/Twitterで「{keyword_jp} 収益」「{keyword_jp} アフィリエイト」「{keyword_jp} 副業」'
+                   f'など収益化に関する投稿を検索。15件まで。'
+                   f'JSON配列で: text, author, date, likes, commercial_type'),
+    }
+
+
+def _count_source(jobs: dict, source: str) -> int:
+    return sum(1 for src, *_ in jobs.values() if src == source)
+
+
+def _trend_prompt(keyword: str) -> str:
+    return (
+        f"What is the Google Trends direction for '{keyword}' over the last 12 months? "
+        "Answer ONLY with one of: GROWING, STABLE, DECLINING. "
+        "Then give a one-sentence reason."
+    )
+
+
 def _parse_trend(raw: str) -> dict:
     """Parse Grok trend direction response into {direction, reason}."""
     if not raw or raw.startswith("ERROR"):
@@ -250,6 +368,14 @@ def _safe_count(xpoz, phrase, start, end):
         return 0
 
 
+def _safe_videos(query, max_results):
+    try:
+        return ytdlp_client.search_videos(query, max_results)
+    except Exception as e:
+        print(f"    [warn] YouTube search failed for '{query}': {e}", file=sys.stderr)
+        return []
+
+
 def _safe_call(fn, *args, **kwargs):
     try:
         return fn(*args, **kwargs)
@@ -258,9 +384,9 @@ def _safe_call(fn, *args, **kwargs):
         return {}
 
 
-def _safe_grok(prompt):
+def _safe_grok(prompt, outcome=None):
     try:
-        resp = grok_client.search(prompt)
+        resp = grok_client.search(prompt, outcome=outcome)
         return grok_client.extract_text(resp)
     except Exception as e:
         print(f"    [warn] Grok search failed: {e}", file=sys.stderr)
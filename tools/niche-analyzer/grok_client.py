@@ -2,10 +2,24 @@
 
 import json
 import sys
+from datetime import date
 
 import requests
 
-from config import XAI_API_KEY, GROK_API_BASE, GROK_MODEL, GROK_TIMEOUT
+from config import (
+    XAI_API_KEY, GROK_API_BASE, GROK_MODEL, GROK_TIMEOUT,
+    CACHE_DIR, GROK_CACHE_TTL, GROK_CACHE_MAX_BYTES,
+)
+import http_session
+from response_cache import ResponseCache
+
+_cache = ResponseCache(CACHE_DIR / "grok", ttl=GROK_CACHE_TTL, max_bytes=GROK_CACHE_MAX_BYTES)
+
+
+def disable_cache():
+    """Bypass the on-disk response cache for the rest of the process."""
+    global _cache
+    _cache = None
 
 
 def search(
@@ -13,11 +27,30 @@ def search(
     *,
     from_date: str = None,
     to_date: str = None,
+    session: requests.Session = None,
+    use_cache: bool = True,
+    outcome: dict = None,
 ) -> dict:
     """Call Grok Responses API with x_search tool.
 
-    Returns the raw API response dict.
+    Successful responses are cached on disk keyed by
+    (model, prompt, from_date, to_date, today): every call searches live
+    X data, so an undated prompt is only reused within the same day (and
+    GROK_CACHE_TTL). ``outcome["cached"]`` tells the caller whether the
+    call was served from cache, i.e. not billed. Uses the shared
+    keep-alive session unless ``session`` is given. Returns the raw API
+    response dict.
     """
+    cache = _cache if use_cache else None
+    cache_key = None
+    if cache is not None:
+        cache_key = cache.make_key(GROK_MODEL, prompt, from_date, to_date, date.today().isoformat())
+        cached = cache.get(cache_key)
+        if cached is not None:
+            if outcome is not None:
+                outcome["cached"] = True
+            return cached
+
     if not XAI_API_KEY:
         raise RuntimeError("XAI_API_KEY not set. Check ~/.claude/mcp-servers/x-search-mcp/.env")
 
@@ -33,7 +66,8 @@ def search(
         "tools": [tool],
     }
 
-    resp = requests.post(
+    session = session or http_session.get_session()
+    resp = session.post(
         f"{GROK_API_BASE}/responses",
         headers={
             "Authorization": f"Bearer {XAI_API_KEY}",
@@ -43,7 +77,12 @@ def search(
         timeout=GROK_TIMEOUT,
     )
     resp.raise_for_status()
-    return resp.json()
+    data = resp.json()
+    if outcome is not None:
+        outcome["cached"] = False
+    if cache is not None:
+        cache.put(cache_key, data)
+    return data
 
 
 def extract_text(response: dict) -> str:
@@ -0,0 +1,95 @@
+"""Turn free-form Grok answers into structured records.
+
+Grok is asked for JSON arrays but sometimes wraps them in prose or
+```json fences. Parsing happens once, at evaluation time, and the
+record is stored next to ``grok_raw`` in the eval JSON so scoring and
+reports never re-parse raw text.
+"""
+
+import json
+import re
+
+from config import COMMERCIAL_KEYWORDS
+
+
+def extract_json(text: str):
+    """Leniently pull the first JSON record list out of Grok text.
+
+    Handles bare JSON, ```json fenced blocks, JSON embedded in prose and
+    truncated arrays (the complete leading elements are kept). Embedded
+    candidates count only if they hold records (see _has_records), so a
+    citation like "[1]" in the prose doesn't hide the answer after it.
+    Returns the decoded value, or None if nothing parses.
+    """
+    if not text or text.startswith("ERROR"):
+        return None
+    try:
+        return json.loads(text)
+    except (json.JSONDecodeError, TypeError):
+        pass
+
+    candidates = re.findall(r"```(?:json)?\s*(.*?)```", text, re.DOTALL)
+    candidates.append(text)
+    decoder = json.JSONDecoder()
+    for chunk in candidates:
+        for m in re.finditer(r"[\[{]", chunk):
+            try:
+                value, _ = decoder.raw_decode(chunk, m.start())
+            except json.JSONDecodeError:
+                value = _salvage_array(decoder, chunk, m.start()) if m.group() == "[" else None
+            if _has_records(value):
+                return value
+    return None
+
+
+def _has_records(value) -> bool:
+    """A list with dict elements, or a dict wrapping such a list."""
+    if isinstance(value, list):
+        return any(isinstance(v, dict) for v in value)
+    if isinstance(value, dict):
+        return any(_has_records(v) for v in value.values() if isinstance(v, list))
+    return False
+
+
+def _salvage_array(decoder: json.JSONDecoder, text: str, start: int) -> list:
+    """Decode elements of a truncated JSON array until one fails."""
+    items = []
+    pos = start + 1
+    while True:
+        while pos < len(text) and text[pos] in " \t\r\n,":
+            pos += 1
+        try:
+            value, pos = decoder.raw_decode(text, pos)
+        except json.JSONDecodeError:
+            return items
+        items.append(value)
+
+
+def parse_items(raw: str) -> dict:
+    """Structured record for a Grok answer that should be a JSON array.
+
+    Returns {"grok_raw", "failed", "items", "item_count"}. ``items`` is
+    None when no JSON array could be found (prose-only answer).
+    """
+    failed = not isinstance(raw, str) or raw.startswith("ERROR")
+    value = None if failed else extract_json(raw)
+    if isinstance(value, dict):
+        # {"results": [...]} style wrappers
+        value = next((v for v in value.values() if _has_records(v)), [value])
+    items = [i for i in value if isinstance(i, dict)] if isinstance(value, list) else None
+    return {
+        "grok_raw": raw,
+        "failed": failed,
+        "items": items,
+        "item_count": len(items) if items else 0,
+    }
+
+
+def parse_commercial(raw: str) -> dict:
+    """parse_items plus the Step 7 commercial keyword hit count."""
+    record = parse_items(raw)
+    text = raw if isinstance(raw, str) else ""
+    record["commercial_hits"] = (
+        0 if record["failed"] else sum(1 for kw in COMMERCIAL_KEYWORDS if kw in text)
+    )
+    return record
@@ -0,0 +1,194 @@
+"""Cross-scan niche history index (SQLite).
+
+Every saved eval is flattened into (niche_id, scan_date, metric, value)
+rows so time-series questions ("how did trivia-shorts' JP median views
+move over the last ten scans?") are one indexed query instead of a walk
+over every scan directory.
+
+Metric names are dotted paths into the eval's ``steps`` (for example
+``step1_demand.jp.yt_median_views``) plus ``score.total``,
+``score.adjusted`` and ``score.<step>`` from the scoring engine.
+
+The index is derived data: evaluate_niche updates it incrementally and
+``rebuild()`` regenerates it from the scan directories.
+"""
+
+import json
+import sqlite3
+import sys
+from pathlib import Path
+
+from config import OUTPUT_BASE, HISTORY_DB
+import scoring
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS evals (
+    niche_id     TEXT NOT NULL,
+    scan_date    TEXT NOT NULL,
+    evaluated_at TEXT,
+    name_en      TEXT,
+    name_jp      TEXT,
+    PRIMARY KEY (niche_id, scan_date)
+);
+CREATE TABLE IF NOT EXISTS metrics (
+    niche_id  TEXT NOT NULL,
+    scan_date TEXT NOT NULL,
+    metric    TEXT NOT NULL,
+    value     REAL,
+    PRIMARY KEY (niche_id, metric, scan_date)
+);
+CREATE INDEX IF NOT EXISTS metrics_by_metric ON metrics (metric, scan_date);
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+def connect(path: Path = None, *, build_if_missing: bool = False) -> sqlite3.Connection:
+    """Open the index, creating the schema (and optionally backfilling it).
+
+    Whether the scan directories were ever backfilled is tracked in the
+    meta table, not inferred from the file existing: evaluate_niche may
+    create the DB with a single eval before any reader asks for history.
+    """
+    path = Path(path or HISTORY_DB)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(path, timeout=30)
+    conn.executescript(SCHEMA)
+    if build_if_missing and not _is_backfilled(conn):
+        _backfill(conn, OUTPUT_BASE)
+    return conn
+
+
+def _is_backfilled(conn: sqlite3.Connection) -> bool:
+    return conn.execute("SELECT 1 FROM meta WHERE key = 'backfilled'").fetchone() is not None
+
+
+def flatten_metrics(data: dict) -> dict:
+    """Numeric leaves of ``steps`` plus engine scores, keyed by dotted path."""
+    out = {}
+
+    def walk(prefix, node):
+        if isinstance(node, dict):
+            for key, val in node.items():
+                walk(f"{prefix}.{key}" if prefix else key, val)
+        elif isinstance(node, (int, float)) and not isinstance(node, bool):
+            out[prefix] = float(node)
+
+    walk("", data.get("steps", {}))
+
+    scored = scoring.score(scoring.NicheTable.from_evals([data]))
+    out["score.total"] = float(scored.total[0])
+    out["score.adjusted"] = float(scored.adjusted[0])
+    for key in scoring.STEP_KEYS:
+        out[f"score.{key}"] = float(scored.steps[key][0])
+    return out
+
+
+def record_eval(data: dict, scan_date: str, conn: sqlite3.Connection = None):
+    """Insert or replace one niche's rows for scan_date."""
+    own = conn is None
+    conn = conn or connect()
+    try:
+        niche_id = data["niche_id"]
+        metrics = flatten_metrics(data)
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO evals VALUES (?, ?, ?, ?, ?)",
+                (niche_id, scan_date, data.get("evaluated_at", ""),
+                 data.get("niche_name_en", ""), data.get("niche_name_jp", "")),
+            )
+            conn.execute(
+                "DELETE FROM metrics WHERE niche_id = ? AND scan_date = ?", (niche_id, scan_date),
+            )
+            conn.executemany(
+                "INSERT INTO metrics VALUES (?, ?, ?, ?)",
+                [(niche_id, scan_date, name, value) for name, value in metrics.items()],
+            )
+    finally:
+        if own:
+            conn.close()
+
+
+def rebuild(base: Path = None, path: Path = None) -> int:
+    """Drop and regenerate the index from every scan's eval JSONs."""
+    conn = connect(path)
+    try:
+        with conn:
+            conn.execute("DELETE FROM metrics")
+            conn.execute("DELETE FROM evals")
+        return _backfill(conn, base or OUTPUT_BASE)
+    finally:
+        conn.close()
+
+
+def _backfill(conn: sqlite3.Connection, base: Path) -> int:
+    count = 0
+    for eval_path in sorted(base.glob("*/eval/*.json")):
+        try:
+            data = json.loads(eval_path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"    [warn] skipping {eval_path}: {e}", file=sys.stderr)
+            continue
+        data.setdefault("niche_id", eval_path.stem)
+        record_eval(data, eval_path.parent.parent.name, conn)
+        count += 1
+    with conn:
+        conn.execute("INSERT OR REPLACE INTO meta VALUES ('backfilled', datetime('now'))")
+    return count
+
+
+def series(
+    niche_id: str, metric: str, *, last: int = 10, until: str = None,
+    conn: sqlite3.Connection = None,
+) -> list[tuple[str, float]]:
+    """[(scan_date, value), ...] oldest first, at most ``last`` points."""
+    return series_for_all(metric, last=last, until=until, niche_ids=[niche_id], conn=conn).get(niche_id, [])
+
+
+def series_for_all(
+    metric: str, *, last: int = 10, until: str = None, niche_ids: list = None,
+    conn: sqlite3.Connection = None,
+) -> dict:
+    """{niche_id: [(scan_date, value), ...]} for one metric in one query."""
+    own = conn is None
+    conn = conn or connect(build_if_missing=True)
+    try:
+        sql = "SELECT niche_id, scan_date, value FROM metrics WHERE metric = ?"
+        params = [metric]
+        if until:
+            sql += " AND scan_date <= ?"
+            params.append(until)
+        if niche_ids:
+            sql += f" AND niche_id IN ({','.join('?' * len(niche_ids))})"
+            params.extend(niche_ids)
+        sql += " ORDER BY niche_id, scan_date"
+        out = {}
+        for niche_id, scan_date, value in conn.execute(sql, params):
+            out.setdefault(niche_id, []).append((scan_date, value))
+        return {k: v[-last:] for k, v in out.items()}
+    finally:
+        if own:
+            conn.close()
+
+
+def metric_names(niche_id: str = None, conn: sqlite3.Connection = None) -> list[str]:
+    own = conn is None
+    conn = conn or connect(build_if_missing=True)
+    try:
+        if niche_id:
+            rows = conn.execute(
+                "SELECT DISTINCT metric FROM metrics WHERE niche_id = ? ORDER BY metric", (niche_id,),
+            )
+        else:
+            rows = conn.execute("SELECT DISTINCT metric FROM metrics ORDER BY metric")
+        return [r[0] for r in rows]
+    finally:
+        if own:
+            conn.close()
+
+
+if __name__ == "__main__":
+    n = rebuild()
+    print(f"Indexed {n} evals → {HISTORY_DB}")
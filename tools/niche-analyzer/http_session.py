@@ -0,0 +1,77 @@
+"""Shared keep-alive HTTP session for the Grok and Xpoz clients.
+
+One pooled requests.Session per process, so TLS connections to api.x.ai
+and the Xpoz MCP host are reused across every call in a scan (including
+Xpoz status polling) instead of re-handshaking per request.
+"""
+
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from config import (
+    HTTP_POOL_SIZE, HTTP_MAX_RETRIES, HTTP_BACKOFF_FACTOR, HTTP_RETRY_STATUSES,
+    HTTP_POST_RETRY_STATUSES,
+)
+
+_session = None
+_lock = threading.Lock()
+
+
+class _Retry(Retry):
+    """Retry that only re-sends a POST on statuses meaning it wasn't accepted.
+
+    A 502/504 on a POST may come after the upstream already did the work
+    (a billed Grok call, a queued Xpoz operation), so those are retried
+    for GET only. Connection errors are retried for both: nothing was sent.
+    """
+
+    def is_retry(self, method: str, status_code: int, has_retry_after: bool = False) -> bool:
+        if method.upper() == "POST" and status_code not in HTTP_POST_RETRY_STATUSES:
+            return False
+        return super().is_retry(method, status_code, has_retry_after)
+
+
+def get_session() -> requests.Session:
+    """Return the process-wide pooled session (created on first use)."""
+    global _session
+    if _session is None:
+        with _lock:
+            if _session is None:
+                _session = new_session()
+    return _session
+
+
+def new_session(
+    pool_size: int = HTTP_POOL_SIZE,
+    max_retries: int = HTTP_MAX_RETRIES,
+    backoff_factor: float = HTTP_BACKOFF_FACTOR,
+) -> requests.Session:
+    """Build a session with a sized connection pool and retry/backoff.
+
+    Retries cover connection failures and throttling/gateway statuses
+    (POST only on 429/503, honouring Retry-After). Read timeouts are not
+    retried: the request may already have been billed (Grok) or queued (Xpoz).
+    """
+    retry = _Retry(
+        total=max_retries,
+        connect=max_retries,
+        read=0,
+        status=max_retries,
+        status_forcelist=HTTP_RETRY_STATUSES,
+        allowed_methods=frozenset({"GET", "POST"}),
+        backoff_factor=backoff_factor,
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=pool_size,
+        pool_maxsize=pool_size,
+        max_retries=retry,
+    )
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
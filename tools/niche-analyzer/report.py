@@ -1,18 +1,53 @@
 """Generate comprehensive HTML report from all niche evaluations — v2 (8-step)."""
 
+import hashlib
 import json
+import os
+import sqlite3
 import sys
 from datetime import datetime
 from pathlib import Path
 
-from config import OUTPUT_BASE
-
-# Reuse scoring logic from scorecard.py
-from scorecard import _score_step, _overall_rating, _declining_penalty
-
-
-def generate_report(scan_date: str, *, open_browser: bool = False) -> Path:
-    """Generate a full HTML report covering all niches for a scan date."""
+from config import OUTPUT_BASE, COMMERCIAL_KEYWORDS
+import grok_parse
+import history
+import scoring
+
+FRAGMENT_CACHE = ".report-cache.json"
+# Cached fragments are only valid for the renderer, scoring and parsing code
+# (and the keyword config it counts against) that made them
+_RENDERER_SOURCES = (Path(__file__), Path(scoring.__file__), Path(grok_parse.__file__))
+
+
+def _renderer_hash(sources=_RENDERER_SOURCES, keywords=COMMERCIAL_KEYWORDS) -> str:
+    digest = hashlib.sha256()
+    for path in sources:
+        digest.update(Path(path).read_bytes())
+    digest.update(json.dumps(keywords, ensure_ascii=False).encode())
+    return digest.hexdigest()[:16]
+
+
+_RENDERER = _renderer_hash()
+# Substituted after the output hash is taken so timestamps don't defeat it
+_GENERATED_MARK = "<!--generated-->"
+
+
+def generate_report(
+    scan_date: str,
+    *,
+    open_browser: bool = False,
+    force: bool = False,
+    scored: scoring.Scores = None,
+) -> Path:
+    """Generate a full HTML report covering all niches for a scan date.
+
+    Per-niche fragments (scores + rendered HTML) are cached in the scan
+    directory keyed by each eval file's SHA-256, so only re-evaluated
+    niches are re-scored and re-rendered. report.html is left untouched
+    when the assembled output is identical. ``force`` ignores the cache.
+    ``scored`` reuses a bulk scoring result for this scan (see
+    scorecard.generate_scorecards) instead of scoring stale niches again.
+    """
     scan_dir = OUTPUT_BASE / scan_date
     eval_dir = scan_dir / "eval"
 
@@ -20,59 +55,74 @@ def generate_report(scan_date: str, *, open_browser: bool = False) -> Path:
         print(f"Error: {eval_dir} not found", file=sys.stderr)
         sys.exit(1)
 
-    # Load all eval JSONs
-    niches = []
-    for f in sorted(eval_dir.glob("*.json")):
-        data = json.loads(f.read_text(encoding="utf-8"))
-        steps = data.get("steps", {})
-
-        step_keys = [
-            "step0_trend",
-            "step1_demand", "step2_engagement", "step3_knowledge_gap",
-            "step4_supply", "step5_gap", "step6_localization", "step7_commercial",
-        ]
-        scores = {}
-        total = 0
-        for key in step_keys:
-            score, comment = _score_step(key, data, steps)
-            scores[key] = {"score": score, "comment": comment}
-            total += score
+    cache_path = scan_dir / FRAGMENT_CACHE
+    cache = {} if force else _load_cache(cache_path)
+    fragments = cache.get("niches", {}) if cache.get("renderer") == _RENDERER else {}
 
-        # Detect data quality issues
-        warnings = _detect_warnings(data, steps)
-
-        # Overall rating with DECLINING penalty
-        overall, adjusted = _overall_rating(total, steps)
-
-        kw_en = data.get("keywords", {}).get("en", "") or data.get("niche_name_en", "")
-        kw_jp = data.get("keywords", {}).get("jp", "") or data.get("niche_name_jp", "")
-        if isinstance(kw_en, list):
-            kw_en = kw_en[0] if kw_en else ""
-        if isinstance(kw_jp, list):
-            kw_jp = kw_jp[0] if kw_jp else ""
-
-        niches.append({
-            "id": data.get("niche_id", f.stem),
-            "name_en": kw_en,
-            "name_jp": kw_jp,
-            "data": data,
-            "steps": steps,
-            "scores": scores,
-            "total": total,
-            "adjusted": adjusted,
-            "max": 24,
-            "overall": overall,
-            "warnings": warnings,
-        })
+    shared_rows = {}
+    if scored is not None:
+        shared_rows = {nid: i for i, nid in enumerate(scored.table.ids)}
+
+    # Hash every eval file; parse only the ones whose fragment is stale
+    hashes = {}
+    stale_ids, stale_evals = [], []
+    rerendered = 0
+    for f in sorted(eval_dir.glob("*.json")):
+        raw = f.read_bytes()
+        digest = hashlib.sha256(raw).hexdigest()
+        hashes[f.stem] = digest
+        if fragments.get(f.stem, {}).get("eval_hash") == digest:
+            continue
+        rerendered += 1
+        if f.stem in shared_rows:
+            i = shared_rows[f.stem]
+            fragments[f.stem] = {"eval_hash": digest, **_render_niche(scored.table.evals[i], scored, i)}
+            continue
+        data = json.loads(raw)
+        data.setdefault("niche_id", f.stem)
+        stale_ids.append(f.stem)
+        stale_evals.append(data)
+
+    # Score the remaining changed niches in bulk and render their fragments
+    if stale_evals:
+        table = scoring.NicheTable.from_evals(stale_evals, [scan_date] * len(stale_evals))
+        stale_scored = scoring.score(table)
+        for i, stem in enumerate(stale_ids):
+            fragments[stem] = {"eval_hash": hashes[stem], **_render_niche(table.evals[i], stale_scored, i)}
+
+    niches = [dict(fragments[stem]) for stem in hashes]
+
+    # Adjusted-score trend across scans up to this one
+    try:
+        trend = history.series_for_all(
+            "score.adjusted", until=scan_date, niche_ids=[n["id"] for n in niches],
+        )
+    except sqlite3.Error as e:
+        print(f"    [warn] history index unavailable: {e}", file=sys.stderr)
+        trend = {}
+    for n in niches:
+        n["history"] = trend.get(n["id"], [])
 
     # Sort by adjusted score descending
     niches.sort(key=lambda n: n["adjusted"], reverse=True)
 
     html = _build_html(scan_date, niches)
+    output_hash = hashlib.sha256(html.encode("utf-8")).hexdigest()
 
     report_path = scan_dir / "report.html"
-    report_path.write_text(html, encoding="utf-8")
-    print(f"Report: {report_path}")
+    rerendered = f"{rerendered}/{len(hashes)} niches re-rendered"
+    if output_hash == cache.get("output_hash") and report_path.exists() and not force:
+        print(f"Report unchanged: {report_path} ({rerendered})")
+    else:
+        html = html.replace(_GENERATED_MARK, datetime.now().strftime("%Y-%m-%d %H:%M"))
+        report_path.write_text(html, encoding="utf-8")
+        print(f"Report: {report_path} ({rerendered})")
+
+    _save_cache(cache_path, {
+        "renderer": _RENDERER,
+        "output_hash": output_hash,
+        "niches": {stem: fragments[stem] for stem in hashes},
+    })
 
     if open_browser:
         import subprocess
@@ -81,6 +131,53 @@ def generate_report(scan_date: str, *, open_browser: bool = False) -> Path:
     return report_path
 
 
+def _load_cache(path: Path) -> dict:
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+
+def _save_cache(path: Path, cache: dict):
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(cache, ensure_ascii=False), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def _render_niche(data: dict, scored: scoring.Scores, i: int) -> dict:
+    """Score summary plus position-independent HTML fragments for one niche."""
+    steps = data.get("steps", {})
+    scores = {
+        key: {"score": scored.steps[key][i], "comment": scored.comment(key, i)}
+        for key in scoring.STEP_KEYS
+    }
+
+    kw_en = data.get("keywords", {}).get("en", "") or data.get("niche_name_en", "")
+    kw_jp = data.get("keywords", {}).get("jp", "") or data.get("niche_name_jp", "")
+    if isinstance(kw_en, list):
+        kw_en = kw_en[0] if kw_en else ""
+    if isinstance(kw_jp, list):
+        kw_jp = kw_jp[0] if kw_jp else ""
+
+    n = {
+        "id": scored.table.ids[i],
+        "name_en": kw_en,
+        "name_jp": kw_jp,
+        "total": scored.total[i],
+        "adjusted": scored.adjusted[i],
+        "max": scoring.MAX_TOTAL,
+        "overall": scored.rating[i],
+        # Detect data quality issues
+        "warnings": _detect_warnings(data, steps),
+        "api_calls": data.get("api_calls", {}).get("total", 0),
+        "cost_usd": data.get("api_calls", {}).get("estimated_cost_usd", 0),
+    }
+    n["row_cells"] = _ranking_cells(steps)
+    n["heatmap_row"] = _heatmap_row(n, scores)
+    n["detail"] = _detail_section(n, steps, scores)
+    return n
+
+
 def _detect_warnings(data: dict, steps: dict) -> list:
     """Detect data quality issues in evaluation results."""
     warnings = []
@@ -101,8 +198,7 @@ def _detect_warnings(data: dict, steps: dict) -> list:
     # Grok failures
     for step, label in [(s3, "Knowledge Gap"), (s7, "Commercial Signals")]:
         for lang in ["en", "jp"]:
-            raw = step.get(lang, {}).get("grok_raw", "")
-            if isinstance(raw, str) and raw.startswith("ERROR"):
+            if scoring.grok_record(step, lang)["failed"]:
                 warnings.append(f"{label} ({lang.upper()}) — Grok API failed")
 
     # Twitter count = 0
@@ -142,36 +238,55 @@ def _ratio_bar(ratio: float, max_ratio: float = 40.0) -> str:
     )
 
 
+def _sparkline(points: list, max_value: float = scoring.MAX_TOTAL,
+               width: int = 64, height: int = 16) -> str:
+    """Inline SVG polyline of (scan_date, value) points; empty below 2 points."""
+    if len(points) < 2:
+        return ""
+    step = width / (len(points) - 1)
+    coords = " ".join(
+        f"{i * step:.1f},{height - min(v, max_value) / max_value * height:.1f}"
+        for i, (_, v) in enumerate(points)
+    )
+    first, last = points[0][1], points[-1][1]
+    color = "#22c55e" if last > first else "#ef4444" if last < first else "#888"
+    title = " → ".join(f"{d}: {v:g}" for d, v in points)
+    return (
+        f'<svg class="sparkline" width="{width}" height="{height}" viewBox="0 0 {width} {height}">'
+        f'<title>{_esc(title)}</title>'
+        f'<polyline fill="none" stroke="{color}" stroke-width="1.5" points="{coords}"/>'
+        f'</svg>'
+    )
+
+
 def _star_cell(score: int) -> str:
     colors = {3: "#22c55e", 2: "#eab308", 1: "#ef4444"}
     symbols = {3: "&#9733;&#9733;&#9733;", 2: "&#9733;&#9733;&#9734;", 1: "&#9733;&#9734;&#9734;"}
     return f'<span style="color:{colors[score]}">{symbols[score]}</span>'
 
 
-def _grok_summary(raw: str, max_items: int = 5) -> str:
-    """Extract a readable summary from Grok raw JSON response."""
-    if not raw or raw.startswith("ERROR"):
+def _grok_summary(record: dict, max_items: int = 5) -> str:
+    """Render a readable summary from a pre-parsed Grok record."""
+    raw = record.get("grok_raw", "")
+    if not raw or record["failed"]:
         return '<span class="dimmed">Data unavailable</span>'
-    try:
-        items = json.loads(raw)
-        if isinstance(items, list):
-            html_parts = []
-            for item in items[:max_items]:
-                text = item.get("text", "")[:200]
-                author = item.get("author", "")
-                likes = item.get("likes", 0)
-                html_parts.append(
-                    f'<div class="grok-item">'
-                    f'<div class="grok-text">{_esc(text)}</div>'
-                    f'<div class="grok-meta">{_esc(author)} &middot; {likes} likes</div>'
-                    f'</div>'
-                )
-            remaining = len(items) - max_items
-            if remaining > 0:
-                html_parts.append(f'<div class="grok-more">+{remaining} more results</div>')
-            return "\n".join(html_parts)
-    except (json.JSONDecodeError, TypeError):
-        pass
+    items = record.get("items")
+    if items is not None:
+        html_parts = []
+        for item in items[:max_items]:
+            text = str(item.get("text", ""))[:200]
+            author = item.get("author", "")
+            likes = item.get("likes", 0)
+            html_parts.append(
+                f'<div class="grok-item">'
+                f'<div class="grok-text">{_esc(text)}</div>'
+                f'<div class="grok-meta">{_esc(author)} &middot; {likes} likes</div>'
+                f'</div>'
+            )
+        remaining = len(items) - max_items
+        if remaining > 0:
+            html_parts.append(f'<div class="grok-more">+{remaining} more results</div>')
+        return "\n".join(html_parts)
     # Fallback: show truncated text
     return f'<div class="grok-text">{_esc(raw[:500])}</div>'
 
@@ -185,138 +300,111 @@ def _esc(text) -> str:
             .replace(">", "&gt;").replace('"', "&quot;"))
 
 
-def _build_html(scan_date: str, niches: list) -> str:
-    """Build the complete HTML report."""
+_TREND_ICONS = {"GROWING": "&#x2197;", "STABLE": "&#x2192;", "DECLINING": "&#x2198;", "UNKNOWN": "?"}
+_TREND_COLORS = {"GROWING": "#22c55e", "STABLE": "#eab308", "DECLINING": "#ef4444", "UNKNOWN": "#555"}
+_STEP_LABELS = ["Trend", "需要", "反応", "質問", "競合", "需給差", "EN/JP", "商業"]
 
-    # --- Ranking table rows ---
-    trend_icons = {"GROWING": "&#x2197;", "STABLE": "&#x2192;", "DECLINING": "&#x2198;", "UNKNOWN": "?"}
-    trend_colors = {"GROWING": "#22c55e", "STABLE": "#eab308", "DECLINING": "#ef4444", "UNKNOWN": "#555"}
 
-    ranking_rows = ""
-    for i, n in enumerate(niches, 1):
-        s1 = n["steps"].get("step1_demand", {})
-        s6 = n["steps"].get("step6_localization", {})
-        s4 = n["steps"].get("step4_supply", {})
-        s0 = n["steps"].get("step0_trend", {})
-        yt_en = s1.get("en", {}).get("yt_top20_views", 0)
-        yt_jp = s1.get("jp", {}).get("yt_top20_views", 0)
-        yt_ratio = s6.get("yt_ratio", 0)
-        pub_jp = s4.get("jp", {}).get("twitter_publishers", 0)
-
-        # Trend direction (worst of EN/JP)
-        en_dir = s0.get("en", {}).get("direction", "UNKNOWN")
-        jp_dir = s0.get("jp", {}).get("direction", "UNKNOWN")
-        # Show the more concerning direction
-        if en_dir == "DECLINING" or jp_dir == "DECLINING":
-            show_dir = "DECLINING"
-        elif en_dir == "GROWING" or jp_dir == "GROWING":
-            show_dir = "GROWING"
-        else:
-            show_dir = en_dir if en_dir != "UNKNOWN" else jp_dir
-        trend_html = f'<span style="color:{trend_colors.get(show_dir, "#555")};font-size:18px">{trend_icons.get(show_dir, "?")}</span>'
+def _rating_color(overall: str) -> str:
+    if overall == "★★★":
+        return "#22c55e"
+    if overall == "★★":
+        return "#eab308"
+    return "#ef4444"
 
-        warn_icon = ' <span class="warn-dot" title="Data quality issues">&#9888;</span>' if n["warnings"] else ""
-        overall = n.get("overall", "★★")
-        if overall == "★★★":
-            color = "#22c55e"
-        elif overall == "★★":
-            color = "#eab308"
-        else:
-            color = "#ef4444"
 
-        ranking_rows += f"""
-        <tr class="rank-row" data-niche="{n['id']}">
-            <td class="rank-num">{i}</td>
-            <td>
-                <div class="niche-name">{_esc(n['name_jp'])}{warn_icon}</div>
-                <div class="niche-sub">{_esc(n['name_en'])}</div>
-            </td>
-            <td class="num" style="color:{color};font-weight:700">{n['adjusted']}/{n['max']}</td>
+def _ranking_cells(steps: dict) -> str:
+    """Ranking-table cells after the score column (position-independent)."""
+    s1 = steps.get("step1_demand", {})
+    s6 = steps.get("step6_localization", {})
+    s4 = steps.get("step4_supply", {})
+    s0 = steps.get("step0_trend", {})
+    yt_en = s1.get("en", {}).get("yt_top20_views", 0)
+    yt_jp = s1.get("jp", {}).get("yt_top20_views", 0)
+    yt_ratio = s6.get("yt_ratio", 0)
+    pub_jp = s4.get("jp", {}).get("twitter_publishers", 0)
+
+    # Trend direction (worst of EN/JP)
+    en_dir = s0.get("en", {}).get("direction", "UNKNOWN")
+    jp_dir = s0.get("jp", {}).get("direction", "UNKNOWN")
+    # Show the more concerning direction
+    if en_dir == "DECLINING" or jp_dir == "DECLINING":
+        show_dir = "DECLINING"
+    elif en_dir == "GROWING" or jp_dir == "GROWING":
+        show_dir = "GROWING"
+    else:
+        show_dir = en_dir if en_dir != "UNKNOWN" else jp_dir
+    trend_html = f'<span style="color:{_TREND_COLORS.get(show_dir, "#555")};font-size:18px">{_TREND_ICONS.get(show_dir, "?")}</span>'
+
+    return f"""
             <td style="text-align:center">{trend_html}</td>
             <td class="num">{_fmt(yt_en)}</td>
             <td class="num">{_fmt(yt_jp)}</td>
             <td>{_ratio_bar(yt_ratio)}</td>
-            <td class="num">{_fmt(pub_jp)}</td>
-        </tr>"""
+            <td class="num">{_fmt(pub_jp)}</td>"""
 
-    # --- Heatmap ---
-    step_labels = ["Trend", "需要", "反応", "質問", "競合", "需給差", "EN/JP", "商業"]
-    step_keys = [
-        "step0_trend",
-        "step1_demand", "step2_engagement", "step3_knowledge_gap",
-        "step4_supply", "step5_gap", "step6_localization", "step7_commercial",
-    ]
-
-    heatmap_header = "".join(f"<th>{lbl}</th>" for lbl in step_labels)
-    heatmap_rows = ""
-    for n in niches:
-        cells = ""
-        for key in step_keys:
-            sc = n["scores"][key]["score"]
-            bg = {3: "rgba(34,197,94,0.2)", 2: "rgba(234,179,8,0.15)", 1: "rgba(239,68,68,0.15)"}[sc]
-            cells += f'<td style="background:{bg};text-align:center">{_star_cell(sc)}</td>'
-        heatmap_rows += f"""
+
+def _heatmap_row(n: dict, scores: dict) -> str:
+    cells = ""
+    for key in scoring.STEP_KEYS:
+        sc = scores[key]["score"]
+        bg = {3: "rgba(34,197,94,0.2)", 2: "rgba(234,179,8,0.15)", 1: "rgba(239,68,68,0.15)"}[sc]
+        cells += f'<td style="background:{bg};text-align:center">{_star_cell(sc)}</td>'
+    return f"""
         <tr>
             <td class="niche-name-sm">{_esc(n['name_jp'])}</td>
             {cells}
             <td class="num" style="font-weight:700">{n['adjusted']}</td>
         </tr>"""
 
-    # --- Per-niche detail sections ---
-    detail_sections = ""
-    for n in niches:
-        s = n["steps"]
-        s1 = s.get("step1_demand", {})
-        s2 = s.get("step2_engagement", {})
-        s4 = s.get("step4_supply", {})
-        s5 = s.get("step5_gap", {})
-        s6 = s.get("step6_localization", {})
-        s3 = s.get("step3_knowledge_gap", {})
-        s7 = s.get("step7_commercial", {})
-
-        # Warning badges
-        warn_html = ""
-        if n["warnings"]:
-            badges = "".join(f'<span class="warn-badge">&#9888; {_esc(w)}</span>' for w in n["warnings"])
-            warn_html = f'<div class="warn-box">{badges}</div>'
-
-        # Step score cards (compact) — 8 steps
-        step_cards = ""
-        for key, label in zip(step_keys, step_labels):
-            sc = n["scores"].get(key, {"score": 1, "comment": "N/A"})
-            step_cards += (
-                f'<div class="mini-card">'
-                f'<div class="mini-label">{label}</div>'
-                f'<div class="mini-score">{_star_cell(sc["score"])}</div>'
-                f'<div class="mini-comment">{_esc(sc["comment"])}</div>'
-                f'</div>'
-            )
 
-        # Grok qualitative data
-        grok_gap_en = _grok_summary(s3.get("en", {}).get("grok_raw", ""))
-        grok_gap_jp = _grok_summary(s3.get("jp", {}).get("grok_raw", ""))
-        grok_com_en = _grok_summary(s7.get("en", {}).get("grok_raw", ""))
-        grok_com_jp = _grok_summary(s7.get("jp", {}).get("grok_raw", ""))
-
-        overall = n.get("overall", "★★")
-        if overall == "★★★":
-            color = "#22c55e"
-        elif overall == "★★":
-            color = "#eab308"
-        else:
-            color = "#ef4444"
-
-        # Step 0 trend data
-        s0 = s.get("step0_trend", {})
-        s0_en_dir = s0.get("en", {}).get("direction", "UNKNOWN")
-        s0_jp_dir = s0.get("jp", {}).get("direction", "UNKNOWN")
-        s0_en_reason = _esc(s0.get("en", {}).get("reason", "N/A"))
-        s0_jp_reason = _esc(s0.get("jp", {}).get("reason", "N/A"))
-        decline_badge = ""
-        if s0_en_dir == "DECLINING" and s0_jp_dir == "DECLINING":
-            decline_badge = ' <span class="warn-badge">DECLINING penalty applied</span>'
-
-        detail_sections += f"""
+def _detail_section(n: dict, s: dict, scores: dict) -> str:
+    """Per-niche detail section."""
+    s1 = s.get("step1_demand", {})
+    s2 = s.get("step2_engagement", {})
+    s4 = s.get("step4_supply", {})
+    s5 = s.get("step5_gap", {})
+    s6 = s.get("step6_localization", {})
+    s3 = s.get("step3_knowledge_gap", {})
+    s7 = s.get("step7_commercial", {})
+
+    # Warning badges
+    warn_html = ""
+    if n["warnings"]:
+        badges = "".join(f'<span class="warn-badge">&#9888; {_esc(w)}</span>' for w in n["warnings"])
+        warn_html = f'<div class="warn-box">{badges}</div>'
+
+    # Step score cards (compact) — 8 steps
+    step_cards = ""
+    for key, label in zip(scoring.STEP_KEYS, _STEP_LABELS):
+        sc = scores.get(key, {"score": 1, "comment": "N/A"})
+        step_cards += (
+            f'<div class="mini-card">'
+            f'<div class="mini-label">{label}</div>'
+            f'<div class="mini-score">{_star_cell(sc["score"])}</div>'
+            f'<div class="mini-comment">{_esc(sc["comment"])}</div>'
+            f'</div>'
+        )
+
+    # Grok qualitative data
+    grok_gap_en = _grok_summary(scoring.grok_record(s3, "en"))
+    grok_gap_jp = _grok_summary(scoring.grok_record(s3, "jp"))
+    grok_com_en = _grok_summary(scoring.grok_record(s7, "en"))
+    grok_com_jp = _grok_summary(scoring.grok_record(s7, "jp"))
+
+    color = _rating_color(n.get("overall", "★★"))
+
+    # Step 0 trend data
+    s0 = s.get("step0_trend", {})
+    s0_en_dir = s0.get("en", {}).get("direction", "UNKNOWN")
+    s0_jp_dir = s0.get("jp", {}).get("direction", "UNKNOWN")
+    s0_en_reason = _esc(s0.get("en", {}).get("reason", "N/A"))
+    s0_jp_reason = _esc(s0.get("jp", {}).get("reason", "N/A"))
+    decline_badge = ""
+    if s0_en_dir == "DECLINING" and s0_jp_dir == "DECLINING":
+        decline_badge = ' <span class="warn-badge">DECLINING penalty applied</span>'
+
+    return f"""
     <div class="detail-section" id="detail-{n['id']}">
         <div class="detail-header">
             <div>
@@ -332,8 +420,8 @@ def _build_html(scan_date: str, niches: list) -> str:
             <h3>Step 0: Trend Direction</h3>
             <table>
                 <tr><th>Lang</th><th>Direction</th><th>Reason</th></tr>
-                <tr><td>EN</td><td style="color:{trend_colors.get(s0_en_dir, '#555')}">{s0_en_dir}</td><td>{s0_en_reason}</td></tr>
-                <tr><td>JP</td><td style="color:{trend_colors.get(s0_jp_dir, '#555')}">{s0_jp_dir}</td><td>{s0_jp_reason}</td></tr>
+                <tr><td>EN</td><td style="color:{_TREND_COLORS.get(s0_en_dir, '#555')}">{s0_en_dir}</td><td>{s0_en_reason}</td></tr>
+                <tr><td>JP</td><td style="color:{_TREND_COLORS.get(s0_jp_dir, '#555')}">{s0_jp_dir}</td><td>{s0_jp_reason}</td></tr>
             </table>
         </div>
 
@@ -393,9 +481,36 @@ def _build_html(scan_date: str, niches: list) -> str:
         </details>
     </div>"""
 
+
+def _build_html(scan_date: str, niches: list) -> str:
+    """Assemble the complete HTML report from per-niche fragments."""
+
+    # --- Ranking table rows ---
+    ranking_rows = ""
+    for i, n in enumerate(niches, 1):
+        warn_icon = ' <span class="warn-dot" title="Data quality issues">&#9888;</span>' if n["warnings"] else ""
+        color = _rating_color(n.get("overall", "★★"))
+
+        ranking_rows += f"""
+        <tr class="rank-row" data-niche="{n['id']}">
+            <td class="rank-num">{i}</td>
+            <td>
+                <div class="niche-name">{_esc(n['name_jp'])}{warn_icon}</div>
+                <div class="niche-sub">{_esc(n['name_en'])}</div>
+            </td>
+            <td class="num" style="color:{color};font-weight:700">{n['adjusted']}/{n['max']}{_sparkline(n.get('history', []))}</td>{n['row_cells']}
+        </tr>"""
+
+    # --- Heatmap ---
+    heatmap_header = "".join(f"<th>{lbl}</th>" for lbl in _STEP_LABELS)
+    heatmap_rows = "".join(n["heatmap_row"] for n in niches)
+
+    # --- Per-niche detail sections ---
+    detail_sections = "".join(n["detail"] for n in niches)
+
     # --- Total API cost ---
-    total_calls = sum(n["data"].get("api_calls", {}).get("total", 0) for n in niches)
-    total_cost = sum(n["data"].get("api_calls", {}).get("estimated_cost_usd", 0) for n in niches)
+    total_calls = sum(n["api_calls"] for n in niches)
+    total_cost = sum(n["cost_usd"] for n in niches)
     niches_with_warnings = sum(1 for n in niches if n["warnings"])
 
     return f"""<!DOCTYPE html>
@@ -438,6 +553,7 @@ body{{font-family:-apple-system,BlinkMacSystemFont,'Segoe UI','Hiragino Sans',sa
 .niche-name-sm{{font-size:13px;font-weight:600;color:#ccc;white-space:nowrap}}
 .num{{text-align:right;font-variant-numeric:tabular-nums;color:#aaa}}
 .warn-dot{{color:#eab308;font-size:14px}}
+.sparkline{{display:block;margin-left:auto;margin-top:2px}}
 
 /* Ratio bar */
 .ratio-bar{{position:relative;height:20px;background:#1a1a1a;border-radius:4px;overflow:hidden;min-width:100px}}
@@ -511,7 +627,7 @@ body{{font-family:-apple-system,BlinkMacSystemFont,'Segoe UI','Hiragino Sans',sa
             <span>Niches: {len(niches)}</span>
             <span>API Calls: {total_calls}</span>
             <span>Cost: ${total_cost:.2f}</span>
-            <span>Generated: {datetime.now().strftime('%Y-%m-%d %H:%M')}</span>
+            <span>Generated: {_GENERATED_MARK}</span>
         </div>
     </div>
 
@@ -0,0 +1,85 @@
+"""On-disk content-addressed response cache with TTL and LRU eviction.
+
+Each entry is one JSON file named by the SHA-256 of its key parts.
+File mtime doubles as the LRU clock (touched on every hit); the
+creation time stored inside the entry drives TTL expiry. When the
+directory grows past ``max_bytes`` the least recently used entries
+are deleted.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+
+class ResponseCache:
+    """Thread-safe JSON cache rooted at ``directory``."""
+
+    def __init__(self, directory: Path, *, ttl: float, max_bytes: int):
+        self.directory = Path(directory)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(*parts) -> str:
+        """Hash arbitrary JSON-serializable key parts into a hex digest."""
+        blob = json.dumps(parts, ensure_ascii=False, sort_keys=True)
+        return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def get(self, key: str):
+        """Return the cached value, or None on miss/expiry."""
+        path = self._path(key)
+        try:
+            entry = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            return None
+        if time.time() - entry.get("created", 0) > self.ttl:
+            path.unlink(missing_ok=True)
+            return None
+        try:
+            os.utime(path)  # mark as recently used
+        except OSError:
+            pass
+        return entry.get("value")
+
+    def put(self, key: str, value):
+        """Store value under key, then evict LRU entries if over budget."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        entry = {"created": time.time(), "value": value}
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(entry, f, ensure_ascii=False)
+            os.replace(tmp, self._path(key))
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+        self._evict()
+
+    def _evict(self):
+        with self._lock:
+            entries = []
+            total = 0
+            for path in self.directory.glob("*.json"):
+                try:
+                    st = path.stat()
+                except OSError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, path))
+                total += st.st_size
+            if total <= self.max_bytes:
+                return
+            entries.sort()
+            for _, size, path in entries:
+                if total <= self.max_bytes:
+                    break
+                path.unlink(missing_ok=True)
+                total -= size
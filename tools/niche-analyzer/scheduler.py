@@ -0,0 +1,78 @@
+"""Concurrent execution of data-source calls with per-source limits."""
+
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from config import SOURCE_CONCURRENCY, SOURCE_RATE_LIMIT
+
+
+class Scheduler:
+    """One bounded thread pool per data source (grok / xpoz / ytdlp).
+
+    Calls are I/O-bound (HTTP, subprocess), so threads are enough.
+    A separate pool per source caps in-flight calls to each provider
+    without a slow source starving the others. Sources with a rate
+    limit also have their call starts spaced out.
+
+    A single Scheduler can be shared by many niches (see evaluate_batch)
+    so limits apply to the whole run, not per niche.
+    """
+
+    def __init__(self, limits: dict = None, rates: dict = None):
+        self.limits = dict(SOURCE_CONCURRENCY)
+        if limits:
+            self.limits.update(limits)
+        self.rates = dict(SOURCE_RATE_LIMIT)
+        if rates:
+            self.rates.update(rates)
+        self._pools = {
+            source: ThreadPoolExecutor(max_workers=n, thread_name_prefix=f"niche-{source}")
+            for source, n in self.limits.items()
+        }
+        self._gates = {
+            source: _RateGate(rate)
+            for source, rate in self.rates.items()
+            if rate and source in self._pools
+        }
+
+    def submit(self, source: str, fn, *args, **kwargs) -> Future:
+        """Queue fn(*args, **kwargs) on the pool for source."""
+        if source not in self._pools:
+            raise KeyError(f"Unknown data source: {source}")
+        gate = self._gates.get(source)
+        if gate is None:
+            return self._pools[source].submit(fn, *args, **kwargs)
+        return self._pools[source].submit(_gated, gate, fn, args, kwargs)
+
+    def shutdown(self, wait: bool = True):
+        for pool in self._pools.values():
+            pool.shutdown(wait=wait)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
+
+
+class _RateGate:
+    """Spaces call starts at least 1/rate seconds apart (thread-safe)."""
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+
+    def wait(self):
+        with self._lock:
+            slot = max(time.monotonic(), self._next_slot)
+            self._next_slot = slot + self.interval
+        delay = slot - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+
+def _gated(gate: _RateGate, fn, args, kwargs):
+    gate.wait()
+    return fn(*args, **kwargs)
@@ -1,12 +1,15 @@
 """Generate scorecard (Markdown + HTML) from eval JSON — v2 scoring."""
 
 import json
+import os
 import sys
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 
 from config import OUTPUT_BASE
+import scoring
 
 
 def generate_scorecard(
@@ -23,28 +26,75 @@ def generate_scorecard(
         sys.exit(1)
 
     data = json.loads(eval_path.read_text(encoding="utf-8"))
-    steps = data.get("steps", {})
+    sc_dir = OUTPUT_BASE / scan_date / "scorecards"
+    sc_dir.mkdir(parents=True, exist_ok=True)
+    md_path, html_path = _write_scorecard(niche_id, data, _score_niche(data), sc_dir, html=html)
+    if html_path and open_browser:
+        subprocess.run(["open", str(html_path)])
+
+    return md_path
 
-    # Build markdown
-    md = _render_markdown(data, steps)
 
-    # Save markdown
+def generate_scorecards(
+    scan_date: str,
+    niche_ids: list[str] = None,
+    *,
+    html: bool = True,
+    report: bool = False,
+    workers: int = None,
+) -> list[Path]:
+    """Generate scorecards for a whole scan (or a subset) in one pass.
+
+    Every eval is loaded into one table and scored once; the same Scores
+    feed the MD/HTML renderers and, with ``report=True``, report.html.
+    Rendering and writing run on a thread pool. Returns the MD paths.
+    """
+    table = scoring.NicheTable.from_scans([scan_date])
+    if not len(table):
+        print(f"Error: no eval JSONs in {OUTPUT_BASE / scan_date / 'eval'}", file=sys.stderr)
+        sys.exit(1)
+    scored = scoring.score(table)
+
+    rows = range(len(table))
+    if niche_ids:
+        missing = set(niche_ids) - set(table.ids)
+        if missing:
+            print(f"Error: no eval for {', '.join(sorted(missing))}", file=sys.stderr)
+            sys.exit(1)
+        rows = [i for i in rows if table.ids[i] in niche_ids]
+
     sc_dir = OUTPUT_BASE / scan_date / "scorecards"
     sc_dir.mkdir(parents=True, exist_ok=True)
+    workers = workers or min(len(rows), os.cpu_count() or 4) or 1
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        paths = list(pool.map(
+            lambda i: _write_scorecard(table.ids[i], table.evals[i], _scores_from(scored, i),
+                                       sc_dir, html=html)[0],
+            rows,
+        ))
+
+    if report:
+        from report import generate_report
+        generate_report(scan_date, scored=scored)
+
+    return paths
+
+
+def _write_scorecard(niche_id: str, data: dict, sc: dict, sc_dir: Path, *, html: bool):
+    """Render and save one scorecard. Returns (md_path, html_path or None)."""
+    steps = data.get("steps", {})
+
     md_path = sc_dir / f"{niche_id}.md"
-    md_path.write_text(md, encoding="utf-8")
+    md_path.write_text(_render_markdown(data, steps, sc), encoding="utf-8")
     print(f"  Scorecard MD: {md_path}")
 
-    # Generate HTML
+    html_path = None
     if html:
-        html_content = _render_html(data, steps)
         html_path = sc_dir / f"{niche_id}.html"
-        html_path.write_text(html_content, encoding="utf-8")
+        html_path.write_text(_render_html(data, steps, sc), encoding="utf-8")
         print(f"  Scorecard HTML: {html_path}")
-        if open_browser:
-            subprocess.run(["open", str(html_path)])
 
-    return md_path
+    return md_path, html_path
 
 
 def _stars(value: float, thresholds: tuple = (1.5, 2.5)) -> str:
@@ -56,174 +106,25 @@ def _stars(value: float, thresholds: tuple = (1.5, 2.5)) -> str:
     return "★"
 
 
-def _score_step(step_name: str, data: dict, steps: dict) -> tuple[int, str]:
-    """Score a step 1-3 and return (score, comment). v2 scoring."""
-
-    if step_name == "step0_trend":
-        s = steps.get("step0_trend", {})
-        en_dir = s.get("en", {}).get("direction", "UNKNOWN")
-        jp_dir = s.get("jp", {}).get("direction", "UNKNOWN")
-        dirs = [en_dir, jp_dir]
-        if "GROWING" in dirs:
-            return 3, f"Growing (EN:{en_dir} JP:{jp_dir})"
-        if en_dir == "DECLINING" and jp_dir == "DECLINING":
-            return 1, f"Both declining"
-        # At least one STABLE (or UNKNOWN but not both DECLINING)
-        return 2, f"Stable (EN:{en_dir} JP:{jp_dir})"
-
-    elif step_name == "step1_demand":
-        s = steps.get("step1_demand", {})
-        en_median = s.get("en", {}).get("yt_median_views", 0)
-        jp_median = s.get("jp", {}).get("yt_median_views", 0)
-        yt_median = max(en_median, jp_median)
-        # Multi-source check: demand exists beyond YouTube
-        tweets = max(s.get("en", {}).get("tweets_30d", 0), s.get("jp", {}).get("tweets_30d", 0))
-        reddit = max(s.get("en", {}).get("reddit_posts", 0), s.get("jp", {}).get("reddit_posts", 0))
-        multi_source = (tweets > 100) or (reddit > 100)
-        if yt_median >= 500_000 and multi_source:
-            return 3, f"Strong (median {yt_median:,} + multi-source)"
-        if yt_median >= 500_000:
-            return 2, f"YT-only demand (median {yt_median:,})"
-        if yt_median >= 100_000 and multi_source:
-            return 2, f"Moderate + multi-source (median {yt_median:,})"
-        return 1, f"Low demand (median {yt_median:,})"
-
-    elif step_name == "step2_engagement":
-        s1 = steps.get("step1_demand", {})
-        s2 = steps.get("step2_engagement", {})
-        # Use median from step1 data (more robust than avg)
-        en_median = s1.get("en", {}).get("yt_median_views", 0)
-        jp_median = s1.get("jp", {}).get("yt_median_views", 0)
-        yt_median = max(en_median, jp_median)
-        en_top1 = s1.get("en", {}).get("yt_top1_pct", 0)
-        jp_top1 = s1.get("jp", {}).get("yt_top1_pct", 0)
-        top1_pct = max(en_top1, jp_top1)
-        # Base score from median views
-        if yt_median > 200_000:
-            base = 3
-        elif yt_median > 50_000:
-            base = 2
-        else:
-            base = 1
-        # Penalize outlier dependency
-        if top1_pct > 0.5:
-            base = max(base - 1, 1)
-            return base, f"Outlier-dependent (top1={top1_pct:.0%}, median {yt_median:,})"
-        return base, f"Median {yt_median:,} views (top1={top1_pct:.0%})"
-
-    elif step_name == "step3_knowledge_gap":
-        s = steps.get("step3_knowledge_gap", {})
-        # Try both EN and JP, take the better one
-        best_count = 0
-        for lang in ("en", "jp"):
-            raw = s.get(lang, {}).get("grok_raw", "")
-            if isinstance(raw, str) and not raw.startswith("ERROR"):
-                try:
-                    items = json.loads(raw)
-                    if isinstance(items, list):
-                        best_count = max(best_count, len(items))
-                except (json.JSONDecodeError, TypeError):
-                    pass
-        if best_count >= 10:
-            return 3, f"Rich ({best_count} questions)"
-        if best_count >= 5:
-            return 2, f"Moderate ({best_count} questions)"
-        return 1, f"Weak ({best_count} questions)"
-
-    elif step_name == "step4_supply":
-        s = steps.get("step4_supply", {})
-        s1 = steps.get("step1_demand", {})
-        en_pub = s.get("en", {}).get("twitter_publishers", 0)
-        jp_pub = s.get("jp", {}).get("twitter_publishers", 0)
-        pub = max(en_pub, jp_pub)
-        en_median = s1.get("en", {}).get("yt_median_views", 0)
-        jp_median = s1.get("jp", {}).get("yt_median_views", 0)
-        yt_median = max(en_median, jp_median)
-        # Cross-reference demand vs competition
-        if pub < 50_000 and yt_median >= 100_000:
-            return 3, f"Blue ocean (pub {pub:,}, median {yt_median:,})"
-        if pub < 50_000 and yt_median < 100_000:
-            return 1, f"Dead market (pub {pub:,}, median {yt_median:,})"
-        if pub < 200_000:
-            return 2, f"Moderate competition ({pub:,})"
-        return 1, f"Red ocean ({pub:,} publishers)"
-
-    elif step_name == "step5_gap":
-        s = steps.get("step5_gap", {})
-        jp_gap = s.get("jp", 0)
-        if jp_gap > 200:
-            return 3, f"High gap ({jp_gap:.0f})"
-        elif jp_gap > 50:
-            return 2, f"Moderate gap ({jp_gap:.0f})"
-        return 1, f"Low gap ({jp_gap:.0f})"
-
-    elif step_name == "step6_localization":
-        s = steps.get("step6_localization", {})
-        yt_ratio = s.get("yt_ratio", 1.0)
-        if yt_ratio > 5.0:
-            return 3, f"Strong EN→JP opportunity ({yt_ratio:.1f}x)"
-        elif yt_ratio > 2.0:
-            return 2, f"Moderate opportunity ({yt_ratio:.1f}x)"
-        return 1, f"JP already mature ({yt_ratio:.1f}x)"
-
-    elif step_name == "step7_commercial":
-        s = steps.get("step7_commercial", {})
-        jp_raw = s.get("jp", {}).get("grok_raw", "")
-        if "ERROR" in jp_raw:
-            return 1, "Grok failed"
-        commercial_keywords = ["収益", "アフィ", "副業", "稼", "Brain", "note", "販売"]
-        hits = sum(1 for kw in commercial_keywords if kw in jp_raw)
-        if hits >= 4:
-            return 3, f"Strong commercial signals ({hits}/7 keywords)"
-        elif hits >= 2:
-            return 2, f"Some commercial signals ({hits}/7)"
-        return 1, f"Weak signals ({hits}/7)"
-
-    return 1, "Unknown"
-
-
-def _declining_penalty(steps: dict) -> int:
-    """Calculate point penalty for DECLINING trends."""
-    s0 = steps.get("step0_trend", {})
-    en_dir = s0.get("en", {}).get("direction", "UNKNOWN")
-    jp_dir = s0.get("jp", {}).get("direction", "UNKNOWN")
-    if en_dir == "DECLINING" and jp_dir == "DECLINING":
-        return 3
-    if en_dir == "DECLINING" or jp_dir == "DECLINING":
-        return 1
-    return 0
-
+def _score_niche(data: dict) -> dict:
+    """Score one eval through the bulk engine (a one-row table)."""
+    return _scores_from(scoring.score(scoring.NicheTable.from_evals([data])), 0)
 
-def _overall_rating(total: int, steps: dict) -> tuple[str, int]:
-    """Determine overall star rating (24-point scale) with DECLINING penalty.
-
-    Returns (rating_str, adjusted_total).
-    """
-    penalty = _declining_penalty(steps)
-    adjusted = total - penalty
-
-    # Base rating from adjusted points
-    if adjusted >= 20:
-        rating = "★★★"
-    elif adjusted >= 14:
-        rating = "★★"
-    else:
-        rating = "★"
-
-    # Additional tier downgrade when both DECLINING
-    s0 = steps.get("step0_trend", {})
-    en_dir = s0.get("en", {}).get("direction", "UNKNOWN")
-    jp_dir = s0.get("jp", {}).get("direction", "UNKNOWN")
-    if en_dir == "DECLINING" and jp_dir == "DECLINING":
-        if rating == "★★★":
-            rating = "★★"
-        elif rating == "★★":
-            rating = "★"
 
-    return rating, adjusted
+def _scores_from(scored: scoring.Scores, i: int) -> dict:
+    """Row i of a bulk scoring result in the shape the renderers take."""
+    return {
+        "steps": {
+            key: (scored.steps[key][i], scored.comment(key, i)) for key in scoring.STEP_KEYS
+        },
+        "total": scored.total[i],
+        "penalty": scored.penalty[i],
+        "adjusted": scored.adjusted[i],
+        "overall": scored.rating[i],
+    }
 
 
-def _render_markdown(data: dict, steps: dict) -> str:
+def _render_markdown(data: dict, steps: dict, sc: dict = None) -> str:
     """Render scorecard as Markdown."""
     niche_id = data.get("niche_id", "unknown")
     kw_en = data.get("keywords", {}).get("en", "")
@@ -240,15 +141,14 @@ def _render_markdown(data: dict, steps: dict) -> str:
         ("step7_commercial", "商業シグナル"),
     ]
 
+    sc = sc or _score_niche(data)
     scores = []
     for key, label in step_names:
-        score, comment = _score_step(key, data, steps)
+        score, comment = sc["steps"][key]
         scores.append((key, label, score, comment))
 
-    total_raw = sum(s[2] for s in scores)
-    max_total = len(scores) * 3  # 24
-    overall, adjusted = _overall_rating(total_raw, steps)
-    penalty = _declining_penalty(steps)
+    max_total = scoring.MAX_TOTAL
+    overall, adjusted, penalty = sc["overall"], sc["adjusted"], sc["penalty"]
 
     # Trend direction icons
     s0 = steps.get("step0_trend", {})
@@ -329,7 +229,7 @@ def _render_markdown(data: dict, steps: dict) -> str:
     return "\n".join(lines)
 
 
-def _render_html(data: dict, steps: dict) -> str:
+def _render_html(data: dict, steps: dict, sc: dict = None) -> str:
     """Render scorecard as standalone HTML (dashboard-compatible)."""
     niche_id = data.get("niche_id", "unknown")
     kw_en = data.get("keywords", {}).get("en", "")
@@ -346,15 +246,14 @@ def _render_html(data: dict, steps: dict) -> str:
         ("step7_commercial", "商業シグナル", "Commercial"),
     ]
 
+    sc = sc or _score_niche(data)
     scores = []
-    total = 0
     for key, label_jp, label_en in step_names:
-        score, comment = _score_step(key, data, steps)
+        score, comment = sc["steps"][key]
         scores.append((key, label_jp, label_en, score, comment))
-        total += score
 
-    max_total = len(scores) * 3  # 24
-    overall, adjusted = _overall_rating(total, steps)
+    max_total = scoring.MAX_TOTAL
+    overall, adjusted = sc["overall"], sc["adjusted"]
     pct = adjusted / max_total * 100
 
     s1 = steps.get("step1_demand", {})
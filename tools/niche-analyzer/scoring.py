@@ -0,0 +1,316 @@
+"""Table-driven v2 scoring engine for niche evaluations.
+
+Eval JSONs are loaded into a struct-of-arrays (one flat list per input
+metric, one row per niche), then every step score, the DECLINING
+penalty and the overall rating are computed column by column from the
+THRESHOLDS table. Scoring hundreds of niches across scans is a few
+list passes, and a what-if run is just score(table, {"gap_high": 300}).
+
+scorecard, report and the rank command all read their step scores, comments
+and ratings from score(), so this module is the single source of truth
+for the scoring rules.
+"""
+
+import json
+from pathlib import Path
+
+from config import OUTPUT_BASE, COMMERCIAL_KEYWORDS
+import grok_parse
+
+STEP_KEYS = [
+    "step0_trend",
+    "step1_demand", "step2_engagement", "step3_knowledge_gap",
+    "step4_supply", "step5_gap", "step6_localization", "step7_commercial",
+]
+MAX_TOTAL = len(STEP_KEYS) * 3  # 24
+
+THRESHOLDS = {
+    # Step 1: YouTube median views + multi-source check
+    "demand_strong": 500_000,
+    "demand_moderate": 100_000,
+    "multi_source": 100,            # tweets or reddit posts above this
+    # Step 2: median views, outlier dependency
+    "engagement_high": 200_000,
+    "engagement_mid": 50_000,
+    "outlier_top1": 0.5,
+    # Step 3: knowledge-gap question count
+    "questions_rich": 10,
+    "questions_moderate": 5,
+    # Step 4: publishers vs demand
+    "supply_blue_pub": 50_000,
+    "supply_blue_median": 100_000,
+    "supply_moderate_pub": 200_000,
+    # Step 5: JP supply-demand gap
+    "gap_high": 200,
+    "gap_moderate": 50,
+    # Step 6: EN/JP YouTube ratio
+    "localization_strong": 5.0,
+    "localization_moderate": 2.0,
+    # Step 7: JP commercial keyword hits
+    "commercial_strong": 4,
+    "commercial_some": 2,
+    # Overall rating (adjusted points)
+    "rating_3": 20,
+    "rating_2": 14,
+}
+
+STAR = {3: "★★★", 2: "★★", 1: "★"}
+
+
+# ── Loading ──
+
+class NicheTable:
+    """Struct-of-arrays view of many eval JSONs (one row per niche)."""
+
+    COLUMNS = (
+        "trend_en", "trend_jp", "yt_median", "top1", "tweets", "reddit",
+        "questions", "publishers", "jp_gap", "yt_ratio", "com_failed", "com_hits",
+    )
+
+    def __init__(self):
+        self.ids = []
+        self.scan_dates = []
+        self.evals = []
+        for col in self.COLUMNS:
+            setattr(self, col, [])
+
+    def __len__(self):
+        return len(self.ids)
+
+    @classmethod
+    def from_evals(cls, evals: list[dict], scan_dates: list[str] = None) -> "NicheTable":
+        table = cls()
+        for i, data in enumerate(evals):
+            table.append(data, scan_dates[i] if scan_dates else "")
+        return table
+
+    @classmethod
+    def from_scans(cls, scan_dates: list[str], base: Path = None) -> "NicheTable":
+        """Load every eval/*.json of the given scans (sorted by file name)."""
+        base = base or OUTPUT_BASE
+        table = cls()
+        for date in scan_dates:
+            for f in sorted((base / date / "eval").glob("*.json")):
+                data = json.loads(f.read_text(encoding="utf-8"))
+                data.setdefault("niche_id", f.stem)
+                table.append(data, date)
+        return table
+
+    def append(self, data: dict, scan_date: str = ""):
+        steps = data.get("steps", {})
+        s0 = steps.get("step0_trend", {})
+        s1 = steps.get("step1_demand", {})
+        s3 = steps.get("step3_knowledge_gap", {})
+        s4 = steps.get("step4_supply", {})
+        s7 = steps.get("step7_commercial", {})
+        com_jp = grok_record(s7, "jp", commercial=True)
+
+        self.ids.append(data.get("niche_id", ""))
+        self.scan_dates.append(scan_date)
+        self.evals.append(data)
+        self.trend_en.append(s0.get("en", {}).get("direction", "UNKNOWN"))
+        self.trend_jp.append(s0.get("jp", {}).get("direction", "UNKNOWN"))
+        self.yt_median.append(_max_lang(s1, "yt_median_views"))
+        self.top1.append(_max_lang(s1, "yt_top1_pct"))
+        self.tweets.append(_max_lang(s1, "tweets_30d"))
+        self.reddit.append(_max_lang(s1, "reddit_posts"))
+        self.questions.append(max(grok_record(s3, lang)["item_count"] for lang in ("en", "jp")))
+        self.publishers.append(_max_lang(s4, "twitter_publishers"))
+        self.jp_gap.append(steps.get("step5_gap", {}).get("jp", 0))
+        self.yt_ratio.append(steps.get("step6_localization", {}).get("yt_ratio", 1.0))
+        self.com_failed.append(com_jp["failed"])
+        self.com_hits.append(com_jp["commercial_hits"])
+
+
+def grok_record(step: dict, lang: str, *, commercial: bool = False) -> dict:
+    """Pre-parsed Grok record for one language of a step.
+
+    Eval JSONs written since parsing moved to evaluation time already hold
+    the record; older ones only have ``grok_raw`` and are parsed here.
+    """
+    rec = step.get(lang, {})
+    if "items" in rec and (not commercial or "commercial_hits" in rec):
+        return rec
+    raw = rec.get("grok_raw", "")
+    return grok_parse.parse_commercial(raw) if commercial else grok_parse.parse_items(raw)
+
+
+def _max_lang(step: dict, field: str):
+    return max(step.get("en", {}).get(field, 0) or 0, step.get("jp", {}).get(field, 0) or 0)
+
+
+# ── Scoring ──
+
+class Scores:
+    """Bulk scoring result: per-step score columns plus totals and ratings."""
+
+    def __init__(self, table: NicheTable, thresholds: dict):
+        self.table = table
+        self.thresholds = thresholds
+        self.steps = {}       # step key -> [score per niche]
+        self.total = []
+        self.penalty = []
+        self.adjusted = []
+        self.rating = []
+
+    def ranking(self) -> list[int]:
+        """Row indices sorted by adjusted score, best first (stable)."""
+        return sorted(range(len(self.table)), key=lambda i: self.adjusted[i], reverse=True)
+
+    def comment(self, step: str, i: int) -> str:
+        """Human-readable reason for one step score of row i."""
+        return _COMMENTS[step](self.table, self.thresholds, self.steps[step][i], i)
+
+
+def score(table: NicheTable, thresholds: dict = None) -> Scores:
+    """Score every niche in table. ``thresholds`` overrides THRESHOLDS keys."""
+    t = dict(THRESHOLDS)
+    if thresholds:
+        unknown = set(thresholds) - set(THRESHOLDS)
+        if unknown:
+            raise KeyError(f"Unknown scoring thresholds: {', '.join(sorted(unknown))}")
+        t.update(thresholds)
+
+    tb = table
+    out = Scores(table, t)
+    multi = [tw > t["multi_source"] or rd > t["multi_source"] for tw, rd in zip(tb.tweets, tb.reddit)]
+
+    out.steps["step0_trend"] = [
+        3 if "GROWING" in (en, jp) else 1 if en == jp == "DECLINING" else 2
+        for en, jp in zip(tb.trend_en, tb.trend_jp)
+    ]
+    out.steps["step1_demand"] = [
+        3 if med >= t["demand_strong"] and ms
+        else 2 if med >= t["demand_strong"] or (med >= t["demand_moderate"] and ms)
+        else 1
+        for med, ms in zip(tb.yt_median, multi)
+    ]
+    out.steps["step2_engagement"] = [
+        max(base - 1, 1) if top1 > t["outlier_top1"] else base
+        for base, top1 in zip(
+            [3 if m > t["engagement_high"] else 2 if m > t["engagement_mid"] else 1 for m in tb.yt_median],
+            tb.top1,
+        )
+    ]
+    out.steps["step3_knowledge_gap"] = [
+        3 if q >= t["questions_rich"] else 2 if q >= t["questions_moderate"] else 1
+        for q in tb.questions
+    ]
+    out.steps["step4_supply"] = [
+        (3 if med >= t["supply_blue_median"] else 1) if pub < t["supply_blue_pub"]
+        else 2 if pub < t["supply_moderate_pub"] else 1
+        for pub, med in zip(tb.publishers, tb.yt_median)
+    ]
+    out.steps["step5_gap"] = [
+        3 if g > t["gap_high"] else 2 if g > t["gap_moderate"] else 1 for g in tb.jp_gap
+    ]
+    out.steps["step6_localization"] = [
+        3 if r > t["localization_strong"] else 2 if r > t["localization_moderate"] else 1
+        for r in tb.yt_ratio
+    ]
+    out.steps["step7_commercial"] = [
+        1 if failed else 3 if h >= t["commercial_strong"] else 2 if h >= t["commercial_some"] else 1
+        for failed, h in zip(tb.com_failed, tb.com_hits)
+    ]
+
+    out.total = [sum(col) for col in zip(*out.steps.values())] if len(tb) else []
+    both_declining = [en == jp == "DECLINING" for en, jp in zip(tb.trend_en, tb.trend_jp)]
+    out.penalty = [
+        3 if both else 1 if "DECLINING" in (en, jp) else 0
+        for both, en, jp in zip(both_declining, tb.trend_en, tb.trend_jp)
+    ]
+    out.adjusted = [tot - pen for tot, pen in zip(out.total, out.penalty)]
+    out.rating = [
+        rating_for(adj, both, t) for adj, both in zip(out.adjusted, both_declining)
+    ]
+    return out
+
+
+def rating_for(adjusted: int, both_declining: bool, thresholds: dict = None) -> str:
+    """Star rating for adjusted points, one tier lower when both DECLINING."""
+    t = thresholds or THRESHOLDS
+    stars = 3 if adjusted >= t["rating_3"] else 2 if adjusted >= t["rating_2"] else 1
+    if both_declining:
+        stars = max(stars - 1, 1)
+    return STAR[stars]
+
+
+# ── Comments (formatted only when a report asks for them) ──
+
+def _c_trend(tb, t, sc, i):
+    en, jp = tb.trend_en[i], tb.trend_jp[i]
+    if sc == 3:
+        return f"Growing (EN:{en} JP:{jp})"
+    if sc == 1:
+        return "Both declining"
+    return f"Stable (EN:{en} JP:{jp})"
+
+
+def _c_demand(tb, t, sc, i):
+    med = tb.yt_median[i]
+    multi = tb.tweets[i] > t["multi_source"] or tb.reddit[i] > t["multi_source"]
+    if sc == 3:
+        return f"Strong (median {med:,} + multi-source)"
+    if sc == 2 and med >= t["demand_strong"]:
+        return f"YT-only demand (median {med:,})"
+    if sc == 2 and multi:
+        return f"Moderate + multi-source (median {med:,})"
+    return f"Low demand (median {med:,})"
+
+
+def _c_engagement(tb, t, sc, i):
+    med, top1 = tb.yt_median[i], tb.top1[i]
+    if top1 > t["outlier_top1"]:
+        return f"Outlier-dependent (top1={top1:.0%}, median {med:,})"
+    return f"Median {med:,} views (top1={top1:.0%})"
+
+
+def _c_questions(tb, t, sc, i):
+    q = tb.questions[i]
+    return {3: f"Rich ({q} questions)", 2: f"Moderate ({q} questions)"}.get(sc, f"Weak ({q} questions)")
+
+
+def _c_supply(tb, t, sc, i):
+    pub, med = tb.publishers[i], tb.yt_median[i]
+    if pub < t["supply_blue_pub"]:
+        if sc == 3:
+            return f"Blue ocean (pub {pub:,}, median {med:,})"
+        return f"Dead market (pub {pub:,}, median {med:,})"
+    if sc == 2:
+        return f"Moderate competition ({pub:,})"
+    return f"Red ocean ({pub:,} publishers)"
+
+
+def _c_gap(tb, t, sc, i):
+    g = tb.jp_gap[i]
+    return {3: f"High gap ({g:.0f})", 2: f"Moderate gap ({g:.0f})"}.get(sc, f"Low gap ({g:.0f})")
+
+
+def _c_localization(tb, t, sc, i):
+    r = tb.yt_ratio[i]
+    return {
+        3: f"Strong EN→JP opportunity ({r:.1f}x)",
+        2: f"Moderate opportunity ({r:.1f}x)",
+    }.get(sc, f"JP already mature ({r:.1f}x)")
+
+
+def _c_commercial(tb, t, sc, i):
+    if tb.com_failed[i]:
+        return "Grok failed"
+    h, n = tb.com_hits[i], len(COMMERCIAL_KEYWORDS)
+    return {
+        3: f"Strong commercial signals ({h}/{n} keywords)",
+        2: f"Some commercial signals ({h}/{n})",
+    }.get(sc, f"Weak signals ({h}/{n})")
+
+
+_COMMENTS = {
+    "step0_trend": _c_trend,
+    "step1_demand": _c_demand,
+    "step2_engagement": _c_engagement,
+    "step3_knowledge_gap": _c_questions,
+    "step4_supply": _c_supply,
+    "step5_gap": _c_gap,
+    "step6_localization": _c_localization,
+    "step7_commercial": _c_commercial,
+}
@@ -1,63 +1,95 @@
 """Stage 1: Trend Scan — Grok x_search for niche discovery."""
 
 import json
+import re
 import sys
+from concurrent.futures import as_completed
 from datetime import datetime
 from pathlib import Path
 
-from config import OUTPUT_BASE, TREND_SCAN_PROMPT_EN, TREND_SCAN_PROMPT_JP
+from config import (
+    OUTPUT_BASE, GROK_MODEL, GROK_CALL_COST_USD, TREND_SCAN_PROMPT_EN, TREND_SCAN_PROMPT_JP,
+)
 import grok_client
+import grok_parse
+from scheduler import Scheduler
 
 
-def run_scan(scan_date: str = None, category: str = None):
-    """Run Stage 1 trend scan using Grok x_search."""
+def run_scan(scan_date: str = None, category=None, *, max_parallel: int = None):
+    """Run Stage 1 trend scan using Grok x_search.
+
+    ``category`` may be None, one category, or a list of categories.
+    Every (language, category) prompt is issued concurrently, at most
+    ``max_parallel`` at a time (default: the Grok limit in config); each
+    raw result is written as soon as it arrives and meta.json is updated
+    once at the end.
+
+    Layout: a scan with no or one category writes ``<scan>/stage1-raw-{lang}.json``
+    as before; a multi-category scan writes one
+    ``<scan>/categories/<slug>/stage1-raw-{lang}.json`` per category.
+    Niches found across all results are merged into ``stage1-niches.json``.
+    """
     scan_date = scan_date or datetime.now().strftime("%Y-%m-%d")
     scan_dir = OUTPUT_BASE / scan_date
     scan_dir.mkdir(parents=True, exist_ok=True)
 
+    if category is None or isinstance(category, str):
+        categories = [category]
+    else:
+        categories = list(dict.fromkeys(category)) or [None]
+
     print(f"\n{'='*60}")
     print(f"  Stage 1: Trend Scan — {scan_date}")
-    if category:
-        print(f"  Category filter: {category}")
+    if any(categories):
+        print(f"  Category filter: {', '.join(c for c in categories if c)}")
     print(f"{'='*60}\n")
 
-    # EN scan
-    print("  [1/2] Scanning EN trends...")
-    prompt_en = TREND_SCAN_PROMPT_EN
-    if category:
-        prompt_en = f"Focus specifically on: {category}\n\n" + prompt_en
-
-    resp_en = grok_client.search(prompt_en)
-    text_en = grok_client.extract_text(resp_en)
-
-    en_path = scan_dir / "stage1-raw-en.json"
-    en_path.write_text(json.dumps({
-        "scan_date": scan_date,
-        "lang": "en",
-        "category": category,
-        "raw_response": resp_en,
-        "extracted_text": text_en,
-    }, indent=2, ensure_ascii=False), encoding="utf-8")
-    print(f"    Saved: {en_path}")
-
-    # JP scan
-    print("  [2/2] Scanning JP trends...")
-    prompt_jp = TREND_SCAN_PROMPT_JP
-    if category:
-        prompt_jp = f"特にこのカテゴリに注目: {category}\n\n" + prompt_jp
-
-    resp_jp = grok_client.search(prompt_jp)
-    text_jp = grok_client.extract_text(resp_jp)
-
-    jp_path = scan_dir / "stage1-raw-jp.json"
-    jp_path.write_text(json.dumps({
-        "scan_date": scan_date,
-        "lang": "jp",
-        "category": category,
-        "raw_response": resp_jp,
-        "extracted_text": text_jp,
-    }, indent=2, ensure_ascii=False), encoding="utf-8")
-    print(f"    Saved: {jp_path}")
+    jobs = []
+    for cat in categories:
+        out_dir = scan_dir / "categories" / _slug(cat) if len(categories) > 1 else scan_dir
+        out_dir.mkdir(parents=True, exist_ok=True)
+        for lang in ("en", "jp"):
+            jobs.append((lang, cat, out_dir / f"stage1-raw-{lang}.json"))
+
+    limits = {"grok": max_parallel} if max_parallel else None
+    print(f"  Scanning {len(jobs)} prompts in parallel...")
+    texts = {}
+    failed = 0
+    billed = 0
+    with Scheduler(limits) as scheduler:
+        futures = {}
+        for lang, cat, path in jobs:
+            outcome = {}
+            future = scheduler.submit("grok", grok_client.search, _prompt(lang, cat), outcome=outcome)
+            futures[future] = (lang, cat, path, outcome)
+        for future in as_completed(futures):
+            lang, cat, path, outcome = futures[future]
+            label = f"{lang.upper()}{f' [{cat}]' if cat else ''}"
+            try:
+                resp = future.result()
+            except Exception as e:
+                print(f"    [warn] {label} scan failed: {e}", file=sys.stderr)
+                failed += 1
+                continue
+            billed += not outcome.get("cached")
+            text = grok_client.extract_text(resp)
+            path.write_text(json.dumps({
+                "scan_date": scan_date,
+                "lang": lang,
+                "category": cat,
+                "raw_response": resp,
+                "extracted_text": text,
+            }, indent=2, ensure_ascii=False), encoding="utf-8")
+            texts[(lang, cat)] = text
+            print(f"    Saved {label}: {path}")
+
+    cost = round(billed * GROK_CALL_COST_USD, 2)
+
+    niches = _dedupe_niches(texts)
+    niches_path = scan_dir / "stage1-niches.json"
+    niches_path.write_text(json.dumps(niches, indent=2, ensure_ascii=False), encoding="utf-8")
+    shared = sum(1 for n in niches if len(n["categories"]) > 1)
+    print(f"\n  Niches: {len(niches)} unique ({shared} seen in several categories) → {niches_path}")
 
     # Update meta.json
     meta_path = scan_dir / "meta.json"
@@ -66,26 +98,94 @@ def run_scan(scan_date: str = None, category: str = None):
         meta = json.loads(meta_path.read_text(encoding="utf-8"))
     meta.update({
         "scan_date": scan_date,
-        "stage1_completed": True,
-        "stage1_cost_usd": 1.12,
-        "category_filter": category,
-        "grok_model": "grok-4-1-fast",
+        "stage1_completed": failed == 0,
+        "stage1_cost_usd": cost,
+        "category_filter": categories[0] if len(categories) == 1 else categories,
+        "stage1_niches": len(niches),
+        "grok_model": GROK_MODEL,
     })
     meta_path.write_text(json.dumps(meta, indent=2, ensure_ascii=False), encoding="utf-8")
 
-    print(f"\n  Scan complete. Cost: ~$1.12")
-    print(f"  Next: CEO reads stage1-raw-*.json and runs Stage 2 (Discovery)")
+    cached = len(texts) - billed
+    print(f"\n  Scan complete. Cost: ~${cost:.2f}" + (f" ({cached} served from cache)" if cached else ""))
+    if failed:
+        print(f"  {failed} prompt(s) failed — re-run to retry")
+    raw_glob = "categories/*/stage1-raw-*.json" if len(categories) > 1 else "stage1-raw-*.json"
+    print(f"  Next: CEO reads stage1-niches.json / {raw_glob} and runs Stage 2 (Discovery)")
 
     # Print summary
-    print(f"\n{'─'*60}")
-    print("  EN Summary (first 500 chars):")
-    print(f"  {text_en[:500]}")
-    print(f"\n{'─'*60}")
-    print("  JP Summary (first 500 chars):")
-    print(f"  {text_jp[:500]}")
+    for (lang, cat), text in sorted(texts.items(), key=lambda kv: (kv[0][1] or "", kv[0][0])):
+        print(f"\n{'─'*60}")
+        print(f"  {lang.upper()}{f' [{cat}]' if cat else ''} Summary (first 500 chars):")
+        print(f"  {text[:500]}")
+
+
+def _prompt(lang: str, category: str = None) -> str:
+    if lang == "en":
+        prompt = TREND_SCAN_PROMPT_EN
+        if category:
+            prompt = f"Focus specifically on: {category}\n\n" + prompt
+    else:
+        prompt = TREND_SCAN_PROMPT_JP
+        if category:
+            prompt = f"特にこのカテゴリに注目: {category}\n\n" + prompt
+    return prompt
+
+
+def _dedupe_niches(texts: dict) -> list[dict]:
+    """Merge niches from every (lang, category) result by normalized name.
+
+    Returns one record per niche with the categories and languages it
+    appeared under, sorted by how often it was mentioned.
+    """
+    merged = {}
+    for (lang, cat), text in texts.items():
+        items = grok_parse.extract_json(text)
+        if isinstance(items, dict):
+            items = [items]
+        if not isinstance(items, list):
+            continue
+        for item in items:
+            if not isinstance(item, dict):
+                continue
+            name = str(item.get("niche", "")).strip()
+            key = _niche_key(name)
+            if not key:
+                continue
+            entry = merged.setdefault(key, {
+                "niche": name,
+                "key": key,
+                "categories": [],
+                "langs": [],
+                "mentions": 0,
+                "examples": [],
+            })
+            entry["mentions"] += 1
+            if cat and cat not in entry["categories"]:
+                entry["categories"].append(cat)
+            if lang not in entry["langs"]:
+                entry["langs"].append(lang)
+            example = {
+                k: item[k] for k in ("description", "example_tweet", "author", "likes", "views")
+                if item.get(k) is not None
+            }
+            if example and len(entry["examples"]) < 3:
+                entry["examples"].append(example)
+    return sorted(merged.values(), key=lambda e: (-e["mentions"], e["key"]))
+
+
+def _niche_key(name: str) -> str:
+    """Normalize a niche name for cross-category matching."""
+    return re.sub(r"[\W_]+", "", name.lower())
+
+
+def _slug(text: str) -> str:
+    """Filesystem-safe category name (keeps Japanese characters)."""
+    slug = re.sub(r"[^\w]+", "-", text.strip().lower()).strip("-")
+    return slug or "category"
 
 
 if __name__ == "__main__":
     date = sys.argv[1] if len(sys.argv) > 1 else None
-    cat = sys.argv[2] if len(sys.argv) > 2 else None
-    run_scan(date, cat)
+    cats = sys.argv[2:] or None
+    run_scan(date, cats)
@@ -2,34 +2,56 @@
 
 Xpoz uses MCP Streamable HTTP transport (SSE responses).
 All operations are async: tool call → operationId → poll checkOperationStatus.
+Outstanding operations from every thread are polled by one background
+poller with exponential backoff + jitter.
 Response text is YAML-like (not JSON).
 """
 
+import heapq
+import itertools
 import json
+import random
 import re
 import sys
+import threading
 import time
+from concurrent.futures import Future, ThreadPoolExecutor
 
 import requests
 
-from config import load_xpoz_config, XPOZ_POLL_INTERVAL, XPOZ_MAX_WAIT
+from config import (
+    load_xpoz_config,
+    XPOZ_POLL_INITIAL, XPOZ_POLL_MAX_INTERVAL, XPOZ_POLL_BACKOFF,
+    XPOZ_POLL_JITTER, XPOZ_MAX_WAIT, XPOZ_CHECK_TIMEOUT, XPOZ_POLL_WORKERS,
+)
+import http_session
 
 
 class XpozClient:
-    """Client for Xpoz MCP server via HTTP (Streamable HTTP transport)."""
+    """Client for Xpoz MCP server via HTTP (Streamable HTTP transport).
 
-    def __init__(self):
+    Safe to share across threads: request ids and the one-time
+    ``initialize`` handshake are guarded by locks. HTTP goes through the
+    shared keep-alive session so polling reuses one connection.
+    """
+
+    def __init__(self, session: requests.Session = None):
         url, token = load_xpoz_config()
         if not url or not token:
             raise RuntimeError("Xpoz MCP not configured in ~/.claude.json")
         self.url = url
         self.token = token
+        self.session = session or http_session.get_session()
         self._request_id = 0
         self._initialized = False
+        self._id_lock = threading.Lock()
+        self._init_lock = threading.Lock()
+        self._poller = _OperationPoller(self._check_operation)
 
     def _next_id(self) -> int:
-        self._request_id += 1
-        return self._request_id
+        with self._id_lock:
+            self._request_id += 1
+            return self._request_id
 
     def _parse_sse(self, text: str) -> dict:
         """Extract JSON-RPC response from SSE formatted response."""
@@ -49,32 +71,35 @@ class XpozClient:
                 return item.get("text", "")
         return ""
 
-    def _post(self, body: dict) -> dict:
+    def _post(self, body: dict, timeout: float = 60) -> dict:
         """Send JSON-RPC request and parse SSE response."""
         headers = {
             "Content-Type": "application/json",
             "Accept": "application/json, text/event-stream",
             "Authorization": f"Bearer {self.token}",
         }
-        resp = requests.post(self.url, headers=headers, json=body, timeout=60)
+        resp = self.session.post(self.url, headers=headers, json=body, timeout=timeout)
         resp.raise_for_status()
         return self._parse_sse(resp.text)
 
     def _ensure_init(self):
         if self._initialized:
             return
-        body = {
-            "jsonrpc": "2.0",
-            "method": "initialize",
-            "params": {
-                "protocolVersion": "2025-03-26",
-                "capabilities": {},
-                "clientInfo": {"name": "niche-analyzer", "version": "0.1.0"},
-            },
-            "id": self._next_id(),
-        }
-        self._post(body)
-        self._initialized = True
+        with self._init_lock:
+            if self._initialized:
+                return
+            body = {
+                "jsonrpc": "2.0",
+                "method": "initialize",
+                "params": {
+                    "protocolVersion": "2025-03-26",
+                    "capabilities": {},
+                    "clientInfo": {"name": "niche-analyzer", "version": "0.1.0"},
+                },
+                "id": self._next_id(),
+            }
+            self._post(body)
+            self._initialized = True
 
     def _parse_yaml_text(self, text: str) -> dict:
         """Parse Xpoz YAML-like response text into a dict.
@@ -193,7 +218,7 @@ class XpozClient:
             row[field] = val
         return row
 
-    def call_tool(self, name: str, arguments: dict) -> str:
+    def call_tool(self, name: str, arguments: dict, timeout: float = 60) -> str:
         """Call an MCP tool and return the raw text response."""
         self._ensure_init()
         body = {
@@ -202,41 +227,34 @@ class XpozClient:
             "params": {"name": name, "arguments": arguments},
             "id": self._next_id(),
         }
-        data = self._post(body)
+        data = self._post(body, timeout=timeout)
         return self._extract_text(data)
 
     def call_tool_parsed(self, name: str, arguments: dict) -> dict:
         """Call a tool, poll if async, return parsed result."""
+        return self.submit_tool(name, arguments).result()
+
+    def submit_tool(self, name: str, arguments: dict) -> Future:
+        """Start a tool call and return a Future for its parsed result.
+
+        Synchronous responses resolve immediately; async ones (operationId)
+        resolve when the shared poller sees the operation finish.
+        """
         text = self.call_tool(name, arguments)
         parsed = self._parse_yaml_text(text)
 
         # Check for async operation
         op_id = parsed.get("operationId")
         if op_id:
-            return self._poll_operation(str(op_id))
+            return self._poller.add(str(op_id))
 
-        return parsed
+        future = Future()
+        future.set_result(parsed)
+        return future
 
-    def _poll_operation(self, operation_id: str) -> dict:
-        """Poll checkOperationStatus until complete."""
-        elapsed = 0.0
-        while elapsed < XPOZ_MAX_WAIT:
-            text = self.call_tool("checkOperationStatus", {"operationId": operation_id})
-            parsed = self._parse_yaml_text(text)
-
-            # "success: true" means completed
-            if parsed.get("success") is True:
-                return parsed
-
-            # Check for explicit failure
-            status = parsed.get("status", "")
-            if status == "failed":
-                raise RuntimeError(f"Xpoz operation failed: {text}")
-
-            time.sleep(XPOZ_POLL_INTERVAL)
-            elapsed += XPOZ_POLL_INTERVAL
-
-        raise TimeoutError(f"Xpoz operation {operation_id} timed out after {XPOZ_MAX_WAIT}s")
+    def _check_operation(self, operation_id: str, timeout: float) -> tuple[str, dict]:
+        text = self.call_tool("checkOperationStatus", {"operationId": operation_id}, timeout=timeout)
+        return text, self._parse_yaml_text(text)
 
     # ── Convenience methods ──
 
@@ -313,6 +331,115 @@ class XpozClient:
         return self.call_tool_parsed("getInstagramPostsByKeywords", args)
 
 
+class _PendingOperation:
+    __slots__ = ("op_id", "future", "deadline", "interval")
+
+    def __init__(self, op_id: str, future: Future, deadline: float, interval: float):
+        self.op_id = op_id
+        self.future = future
+        self.deadline = deadline
+        self.interval = interval
+
+
+class _OperationPoller:
+    """Multiplexes checkOperationStatus polling for many operationIds.
+
+    A single daemon thread keeps a heap of (next_check, operation) and
+    hands due checks to a small pool (XPOZ_POLL_WORKERS), so one slow
+    check doesn't hold up the others. Each check's HTTP timeout is capped
+    by the operation's remaining time. Each unfinished check grows that
+    operation's interval by XPOZ_POLL_BACKOFF (capped at
+    XPOZ_POLL_MAX_INTERVAL) with ±XPOZ_POLL_JITTER randomization.
+    Deadlines use self._clock(), so request latency counts toward
+    XPOZ_MAX_WAIT. The thread exits when nothing is pending and is
+    restarted when an operation is (re)scheduled.
+    """
+
+    def __init__(self, check, clock=time.monotonic):
+        self._check = check  # (op_id, timeout) -> (raw_text, parsed_dict)
+        self._clock = clock
+        self._cond = threading.Condition()
+        self._heap = []
+        self._seq = itertools.count()
+        self._thread = None
+        self._pool = ThreadPoolExecutor(max_workers=XPOZ_POLL_WORKERS, thread_name_prefix="xpoz-check")
+
+    def add(self, op_id: str) -> Future:
+        future = Future()
+        now = self._clock()
+        op = _PendingOperation(op_id, future, now + XPOZ_MAX_WAIT, XPOZ_POLL_INITIAL)
+        self._schedule(now + _jittered(op.interval), op)
+        return future
+
+    def _schedule(self, due: float, op: _PendingOperation):
+        with self._cond:
+            heapq.heappush(self._heap, (due, next(self._seq), op))
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="xpoz-poller", daemon=True,
+                )
+                self._thread.start()
+            self._cond.notify()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                if not self._heap:
+                    self._thread = None
+                    return
+                due, _, op = self._heap[0]
+                delay = due - self._clock()
+                if delay > 0:
+                    self._cond.wait(delay)
+                    continue
+                heapq.heappop(self._heap)
+            self._pool.submit(self._poll_once, op)
+
+    def _poll_once(self, op: _PendingOperation):
+        remaining = op.deadline - self._clock()
+        if remaining <= 0:
+            self._expire(op)
+            return
+        try:
+            text, parsed = self._check(op.op_id, max(min(XPOZ_CHECK_TIMEOUT, remaining), 1.0))
+        except requests.Timeout:
+            if self._clock() >= op.deadline:
+                self._expire(op)
+                return
+            parsed, text = {}, ""  # slow check: try again on the normal schedule
+        except Exception as e:
+            op.future.set_exception(e)
+            return
+
+        # "success: true" means completed
+        if parsed.get("success") is True:
+            op.future.set_result(parsed)
+            return
+
+        # Check for explicit failure
+        if parsed.get("status", "") == "failed":
+            op.future.set_exception(RuntimeError(f"Xpoz operation failed: {text}"))
+            return
+
+        now = self._clock()
+        if now >= op.deadline:
+            self._expire(op)
+            return
+
+        op.interval = min(op.interval * XPOZ_POLL_BACKOFF, XPOZ_POLL_MAX_INTERVAL)
+        self._schedule(min(now + _jittered(op.interval), op.deadline), op)
+
+    @staticmethod
+    def _expire(op: _PendingOperation):
+        op.future.set_exception(TimeoutError(
+            f"Xpoz operation {op.op_id} timed out after {XPOZ_MAX_WAIT}s"
+        ))
+
+
+def _jittered(interval: float) -> float:
+    return interval * random.uniform(1 - XPOZ_POLL_JITTER, 1 + XPOZ_POLL_JITTER)
+
+
 if __name__ == "__main__":
     client = XpozClient()
     count = client.count_tweets("AI", "2026-02-01", "2026-02-21")
@@ -1,14 +1,80 @@
-"""yt-dlp wrapper for YouTube search."""
+"""yt-dlp wrapper for YouTube search.
+
+Searches run in-process through yt-dlp's Python API when the package is
+importable (no interpreter start-up per query), falling back to the
+``yt-dlp`` executable otherwise, whose JSON lines are parsed as they
+stream in (see iter_videos). Concurrency is bounded by the
+Scheduler's "ytdlp" pool (config.SOURCE_CONCURRENCY). Non-empty results
+are cached on disk per (query, max_results, day).
+"""
 
 import json
+import operator
+import queue
 import subprocess
 import sys
+import threading
+import time
+from datetime import date
+from typing import Iterator
+
+from config import (
+    YTDLP_PATH, YTDLP_DEADLINE, CACHE_DIR, YTDLP_CACHE_TTL, YTDLP_CACHE_MAX_BYTES,
+)
+from response_cache import ResponseCache
+
+try:
+    import yt_dlp
+except ImportError:  # optional: fall back to the executable
+    yt_dlp = None
 
-from config import YTDLP_PATH
+_cache = ResponseCache(CACHE_DIR / "ytdlp", ttl=YTDLP_CACHE_TTL, max_bytes=YTDLP_CACHE_MAX_BYTES)
 
 
-def search_videos(query: str, max_results: int = 20) -> list[dict]:
+def disable_cache():
+    """Bypass the on-disk search cache for the rest of the process."""
+    global _cache
+    _cache = None
+
+
+def search_videos(query: str, max_results: int = 20, *, use_cache: bool = True) -> list[dict]:
     """Search YouTube and return video metadata."""
+    cache = _cache if use_cache else None
+    cache_key = None
+    if cache is not None:
+        cache_key = cache.make_key("ytsearch", query, max_results, date.today().isoformat())
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+    outcome = {}
+    videos = list(iter_videos(query, max_results, outcome=outcome))
+
+    # Empty or cut-off lists (timeouts, missing binary) shouldn't be pinned for a day
+    if cache is not None and videos and not outcome.get("timed_out"):
+        cache.put(cache_key, videos)
+    return videos
+
+
+def iter_videos(
+    query: str,
+    max_results: int = 20,
+    *,
+    deadline: float = YTDLP_DEADLINE,
+    outcome: dict = None,
+) -> Iterator[dict]:
+    """Yield compact video records as yt-dlp emits them.
+
+    Iteration stops once max_results records arrived or ``deadline``
+    seconds passed, so a slow search yields what it had instead of
+    nothing. ``outcome["timed_out"]`` is set on a deadline cut. In
+    subprocess mode stdout is parsed line by line and the process is
+    killed at the end; in-process, entries come from a worker thread.
+    """
+    if yt_dlp is not None:
+        yield from _search_in_process(query, max_results, deadline, outcome)
+        return
+
     cmd = [
         str(YTDLP_PATH),
         "--flat-playlist",
@@ -16,73 +82,197 @@ def search_videos(query: str, max_results: int = 20) -> list[dict]:
         f"ytsearch{max_results}:{query}",
     ]
     try:
-        result = subprocess.run(
-            cmd, capture_output=True, text=True, timeout=60,
+        proc = subprocess.Popen(
+            cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+            text=True, encoding="utf-8", bufsize=1,
         )
     except FileNotFoundError:
         print(f"[ytdlp] yt-dlp not found at {YTDLP_PATH}", file=sys.stderr)
-        return []
-    except subprocess.TimeoutExpired:
-        print("[ytdlp] Search timed out", file=sys.stderr)
-        return []
-
-    videos = []
-    for line in result.stdout.strip().split("\n"):
-        if not line:
-            continue
+        return
+
+    expired = threading.Event()
+
+    def expire():
+        expired.set()
+        proc.kill()
+
+    timer = threading.Timer(deadline, expire)
+    timer.daemon = True
+    timer.start()
+    count = 0
+    try:
+        for line in proc.stdout:
+            if not line.strip():
+                continue
+            try:
+                data = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            yield _video_record(data)
+            count += 1
+            if count >= max_results:
+                break
+    finally:
+        timer.cancel()
+        if proc.poll() is None:
+            proc.kill()
+        proc.wait()
+        proc.stdout.close()
+        if expired.is_set():
+            print(f"[ytdlp] Search hit {deadline:.0f}s deadline; kept {count} videos", file=sys.stderr)
+            if outcome is not None:
+                outcome["timed_out"] = True
+
+
+_DONE = object()
+
+
+def _search_in_process(query: str, max_results: int, deadline: float, outcome: dict = None):
+    """In-process search with the same deadline/partial-result contract as the subprocess.
+
+    extract_info(process=False) leaves the search playlist's entries as a
+    lazy generator; a worker thread walks it (page fetches included) and
+    hands records over a queue, so the caller can give up at the deadline
+    and keep what arrived. An abandoned worker stops at its next entry.
+    """
+    opts = {
+        "extract_flat": "in_playlist",
+        "skip_download": True,
+        "quiet": True,
+        "no_warnings": True,
+        "socket_timeout": 30,
+    }
+    records = queue.Queue()
+    stop = threading.Event()
+
+    def worker():
         try:
-            data = json.loads(line)
-            videos.append({
-                "id": data.get("id", ""),
-                "title": data.get("title", ""),
-                "channel": data.get("channel", "") or data.get("uploader", ""),
-                "channel_id": data.get("channel_id", "") or data.get("uploader_id", ""),
-                "view_count": data.get("view_count", 0) or 0,
-                "duration": data.get("duration", 0) or 0,
-            })
-        except json.JSONDecodeError:
-            continue
+            # One YoutubeDL per call: instances are not safe to share across threads
+            with yt_dlp.YoutubeDL(opts) as ydl:
+                info = ydl.extract_info(f"ytsearch{max_results}:{query}", download=False, process=False)
+                for entry in (info or {}).get("entries") or []:
+                    if stop.is_set():
+                        break
+                    if entry:
+                        records.put(_video_record(entry))
+        except Exception as e:
+            print(f"[ytdlp] Search failed: {e}", file=sys.stderr)
+        finally:
+            records.put(_DONE)
 
-    return videos
+    threading.Thread(target=worker, daemon=True).start()
+    end = time.monotonic() + deadline
+    count = 0
+    timed_out = False
+    try:
+        while count < max_results:
+            try:
+                item = records.get(timeout=max(end - time.monotonic(), 0))
+            except queue.Empty:
+                timed_out = True
+                break
+            if item is _DONE:
+                break
+            yield item
+            count += 1
+    finally:
+        stop.set()
+        if timed_out:
+            print(f"[ytdlp] Search hit {deadline:.0f}s deadline; kept {count} videos", file=sys.stderr)
+            if outcome is not None:
+                outcome["timed_out"] = True
+
+
+def _video_record(data: dict) -> dict:
+    """Compact record kept from one yt-dlp entry."""
+    return {
+        "id": data.get("id", ""),
+        "title": data.get("title", ""),
+        "channel": data.get("channel", "") or data.get("uploader", ""),
+        "channel_id": data.get("channel_id", "") or data.get("uploader_id", ""),
+        "view_count": data.get("view_count", 0) or 0,
+        "duration": data.get("duration", 0) or 0,
+    }
+
+
+def video_stats(videos: list[dict]) -> dict:
+    """All view/channel statistics for one search result, computed together.
 
+    View counts and channel IDs are pulled out of the dicts up front;
+    everything else runs on that flat list with C-level builtins (sum, max,
+    one sort). The sorted counts give the median, p25/p75/p90 and a Gini
+    coefficient (0 = views spread evenly, 1 = one video has all).
+    O(n log n) overall, so result sets far beyond 20 are fine.
+    """
+    views = [v.get("view_count", 0) or 0 for v in videos]
+    channels = {v["channel_id"] for v in videos if v.get("channel_id")}
+    total = sum(views)
+    top1 = max(views, default=0)
 
-def total_views(videos: list[dict]) -> int:
+    count = len(views)
+    views.sort()
+    weighted = sum(map(operator.mul, range(1, count + 1), views))
+
+    return {
+        "count": count,
+        "total": total,
+        "avg": total / count if count else 0.0,
+        "median": _median(views),
+        "p25": _percentile(views, 0.25),
+        "p75": _percentile(views, 0.75),
+        "p90": _percentile(views, 0.90),
+        "top1": top1,
+        "top1_pct": round(top1 / total, 3) if total else 0.0,
+        "gini": round(2 * weighted / (count * total) - (count + 1) / count, 3) if total else 0.0,
+        "unique_channels": len(channels),
+    }
+
+
+def _median(ordered: list[int]) -> int:
+    n = len(ordered)
+    if n == 0:
+        return 0
+    if n % 2:
+        return ordered[n // 2]
+    return (ordered[n // 2 - 1] + ordered[n // 2]) // 2
+
+
+def _percentile(ordered: list[int], q: float) -> int:
+    """Linear-interpolated percentile of an ascending list, rounded to int."""
+    if not ordered:
+        return 0
+    pos = (len(ordered) - 1) * q
+    lo = int(pos)
+    hi = min(lo + 1, len(ordered) - 1)
+    return round(ordered[lo] + (ordered[hi] - ordered[lo]) * (pos - lo))
+
+
+# Single-metric helpers. Pass ``stats`` from video_stats() when reading
+# several metrics of the same result so it is only computed once.
+
+def total_views(videos: list[dict], stats: dict = None) -> int:
     """Sum of view counts."""
-    return sum(v.get("view_count", 0) for v in videos)
+    return stats["total"] if stats else sum(v.get("view_count", 0) or 0 for v in videos)
 
 
-def unique_channels(videos: list[dict]) -> int:
+def unique_channels(videos: list[dict], stats: dict = None) -> int:
     """Count unique channels."""
-    return len({v.get("channel_id", "") for v in videos if v.get("channel_id")})
+    return (stats or video_stats(videos))["unique_channels"]
 
 
-def avg_views(videos: list[dict]) -> float:
+def avg_views(videos: list[dict], stats: dict = None) -> float:
     """Average views per video."""
-    if not videos:
-        return 0.0
-    return total_views(videos) / len(videos)
+    return (stats or video_stats(videos))["avg"]
 
 
-def median_views(videos: list[dict]) -> int:
+def median_views(videos: list[dict], stats: dict = None) -> int:
     """Median view count across videos."""
-    views = sorted(v.get("view_count", 0) for v in videos)
-    n = len(views)
-    if n == 0:
-        return 0
-    if n % 2:
-        return views[n // 2]
-    return (views[n // 2 - 1] + views[n // 2]) // 2
+    return (stats or video_stats(videos))["median"]
 
 
-def top1_concentration(videos: list[dict]) -> float:
+def top1_concentration(videos: list[dict], stats: dict = None) -> float:
     """Fraction of total views held by the top video (0.0-1.0). High = outlier-dependent."""
-    if not videos:
-        return 0.0
-    total = total_views(videos)
-    if total == 0:
-        return 0.0
-    top1 = max(v.get("view_count", 0) for v in videos)
-    return round(top1 / total, 3)
+    return (stats or video_stats(videos))["top1_pct"]
 
 
 if __name__ == "__main__":
@@ -90,4 +280,6 @@ if __name__ == "__main__":
     vids = search_videos(q, 5)
     for v in vids:
         print(f"  {v['view_count']:>10,} views | {v['channel'][:30]:30s} | {v['title'][:50]}")
-    print(f"  Total: {total_views(vids):,} views from {unique_channels(vids)} channels")
+    st = video_stats(vids)
+    print(f"  Total: {st['total']:,} views from {st['unique_channels']} channels "
+          f"(median {st['median']:,}, p90 {st['p90']:,}, gini {st['gini']})")
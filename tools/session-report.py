@@ -6,6 +6,7 @@ Usage:
     python3 tools/session-report.py content/logs/2026-02-19.md
     python3 tools/session-report.py content/logs/2026-02-19.md --open
     python3 tools/session-report.py content/logs/2026-02-19.md --recovery
+    python3 tools/session-report.py content/logs/2026-02-19.md --force  # 入力が同じでも再生成
 """
 
 import sys
@@ -16,6 +17,10 @@ from datetime import datetime
 from pathlib import Path
 
 REPO_ROOT = Path(__file__).resolve().parent.parent
+LOGS_DIR = REPO_ROOT / "content" / "logs"
+sys.path.insert(0, str(REPO_ROOT))
+
+from tools.core.render import ReportJob, build, load_manifest
 
 HTML_TEMPLATE = """<!DOCTYPE html>
 <html lang="ja">
@@ -305,9 +310,56 @@ def generate_html(
     )
 
 
+def report_job(log_path: Path, is_recovery: bool = None) -> ReportJob:
+    """ReportJob for one session log. Raises ValueError if the name has no date.
+
+    is_recovery=None keeps whatever the previous build of this report used.
+    """
+    stem = log_path.stem
+    date_match = re.match(r"(\d{4}-\d{2}-\d{2})", stem)
+    if not date_match:
+        raise ValueError(f"Cannot extract date from {log_path.name}")
+
+    date_str = date_match.group(1)
+    suffix = stem[len(date_str):]  # e.g., "" or "-s2"
+    output_path = REPO_ROOT / "reports" / f"session-{date_str}{suffix}.html"
+    key = f"session/{stem}"
+
+    if is_recovery is None:
+        entry = load_manifest().get(key)
+        if entry and "recovery" in entry:
+            is_recovery = entry["recovery"]
+        else:
+            is_recovery = output_path.exists() and 'class="recovery-notice"' in output_path.read_text(encoding="utf-8")
+
+    def render():
+        parsed = parse_markdown(log_path.read_text(encoding="utf-8"))
+        return generate_html(parsed, date_str, suffix, is_recovery=is_recovery)
+
+    return ReportJob(
+        key=key,
+        output=output_path,
+        inputs=[log_path, {"recovery": is_recovery}],
+        render=render,
+        sources=[Path(__file__)],
+        meta={"recovery": is_recovery},
+    )
+
+
+def report_jobs() -> list:
+    """One job per dated session log (for generate-reports-index.py --all)."""
+    jobs = []
+    for log_path in sorted(LOGS_DIR.glob("*.md")):
+        try:
+            jobs.append(report_job(log_path))
+        except ValueError:
+            continue
+    return jobs
+
+
 def main():
     if len(sys.argv) < 2:
-        print("Usage: python3 tools/session-report.py <log-file.md> [--open] [--recovery]")
+        print("Usage: python3 tools/session-report.py <log-file.md> [--open] [--recovery] [--force]")
         sys.exit(1)
 
     log_path = Path(sys.argv[1])
@@ -318,29 +370,19 @@ def main():
         print(f"Error: {log_path} not found")
         sys.exit(1)
 
-    md_text = log_path.read_text(encoding="utf-8")
-
-    # Extract date from filename
-    stem = log_path.stem
-    date_match = re.match(r"(\d{4}-\d{2}-\d{2})", stem)
-    if not date_match:
-        print(f"Error: Cannot extract date from {log_path.name}")
+    try:
+        job = report_job(log_path, is_recovery=is_recovery)
+    except ValueError as e:
+        print(f"Error: {e}")
         sys.exit(1)
 
-    date_str = date_match.group(1)
-    suffix = stem[len(date_str):]  # e.g., "" or "-s2"
-
-    output_name = f"session-{date_str}{suffix}.html"
-    output_path = REPO_ROOT / "reports" / output_name
-
-    parsed = parse_markdown(md_text)
-    html = generate_html(parsed, date_str, suffix, is_recovery=is_recovery)
-
-    output_path.write_text(html, encoding="utf-8")
-    print(f"Generated: {output_path}")
+    if build(job, force="--force" in sys.argv):
+        print(f"Generated: {job.output}")
+    else:
+        print(f"Up to date: {job.output}")
 
     if do_open:
-        subprocess.run(["open", str(output_path)])
+        subprocess.run(["open", str(job.output)])
 
 
 if __name__ == "__main__":